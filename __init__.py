@@ -49,6 +49,7 @@ from .op_triangle_fill import TriangleFill
 from .polytrim_instance import Custom_Polytrim
 from .convenience import CUTMESH_OT_delete_strokes, CUTMESH_OT_hide_strokes, CUTMESH_OT_join_strokes
 from . import ambient_occlusion
+from .mesh_cache import clear_mesh_cache
 
 #addon preferences
 class CutMeshPreferences(AddonPreferences):
@@ -63,6 +64,9 @@ class CutMeshPreferences(AddonPreferences):
     spline_tessellation_epsilon = FloatProperty(name = 'Spline Epsilon', default = 0.1, min = .001, max = 10)
     
     destructive = EnumProperty(name = 'Geometry Mode', items = [('DESTRUCTIVE', 'DESTRUCTIVE', 'DESTRUCTIVE'),('NON_DESTRUCTIVE','NON_DESTRUCTIVE','NON_DESTRUCTIVE')], default = 'DESTRUCTIVE')
+    segment_precompute = EnumProperty(name = 'Segment Precompute', items = [('PROCESSES', 'PROCESSES', 'Worker processes sharing a mesh snapshot, threads where processes can not be forked'),('THREADS','THREADS','Background threads walking a mesh snapshot')], default = 'PROCESSES')
+    segment_processes = IntProperty(name = 'Segment Processes', description = '0 uses every core', default = 0, min = 0, max = 256)
+    geodesic_engine = EnumProperty(name = 'Geodesic Engine', items = [('BMESH', 'BMESH', 'Fast marching on the BMesh'),('ARRAY','ARRAY','Fast marching on mesh arrays'),('HEAT','HEAT','Heat method, needs scipy')], default = 'ARRAY')
     #2D Interaction Behavior
     non_man_snap_pxl_rad = IntProperty(name = 'Snap Radius Pixel', default = 20, min =5, max = 150)
     sel_pxl_rad = IntProperty(name = 'Select Radius Pixel', default = 10, min = 3, max = 100)
@@ -144,4 +148,5 @@ def unregister():
     bpy.utils.unregister_class(CutMesh_PGeopath)
     bpy.utils.unregister_class(CUTMESH_OT_delete_strokes)
     bpy.utils.unregister_class(CUTMESH_OT_hide_strokes)
-    bpy.utils.unregister_class(CUTMESH_OT_join_strokes)
\ No newline at end of file
+    bpy.utils.unregister_class(CUTMESH_OT_join_strokes)
+    clear_mesh_cache()
\ No newline at end of file
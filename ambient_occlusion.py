@@ -666,7 +666,7 @@ class CutMesh_OT_remove_small_parts_selection(bpy.types.Operator):
         bme.faces.ensure_lookup_table()
         
         selected_verts = [v for v in bme.verts if v.select]     
-        islands = bmesh_loose_parts_verts(bme, selected_verts, max_iters = 100)
+        islands = bmesh_loose_parts_verts(bme, selected_verts)
         
         
         biggest = max(islands, key = len)
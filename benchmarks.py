@@ -0,0 +1,456 @@
+'''
+Timing helpers for the cutting and geodesic algorithms.
+
+These need a live BMesh, so they are meant to be run from the
+Blender python console, eg
+
+    import bmesh
+    from cut_mesh import benchmarks
+    bme = bmesh.new()
+    bme.from_mesh(C.object.data)
+    benchmarks.bench_geodesic_walk(bme, bme.faces[0])
+'''
+#python imports
+import time
+import random
+
+import numpy as np
+
+#blender imports
+import bmesh
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+
+#Cut Mesh imports
+from .geodesic import geodesic_walk, prepare_bmesh_for_geodesic, calc_T_scalar, calc_T_batch
+from .geodesic import geodesic_walk_arrays, heat_geodesic_walk, GeodesicBrushWorkspace
+from .geodesic_heat import HAS_SCIPY
+from .cut_algorithms import cross_section_walker_dynamic_endpoints, find_bmedges_crossing_plane, path_between_2_points_clean
+from .cut_arrays import cross_section_walker_dynamic_arrays, corridor_faces
+from .bmesh_fns import grow_selection_to_find_face, edge_loops_from_bmedges, edge_loops_from_bmedges_linear
+from .mesh_arrays import mesh_arrays_for_bmesh
+from .segment_pool import SegmentPool
+
+
+def bench_geodesic_walk(bme, seed, seed_location = None, max_iters = 5000, fronts = ('LINEAR', 'HEAP')):
+    '''
+    bme - BMesh, will be triangulated
+    seed - BMFace or BMVert to march from
+    seed_location - mathutils.Vector, defaults to the face center or vert location
+    max_iters - number of marching steps for each run
+    fronts - geodesic_walk front implementations to compare
+
+    prints and returns dictionary {front: iterations per second}
+    '''
+    prepare_bmesh_for_geodesic(bme)
+
+    if seed_location == None:
+        if isinstance(seed, bmesh.types.BMFace):
+            seed_location = seed.calc_center_median()
+        else:
+            seed_location = seed.co.copy()
+
+    results = {}
+    for front in fronts:
+        start = time.time()
+        geos, fixed, close, far = geodesic_walk(bme, seed, seed_location, max_iters = max_iters, front = front)
+        elapsed = time.time() - start
+
+        n_fixed = len(fixed)
+        results[front] = n_fixed/max(elapsed, 1e-9)
+        print('%s front: fixed %i verts in %f seconds, %f iterations/second' % (front, n_fixed, elapsed, results[front]))
+
+    return results
+
+
+def random_bmesh(subdivisions = 3, jitter = .05, seed = 0):
+    '''
+    icosphere with every vert moved by a random offset, so the triangles
+    are not all the same shape
+    '''
+    rng = random.Random(seed)
+    bme = bmesh.new()
+    bmesh.ops.create_icosphere(bme, subdivisions = subdivisions, diameter = 1)
+    for v in bme.verts:
+        v.co += jitter * Vector((rng.uniform(-1,1), rng.uniform(-1,1), rng.uniform(-1,1)))
+    bme.verts.ensure_lookup_table()
+    bme.faces.ensure_lookup_table()
+    return bme
+
+def bench_calc_T_batch(bme = None, noise = .02, seed = 0, tolerance = 1e-6):
+    '''
+    times calc_T_batch against calc_T_scalar on every triangle of bme, and asserts
+    they agree.  geodesic_arrays.check_calc_T_batch checks it outside of Blender
+    bme - triangulated BMesh, defaults to random_bmesh()
+    noise - random error added to the distance values, large enough that some
+            pairs of circles do not intersect
+    
+    prints timings and returns the largest absolute difference
+    '''
+    if bme == None:
+        bme = random_bmesh(seed = seed)
+    rng = random.Random(seed)
+    
+    source = Vector((rng.uniform(2,3), rng.uniform(-1,1), rng.uniform(-1,1)))
+    rows = []
+    for f in bme.faces:
+        v1, v2, v3 = f.verts[0:3]
+        T1 = (v1.co - source).length + rng.uniform(0, noise)
+        T2 = (v2.co - source).length + rng.uniform(0, noise)
+        rows += [(v1.co.copy(), v2.co.copy(), v3.co.copy(), T1, T2)]
+    
+    start = time.time()
+    scalar = [calc_T_scalar(v1, v2, v3, T1, T2) for v1, v2, v3, T1, T2 in rows]
+    scalar_time = time.time() - start
+    
+    V1 = np.array([r[0][:] for r in rows])
+    V2 = np.array([r[1][:] for r in rows])
+    V3 = np.array([r[2][:] for r in rows])
+    T1s = np.array([r[3] for r in rows])
+    T2s = np.array([r[4] for r in rows])
+    
+    start = time.time()
+    batch = calc_T_batch(V1, V2, V3, T1s, T2s)
+    batch_time = time.time() - start
+    
+    max_err = float(np.max(np.abs(batch - np.array(scalar))))
+    print('%i triangles, scalar %f seconds, batch %f seconds' % (len(rows), scalar_time, batch_time))
+    print('max difference %e' % max_err)
+    assert max_err <= tolerance, 'calc_T_batch does not match calc_T_scalar!'
+    return max_err
+
+def compare_heat_to_fast_marching(bme, seeds, t_factors = (1.0,)):
+    '''
+    bme - BMesh, will be triangulated
+    seeds - list of BMFaces, each is walked from its center
+    t_factors - heat method time steps to try, in squared mean edge lengths
+
+    the first heat solve on a mesh includes factoring the operators, it is
+    reported separately from the per seed solves
+
+    prints and returns a list of (t_factor, mean relative error, max relative error,
+                                  fast marching seconds, heat seconds per seed)
+    '''
+    if not HAS_SCIPY:
+        print('scipy is not available, the heat method can not run')
+        return []
+
+    prepare_bmesh_for_geodesic(bme)
+    locs = [f.calc_center_median() for f in seeds]
+
+    fmm = []
+    start = time.time()
+    for seed, loc in zip(seeds, locs):
+        geos = geodesic_walk_arrays(bme, seed, loc, max_iters = None)[0]
+        fmm += [geos.dist.copy()]
+    fmm_time = (time.time() - start)/len(seeds)
+
+    results = []
+    for t_factor in t_factors:
+        start = time.time()
+        heat_geodesic_walk(bme, seeds[0], locs[0], t_factor = t_factor)
+        print('t = %f, first heat solve (includes factoring) %f seconds' % (t_factor, time.time() - start))
+
+        errors = []
+        start = time.time()
+        for seed, loc, ref in zip(seeds, locs, fmm):
+            heat = heat_geodesic_walk(bme, seed, loc, t_factor = t_factor)[0].dist
+            valid = np.isfinite(ref) & (ref > 1e-9)
+            errors += [np.abs(heat[valid] - ref[valid])/ref[valid]]
+        heat_time = (time.time() - start)/len(seeds)
+
+        errors = np.concatenate(errors)
+        mean_err, max_err = float(np.mean(errors)), float(np.max(errors))
+        print('t = %f, relative error mean %f max %f' % (t_factor, mean_err, max_err))
+        print('fast marching %f seconds per seed, heat %f seconds per seed' % (fmm_time, heat_time))
+        results += [(t_factor, mean_err, max_err, fmm_time, heat_time)]
+
+    return results
+
+def bench_brush_stroke(bme = None, grid_segments = 1000, radius = None, n_dabs = 200, legacy_dabs = 5):
+    '''
+    replays a straight paint stroke across the mesh like the polytrim region
+    paint state does, one dab every quarter radius
+
+    bme - BMesh, defaults to a grid of about grid_segments**2 quads (1M faces)
+    radius - brush radius, defaults to 2% of the bounding box diagonal
+    n_dabs - number of dabs for GeodesicBrushWorkspace
+    legacy_dabs - number of dabs for geodesic_walk(..., min_dist = radius), which is O(mesh) per dab
+
+    prints and returns dictionary {'WORKSPACE': dabs/second, 'LEGACY': dabs/second}
+    '''
+    if bme == None:
+        bme = bmesh.new()
+        bmesh.ops.create_grid(bme, x_segments = grid_segments, y_segments = grid_segments, size = 1)
+    bme.verts.ensure_lookup_table()
+    bme.faces.ensure_lookup_table()
+    print('%i faces, %i verts' % (len(bme.faces), len(bme.verts)))
+
+    bvh = BVHTree.FromBMesh(bme)
+    cos = np.array([v.co[:] for v in bme.verts])
+    lo, hi = Vector(cos.min(axis = 0)), Vector(cos.max(axis = 0))
+    if radius == None:
+        radius = .02 * (hi - lo).length
+
+    #stroke along the diagonal, snapped to the surface
+    samples = []
+    step = .25 * radius
+    n = max(int((hi - lo).length/step), 1)
+    for i in range(n):
+        loc, no, ind, d = bvh.find_nearest(lo.lerp(hi, (i + .5)/n))
+        if loc == None: continue
+        samples += [(bme.faces[ind], loc)]
+        if len(samples) >= n_dabs: break
+
+    results = {}
+
+    start = time.time()
+    workspace = GeodesicBrushWorkspace(bme)
+    print('workspace setup %f seconds' % (time.time() - start))
+
+    start = time.time()
+    n_faces = 0
+    for seed, loc in samples:
+        n_faces += len(workspace.dab(seed, loc, radius))
+    elapsed = time.time() - start
+    results['WORKSPACE'] = len(samples)/max(elapsed, 1e-9)
+    print('workspace: %i dabs, %f faces per dab, %f dabs/second' % (len(samples), n_faces/max(len(samples), 1), results['WORKSPACE']))
+
+    start = time.time()
+    for seed, loc in samples[:legacy_dabs]:
+        geodesic_walk(bme, seed, loc, min_dist = radius)
+    elapsed = time.time() - start
+    results['LEGACY'] = min(legacy_dabs, len(samples))/max(elapsed, 1e-9)
+    print('geodesic_walk: %i dabs, %f dabs/second' % (min(legacy_dabs, len(samples)), results['LEGACY']))
+
+    return results
+
+def check_cross_section_walker_arrays(bme = None, n_walks = 50, epsilon = .00001, seed = 0):
+    '''
+    walks between random pairs of faces with cross_section_walker_dynamic_endpoints
+    and cross_section_walker_dynamic_arrays and compares the faces they cross
+
+    bme - BMesh, defaults to random_bmesh()
+
+    prints timings and returns the number of walks which disagree
+    '''
+    if bme == None:
+        bme = random_bmesh(seed = seed)
+    bme.verts.ensure_lookup_table()
+    bme.edges.ensure_lookup_table()
+    bme.faces.ensure_lookup_table()
+    bme.normal_update()
+    mesh = mesh_arrays_for_bmesh(bme, rebuild = True)
+    rng = random.Random(seed)
+
+    jobs = []
+    while len(jobs) < n_walks:
+        f_a, f_b = rng.choice(bme.faces), rng.choice(bme.faces)
+        if f_a == f_b: continue
+        loc_a, loc_b = f_a.calc_center_median(), f_b.calc_center_median()
+        eds_is = find_bmedges_crossing_plane(loc_a, f_a.normal.cross(loc_b - loc_a), f_a.edges, epsilon)
+        if len(eds_is) < 2: continue
+        jobs += [(f_a.index, eds_is[0][0].index, eds_is[0][1], f_b.index, loc_b)]
+
+    start = time.time()
+    bm_results = [cross_section_walker_dynamic_endpoints(bme, *job[:5], epsilon = epsilon) for job in jobs]
+    bm_time = time.time() - start
+
+    start = time.time()
+    arr_results = [cross_section_walker_dynamic_arrays(mesh, *job[:5], epsilon = epsilon) for job in jobs]
+    arr_time = time.time() - start
+
+    n_diff = 0
+    for bm_res, arr_res in zip(bm_results, arr_results):
+        if [f.index for f in bm_res[2]] != arr_res[2] or bm_res[4] != arr_res[4]:
+            n_diff += 1
+    print('%i walks, BMesh %f seconds, arrays %f seconds' % (len(jobs), bm_time, arr_time))
+    print('%i walks cross different faces' % n_diff)
+    return n_diff
+
+def bench_cut_corridor(bme = None, grid_segments = 500, n_segments = 10, min_fraction = .5, seed = 0):
+    '''
+    times the limit set for long path_between_2_points_clean segments, the two
+    grow_selection_to_find_face floods it used to intersect against cut_arrays.corridor_faces
+
+    bme - BMesh, defaults to a grid of grid_segments**2 quads
+    n_segments - number of random segments
+    min_fraction - segments are at least this fraction of the bounding box diagonal long
+
+    prints the time saved per segment and returns a list of
+    (flood seconds, corridor seconds, flood faces, corridor faces, walk error) per segment
+    '''
+    if bme == None:
+        bme = bmesh.new()
+        bmesh.ops.create_grid(bme, x_segments = grid_segments, y_segments = grid_segments, size = 1)
+    bme.verts.ensure_lookup_table()
+    bme.faces.ensure_lookup_table()
+    bme.normal_update()
+    mesh = mesh_arrays_for_bmesh(bme, rebuild = True)
+    mesh.face_neighbors()
+    mesh.face_centers()
+    rng = random.Random(seed)
+
+    cos = np.array([v.co[:] for v in bme.verts])
+    diag = np.linalg.norm(cos.max(axis = 0) - cos.min(axis = 0))
+
+    results = []
+    while len(results) < n_segments:
+        f_a, f_b = rng.choice(bme.faces), rng.choice(bme.faces)
+        loc_a, loc_b = f_a.calc_center_median(), f_b.calc_center_median()
+        if (loc_b - loc_a).length < min_fraction * diag: continue
+
+        start = time.time()
+        faces_a = grow_selection_to_find_face(bme, f_a, f_b)
+        faces_b = grow_selection_to_find_face(bme, f_b, f_a)
+        flood = faces_a & faces_b
+        flood_time = time.time() - start
+
+        start = time.time()
+        corridor = corridor_faces(mesh, f_a.index, f_b.index, loc_a, loc_b, f_a.normal.cross(loc_b - loc_a))
+        corridor_time = time.time() - start
+
+        error = path_between_2_points_clean(bme, loc_a, f_a.index, loc_b, f_b.index)[-1]
+        n_corridor = len(corridor) if corridor != None else 0
+        results += [(flood_time, corridor_time, len(flood), n_corridor, error)]
+        print('flood %f seconds %i faces, corridor %f seconds %i faces, saved %f seconds, walk error %s' % (flood_time, len(flood), corridor_time, n_corridor, flood_time - corridor_time, str(error)))
+
+    saved = sum(r[0] - r[1] for r in results)/len(results)
+    print('saved %f seconds per segment on average' % saved)
+    return results
+
+def bench_segment_pool(bme = None, grid_segments = 500, n_segments = 400, process_counts = None, min_fraction = .2, seed = 0):
+    '''
+    times SegmentPool.map on the same random segments with a growing number
+    of worker processes, like a long polyline being previewed
+
+    bme - BMesh, defaults to a grid of grid_segments**2 quads
+    n_segments - number of random segments
+    process_counts - worker counts to try, defaults to 1, 2, 4 ... os.cpu_count()
+    min_fraction - segments are at least this fraction of the bounding box diagonal long
+
+    prints the speedup over one process and returns a list of
+    (processes, seconds, speedup).  The pool start is not timed
+    '''
+    if bme == None:
+        bme = bmesh.new()
+        bmesh.ops.create_grid(bme, x_segments = grid_segments, y_segments = grid_segments, size = 1)
+    bme.faces.ensure_lookup_table()
+    bme.normal_update()
+    mesh = mesh_arrays_for_bmesh(bme, rebuild = True)
+
+    if process_counts == None:
+        process_counts = [1]
+        while process_counts[-1] * 2 < SegmentPool.default_processes():
+            process_counts += [process_counts[-1] * 2]
+        if process_counts[-1] != SegmentPool.default_processes():
+            process_counts += [SegmentPool.default_processes()]
+
+    rng = random.Random(seed)
+    cos = np.array([v.co[:] for v in bme.verts])
+    diag = np.linalg.norm(cos.max(axis = 0) - cos.min(axis = 0))
+    jobs = []
+    while len(jobs) < n_segments:
+        f_a, f_b = rng.choice(bme.faces), rng.choice(bme.faces)
+        loc_a, loc_b = f_a.calc_center_median(), f_b.calc_center_median()
+        if (loc_b - loc_a).length < min_fraction * diag: continue
+        cut_no = f_a.normal.cross(loc_b - loc_a)
+        jobs += [(len(jobs), f_a.index, loc_a[:], f_b.index, loc_b[:], loc_a[:], cut_no[:])]
+
+    threads = not SegmentPool.available()
+    if threads:
+        print('worker processes are not available here, timing threads')
+
+    results = []
+    for n in process_counts:
+        pool = SegmentPool(mesh, processes = n, threads = threads)
+        pool.map(jobs[:n])  #wait for the workers to start
+        start = time.time()
+        pool.map(jobs)
+        dur = time.time() - start
+        pool.close()
+        speedup = results[0][1]/dur if len(results) else 1.0
+        results += [(n, dur, speedup)]
+        print('%i workers: %i segments in %f seconds, %f times one worker' % (n, len(jobs), dur, speedup))
+    return results
+
+def bench_edge_loops(bme = None, grid_segments = 300, n_holes = 2000, seed = 0):
+    '''
+    times sorting the non manifold edges into loops, like every operator does on
+    entry, with edge_loops_from_bmedges and edge_loops_from_bmedges_linear
+
+    bme - BMesh, defaults to a grid with n_holes faces deleted at random, like a
+          scan with lots of small holes
+    n_holes - number of faces deleted from the default grid
+
+    prints and returns dictionary {'SCAN': seconds, 'LINEAR': seconds}
+    '''
+    if bme == None:
+        rng = random.Random(seed)
+        bme = bmesh.new()
+        bmesh.ops.create_grid(bme, x_segments = grid_segments, y_segments = grid_segments, size = 1)
+        bme.faces.ensure_lookup_table()
+        holes = rng.sample(list(bme.faces), min(n_holes, len(bme.faces)))
+        bmesh.ops.delete(bme, geom = holes, context = 3)  #faces only
+    bme.verts.ensure_lookup_table()
+    bme.edges.ensure_lookup_table()
+
+    non_man_eds = [ed.index for ed in bme.edges if not ed.is_manifold]
+    print('%i faces, %i non manifold edges' % (len(bme.faces), len(non_man_eds)))
+
+    results = {}
+    start = time.time()
+    linear = edge_loops_from_bmedges_linear(bme, non_man_eds, ret = {'VERTS','EDGES'})
+    results['LINEAR'] = time.time() - start
+    print('edge_loops_from_bmedges_linear: %i loops in %f seconds' % (len(linear['EDGES']), results['LINEAR']))
+
+    start = time.time()
+    scan = edge_loops_from_bmedges(bme, non_man_eds, ret = {'VERTS','EDGES'})
+    results['SCAN'] = time.time() - start
+    print('edge_loops_from_bmedges: %i loops in %f seconds' % (len(scan['EDGES']), results['SCAN']))
+
+    #same edges in the same loops, the loops may start at a different edge
+    same = sorted(sorted(eds) for eds in scan['EDGES']) == sorted(sorted(eds) for eds in linear['EDGES'])
+    print('same loops: %s' % str(same))
+    return results
+
+def check_label_boundary_loops(grid_segments = 8):
+    '''
+    labels two faces of a grid which touch only at a corner, a pinch vertex
+    for MeshArrays.label_boundary_loops, and checks every border comes out as
+    a closed loop of chained edges: the grid perimeter, the figure of eight
+    hole around the pair and a square around each of the two faces
+
+    returns True if the loops are right
+    '''
+    bme = bmesh.new()
+    bmesh.ops.create_grid(bme, x_segments = grid_segments, y_segments = grid_segments, size = 1)
+    bme.verts.ensure_lookup_table()
+    bme.faces.ensure_lookup_table()
+    mesh = mesh_arrays_for_bmesh(bme, rebuild = True)
+
+    #a face away from the border and one touching it only at a corner
+    f0 = bme.faces[len(bme.faces)//2 + grid_segments//2]
+    edge_neighbors = set(f for ed in f0.edges for f in ed.link_faces)
+    f1 = [f for v in f0.verts for f in v.link_faces if f not in edge_neighbors][0]
+
+    labels = np.zeros(len(bme.faces), dtype=np.int32)
+    labels[[f0.index, f1.index]] = 1
+    loops = mesh.label_boundary_loops(labels)
+    indptr = loops['loop_indptr']
+
+    ok = bool(np.all(loops['loop_closed']))
+    for i in range(len(indptr) - 1):
+        vs = loops['loop_verts'][indptr[i]:indptr[i + 1]].tolist()
+        eds = loops['loop_edges'][indptr[i]:indptr[i + 1]].tolist()
+        for k, ed_ind in enumerate(eds):
+            ed_vs = set(v.index for v in bme.edges[ed_ind].verts)
+            ok = ok and ed_vs == set((vs[k], vs[(k + 1) % len(vs)]))
+
+    lengths = sorted(np.diff(indptr).tolist())
+    expected = sorted([4 * grid_segments, 8, 4, 4])
+    ok = ok and lengths == expected
+    print('loop lengths %s, expected %s, closed %s' % (str(lengths), str(expected), str(loops['loop_closed'].tolist())))
+    print('pinch vertex loops are %s' % ('right' if ok else 'WRONG'))
+    bme.free()
+    return ok
@@ -3,9 +3,13 @@ Created on Oct 8, 2015
 
 @author: Patrick
 '''
+import numpy as np
+
 from mathutils import Vector, Matrix
 import bmesh
 
+from .mesh_arrays import mesh_arrays_for_bmesh, csr_from_pairs
+
 def face_neighbors_by_edge(bmface):
     neighbors = []
     for ed in bmface.edges:
@@ -84,67 +88,79 @@ def rightEdgeForEdgeRegardToVertex(edge, vertex):
 
 
 
-def bmesh_loose_parts_faces(bme, selected_faces = None, max_iters = 100): 
+def bmesh_loose_parts_faces(bme, selected_faces = None, max_iters = None, labels = False): 
     '''
     bme - BMesh
-    selected_faces = list, set or None
-    max_iters = maximum amount
+    selected_faces = list, set or None for every face
+    max_iters = maximum amount of loose parts to return, None for all of them
+    labels - return the island of every face instead, (n_faces,) int32 numpy array,
+             -1 for faces which are not selected
     
-    return - list of lists of BMFaces
+    islands are selected faces joined by edges through other selected faces.
+    All of them are found in one pass over the MeshArrays of bme
+    
+    return - list of sets of BMFaces
     '''
+    #always a fresh snapshot, an edit mesh can change topology without changing
+    #the element counts, and from_bmesh also refreshes the BMFace.index values used below
+    mesh = mesh_arrays_for_bmesh(bme, rebuild = True)
     if selected_faces == None:
-        total_faces = set(bme.faces[:])
+        face_mask = None
     else:
-        if isinstance(selected_faces, list):
-            total_faces = set(selected_faces)
-        elif isinstance(selected_faces, set):
-            total_faces = selected_faces.copy()
-            
-        else:
+        if not isinstance(selected_faces, (list, set)):
             #raise exception
             return []
+        face_mask = np.zeros(mesh.num_faces, dtype=bool)
+        face_mask[[f.index for f in selected_faces]] = True
         
-    islands = []
-    iters = 0
-    while len(total_faces) and iters < max_iters:
-        iters += 1
-        seed = total_faces.pop()
-        island = flood_selection_faces(bme, {}, seed, max_iters = 10000)
-        islands += [island]
-        total_faces.difference_update(island)
+    n, face_labels = mesh.face_components(face_mask = face_mask)
+    if labels:
+        return face_labels
     
-    return islands
+    bme.faces.ensure_lookup_table()
+    return _islands_from_labels(bme.faces, face_labels, n, max_iters)
 
-def bmesh_loose_parts_verts(bme, selected_verts, max_iters = 100): 
+def bmesh_loose_parts_verts(bme, selected_verts, max_iters = None, labels = False): 
     '''
     bme - BMesh
-    selected_verts = list, set or None of BMVert
-    max_iters = maximum amount of loose parts to be found
+    selected_verts = list, set or None of BMVert, None or empty for every vert
+    max_iters = maximum amount of loose parts to return, None for all of them
+    labels - return the island of every vert instead, (n_verts,) int32 numpy array,
+             -1 for verts which are not selected
     
-    return - list of lists of BMVerts
+    islands are selected verts joined by edges through other selected verts.
+    All of them are found in one pass over the MeshArrays of bme
+    
+    return - list of sets of BMVerts
     '''
+    mesh = mesh_arrays_for_bmesh(bme, rebuild = True)  #see bmesh_loose_parts_faces
     if selected_verts == None or len(selected_verts) == 0:
-        total_verts = set(bme.verts[:])
-       
+        vert_mask = None
     else:
-        if isinstance(selected_verts, list):
-            total_verts = set(selected_verts)
-        elif isinstance(selected_verts, set):
-            total_verts = selected_verts.copy()  #don't want to modify initial set
-
-        else:
+        if not isinstance(selected_verts, (list, set)):
             #raise exception
             return []
-    islands = []
-    iters = 0
-    while len(total_verts) and iters < max_iters:
-        iters += 1
-        seed = total_verts.pop()
-        island = flood_island_within_selected_verts(bme, total_verts, seed, max_iters = 10000)
-        islands += [island]
-        total_verts.difference_update(island)
+        vert_mask = np.zeros(mesh.num_verts, dtype=bool)
+        vert_mask[[v.index for v in selected_verts]] = True
     
-    return islands
+    n, vert_labels = mesh.vert_components(vert_mask = vert_mask)
+    if labels:
+        return vert_labels
+    
+    bme.verts.ensure_lookup_table()
+    return _islands_from_labels(bme.verts, vert_labels, n, max_iters)
+
+def _islands_from_labels(elements, element_labels, n, max_iters):
+    '''
+    groups the labelled elements into one set per label
+    '''
+    inds = np.flatnonzero(element_labels >= 0)
+    indptr, indices = csr_from_pairs(element_labels[inds], inds, n)
+    if max_iters != None and n > max_iters:
+        print('returning %i of %i loose parts' % (max_iters, n))
+        n = max_iters
+    indices = indices.tolist()
+    return [set(elements[i] for i in indices[indptr[k]:indptr[k + 1]]) for k in range(n)]
 
 def new_bmesh_from_bmelements(geom):
     
@@ -743,6 +759,75 @@ def edge_loops_from_bmedges_old(bmesh, bm_edges):
 
     return line_polys
 
+def edge_loops_from_bmedges_linear(bmesh, bm_edges, ret = {'VERTS'}):
+    """
+    args:
+       bmesh - a BMEsh
+       bm_edges - an UNORDERED list of edge indices in the bmesh
+       ret - a dictionary with {'VERTS', 'EDGES'}  which determines what data to return
+    
+    returns:
+        the same dictionary as edge_loops_from_bmedges
+    
+    Same loops as edge_loops_from_bmedges, but the chains are walked through a
+    vert -> edges dictionary so each edge is looked at a constant number of
+    times, instead of scanning the remaining edges for every step.  Scanned
+    meshes with thousands of holes take linear time.
+    
+    Where more than 2 of the edges meet at a vert a chain goes on along one of
+    them, and the others start chains of their own
+    """
+    geom_dict = dict()
+    geom_dict['VERTS'] = []
+    geom_dict['EDGES'] = []
+    
+    edge_verts = {}
+    vert_edges = {}
+    for ind in bm_edges:
+        v0, v1 = [v.index for v in bmesh.edges[ind].verts]
+        edge_verts[ind] = (v0, v1)
+        vert_edges.setdefault(v0, []).append(ind)
+        vert_edges.setdefault(v1, []).append(ind)
+    
+    used = set()
+    def walk(v_ind, chain_verts, chain_edges):
+        '''
+        extends the chain from v_ind until it runs out of unused edges
+        '''
+        while True:
+            eds = vert_edges[v_ind]
+            while len(eds) and eds[-1] in used:  #every edge is popped at most twice
+                eds.pop()
+            if not len(eds): return
+            ind = eds.pop()
+            used.add(ind)
+            v0, v1 = edge_verts[ind]
+            v_ind = v1 if v0 == v_ind else v0
+            chain_verts.append(v_ind)
+            chain_edges.append(ind)
+    
+    for ind in reversed(bm_edges):
+        if ind in used: continue
+        used.add(ind)
+        vert_end, vert_start = edge_verts[ind]
+        
+        line_poly = [vert_start, vert_end]
+        ed_loop = [ind]
+        walk(vert_end, line_poly, ed_loop)
+        
+        if line_poly[-1] != vert_start:  #open chain, it may go on behind the start
+            back_verts, back_edges = [], []
+            walk(vert_start, back_verts, back_edges)
+            line_poly = back_verts[::-1] + line_poly
+            ed_loop = back_edges[::-1] + ed_loop
+            
+        if 'VERTS' in ret:            
+            geom_dict['VERTS'] += [line_poly]
+        if 'EDGES' in ret:
+            geom_dict['EDGES'] += [ed_loop]
+
+    return geom_dict
+
 def walk_non_man_edge(bme, start_edge, stop, max_iters = 5000):
     '''
     bme = BMesh
@@ -1006,7 +1091,7 @@ def face_region_boundary_loops(bme, sel_faces):
     face_set = set(sel_faces)
     edges_raw = [ed.index for ed in bme.edges if ed.select and len([f.index for f in ed.link_faces if f.index in face_set]) == 1]
     
-    geom_dict = edge_loops_from_bmedges(bme, edges_raw, ret={'VERTS','EDGES'})
+    geom_dict = edge_loops_from_bmedges_linear(bme, edges_raw, ret={'VERTS','EDGES'})
     
     return geom_dict
 
@@ -15,6 +15,8 @@ from mathutils.geometry import intersect_line_plane, intersect_point_line, dista
 #Cut Mesh imports
 from .bmesh_fns import face_neighbors, flood_selection_faces, grow_selection_to_find_face, edge_loops_from_bmedges, walk_non_man_edge
 from .common.blender import bversion
+from .mesh_arrays import mesh_arrays_for_bmesh
+from .cut_arrays import PlaneCrossings, FacePlane, corridor_faces
 
 #basic utils
 def list_shift(seq, n):
@@ -22,12 +24,72 @@ def list_shift(seq, n):
     return seq[n:] + seq[:n]
 
 
-def find_bmedges_crossing_plane(pt, no, edges, epsilon, sort = False):
+def edge_crossing_point(edge, pt, no, crossings = None):
+    '''
+    intersect_line_plane of a BMEdge, looked up in crossings when given
+    crossings - cut_arrays.PlaneCrossings for the same pt, no or None
+    '''
+    if crossings == None:
+        return intersect_line_plane(edge.verts[0].co, edge.verts[1].co, pt, no)
+    co = crossings.edge_point(edge.index)
+    if co == None: return None
+    return Vector(co)
+
+def edge_plane_dists(edge, pt, no, crossings = None):
+    '''
+    signed distances of the 2 verts of a BMEdge to the plane
+    crossings - cut_arrays.PlaneCrossings or FacePlane for the same pt, no or None
+    '''
+    v0, v1 = edge.verts
+    if crossings == None:
+        return no.dot(v0.co - pt), no.dot(v1.co - pt)
+    return crossings.dist(v0.index), crossings.dist(v1.index)
+
+def walker_plane(crossings, c_pt, c_no, pt, no, epsilon):
+    '''
+    lookups for the plane pt, no the dynamic walker cuts a face with
+    crossings - PlaneCrossings of the corridor plane or None
+    c_pt, c_no - crossings.pt and unit crossings.no as mathutils.Vector
+
+    returns crossings itself where pt, no is the corridor plane (flat stretches of the
+    corridor), a cut_arrays.FacePlane on the same snapshot otherwise, None without crossings
+    '''
+    if crossings == None: return None
+    if abs(no.dot(c_no)) > 1 - 1e-6 and abs(c_no.dot(pt - c_pt)) < epsilon:
+        return crossings
+    return FacePlane(crossings.mesh, pt, no)
+
+def corridor_face_set(bme, ind_a, ind_b, loc_a, loc_b, cut_no, mesh = None):
+    '''
+    set of BMFaces to limit a walk from face ind_a to face ind_b along the plane
+    through loc_a with normal cut_no, see cut_arrays.corridor_faces.
+    
+    falls back to intersecting grow_selection_to_find_face floods if the
+    bidirectional search can not meet near the plane
+    mesh - MeshArrays of bme, None looks them up with mesh_arrays_for_bmesh
+    '''
+    if mesh == None:
+        mesh = mesh_arrays_for_bmesh(bme)
+    ab = (loc_b - loc_a).length
+    face_inds = corridor_faces(mesh, ind_a, ind_b, loc_a, loc_b, cut_no)
+    if face_inds == None:
+        print('corridor did not meet, widening the band')
+        face_inds = corridor_faces(mesh, ind_a, ind_b, loc_a, loc_b, cut_no, band = 4 * ab)
+    if face_inds == None:
+        print('corridor did not meet, flooding')
+        faces_a = grow_selection_to_find_face(bme, bme.faces[ind_a], bme.faces[ind_b])
+        faces_b = grow_selection_to_find_face(bme, bme.faces[ind_b], bme.faces[ind_a])
+        return faces_a & faces_b
+    
+    return set(bme.faces[i] for i in face_inds)
+
+def find_bmedges_crossing_plane(pt, no, edges, epsilon, sort = False, crossings = None):
     '''
     pt - pt on cutting plane: mathutils.Vector
     no - normal of cutting plane: mathutils.Vector
     edges - edges of BMFace:  bmesh.BMEdge
     epsilon - dist from plane < epsilon means coplanar
+    crossings - optional cut_arrays.PlaneCrossings of pt, no, distances and intersections are looked up
     
     returns a list of tupples (edge, intersection):  [(BMEdges, mathutils.Vector)]
     
@@ -42,10 +104,11 @@ def find_bmedges_crossing_plane(pt, no, edges, epsilon, sort = False):
     '''
     
     coords = {}
-    for edge in edges:
-        v0,v1 = edge.verts
-        if v0 not in coords: coords[v0] = no.dot(v0.co-pt)
-        if v1 not in coords: coords[v1] = no.dot(v1.co-pt)
+    if crossings == None:
+        for edge in edges:
+            v0,v1 = edge.verts
+            if v0 not in coords: coords[v0] = no.dot(v0.co-pt)
+            if v1 not in coords: coords[v1] = no.dot(v1.co-pt)
     #print(str(coords))
     
     i_edges = []
@@ -55,13 +118,16 @@ def find_bmedges_crossing_plane(pt, no, edges, epsilon, sort = False):
     
     for edge in edges:
         v0,v1 = edge.verts
-        s0,s1 = coords[v0],coords[v1]
+        if crossings == None:
+            s0,s1 = coords[v0],coords[v1]
+        else:
+            s0,s1 = edge_plane_dists(edge, pt, no, crossings)
         if s0 > epsilon and s1 > epsilon: continue
         if s0 < -epsilon and s1 < -epsilon: continue
         #if not ((s0>epsilon and s1<-epsilon) or (s0<-epsilon and s1>epsilon)):      # edge cross plane?
         #    continue
         
-        i = intersect_line_plane(v0.co, v1.co, pt, no)
+        i = edge_crossing_point(edge, pt, no, crossings)
         if not i: continue  
         d = (i - pt).length
         if d == 0.00:
@@ -155,7 +221,7 @@ def find_distant_bmedge_crossing_plane(pt, no, edges, epsilon, e_ind_from, co_fr
         if d > d_max: d_max,edge_max,i_max = d,edge,i
     return (edge_max,i_max)
 
-def find_sorted_bmedges_crossing_plane(pt, no, edges, epsilon, e_ind_from, co_from):
+def find_sorted_bmedges_crossing_plane(pt, no, edges, epsilon, e_ind_from, co_from, crossings = None):
     '''
     pt - point on cutting plane: mathutils.Vector
     no - normal of cutting plane: mathutils.Vector
@@ -164,6 +230,7 @@ def find_sorted_bmedges_crossing_plane(pt, no, edges, epsilon, e_ind_from, co_fr
     e_ind_from - index of the previous bmesh edge the walker just crossed
     co_from  - location where the cutting plane crosses the lats BMEdge (e_ind_from)
     #e_exclude - a dictionary of edges previulsy crossed. dictionary should return order in which edges were crossed.
+    crossings - optional cut_arrays.PlaneCrossings of pt, no, distances and intersections are looked up
     
     returns a list of bmedges that *cross* plane and corresponding intersection points
     
@@ -175,12 +242,10 @@ def find_sorted_bmedges_crossing_plane(pt, no, edges, epsilon, e_ind_from, co_fr
         # shortcut (no need to find multiple... just find first)
         for edge in edges:
             if edge.index == e_ind_from: continue
-            v0,v1 = edge.verts
-            co0,co1 = v0.co,v1.co
-            s0,s1 = no.dot(co0 - pt), no.dot(co1 - pt)
+            s0,s1 = edge_plane_dists(edge, pt, no, crossings)
             no_cross = not ((s0>epsilon and s1<-epsilon) or (s0<-epsilon and s1>epsilon))
             if no_cross: continue
-            i = intersect_line_plane(co0, co1, pt, no)
+            i = edge_crossing_point(edge, pt, no, crossings)
             return [(edge,i)]
 
     #http://stackoverflow.com/questions/6618515/sorting-list-based-on-values-from-another-list
@@ -188,22 +253,26 @@ def find_sorted_bmedges_crossing_plane(pt, no, edges, epsilon, e_ind_from, co_fr
     intersects = []
     ds = [] 
     coords = {} #cache these to prevent twice per vert calcing
-    for edge in edges:
-        v0,v1 = edge.verts
-        if v0 not in coords: coords[v0] = no.dot(v0.co-pt)
-        if v1 not in coords: coords[v1] = no.dot(v1.co-pt)
+    if crossings == None:
+        for edge in edges:
+            v0,v1 = edge.verts
+            if v0 not in coords: coords[v0] = no.dot(v0.co-pt)
+            if v1 not in coords: coords[v1] = no.dot(v1.co-pt)
         
     for edge in edges:
         #if edge.index == e_ind_from: continue  #<--we do need the e_ind_from edge because it helps us sort
         #if edge.index in e_ind_exclude: continue  #<-maybe don't need this because of the ordering :-)
         v0,v1 = edge.verts
-        s0,s1 = coords[v0],coords[v1]
+        if crossings == None:
+            s0,s1 = coords[v0],coords[v1]
+        else:
+            s0,s1 = edge_plane_dists(edge, pt, no, crossings)
         if s0 > epsilon and s1 > epsilon: continue
         if s0 < -epsilon and s1 < -epsilon: continue
         #if not ((s0>epsilon and s1<-epsilon) or (s0<-epsilon and s1>epsilon)):      # edge cross plane?
         #    continue
         
-        i = intersect_line_plane(v0.co, v1.co, pt, no)
+        i = edge_crossing_point(edge, pt, no, crossings)
         d = (i - co_from).length
         
         i_edges += [edge]
@@ -252,7 +321,7 @@ def find_sorted_bmedges_crossing_plane(pt, no, edges, epsilon, e_ind_from, co_fr
         print(no)
         return []
     
-def cross_section_walker_endpoints(bme, pt, no, f_ind_from, e_ind_from, co_from, f_ind_to, co_to, epsilon, limit_set = None, max_iters = 10000):
+def cross_section_walker_endpoints(bme, pt, no, f_ind_from, e_ind_from, co_from, f_ind_to, co_to, epsilon, limit_set = None, max_iters = 10000, crossings = None):
     '''
     bme -  bmesh
     pt  - a point on cutting plane: mathutils.Vector
@@ -262,6 +331,7 @@ def cross_section_walker_endpoints(bme, pt, no, f_ind_from, e_ind_from, co_from,
     co_from - location of intersectino of e_ind_from edge and cutting plane:  mathutils.Vector
     f_end_to - index of face which we are walking toward
     co_to  - location of end point, not necessarily and edge intersection, often a racy_cast result in middle of a face
+    crossings - optional cut_arrays.PlaneCrossings of pt, no covering limit_set (or the whole mesh)
     
     returns tuple (verts,ed_inds, looped, found) by walking around a bmesh near the given plane
     verts: List of intersections of edges and cutting plane (in order) mathutils.Vector  co_2 is excluded
@@ -309,7 +379,7 @@ def cross_section_walker_endpoints(bme, pt, no, f_ind_from, e_ind_from, co_from,
     #co_end will be bweteen edges 0,1  2,3  3,4 even if f_end is a concve ngon sith 4,6,8... intersections
     valid_end = False
     f_end = bme.faces[f_ind_to]
-    eds_is = find_bmedges_crossing_plane(pt, no, f_end.edges, epsilon)
+    eds_is = find_bmedges_crossing_plane(pt, no, f_end.edges, epsilon, crossings = crossings)
     for i in range(0,int(len(eds_is)/2)):
         p0 = eds_is[2*i][1]
         p1 = eds_is[2*i + 1][1]
@@ -327,7 +397,7 @@ def cross_section_walker_endpoints(bme, pt, no, f_ind_from, e_ind_from, co_from,
     
     while True:
         # find edges in the face that cross the plane
-        cross_eds = find_sorted_bmedges_crossing_plane(pt, no, f_cur.edges, epsilon, e_ind_from, co_from)
+        cross_eds = find_sorted_bmedges_crossing_plane(pt, no, f_cur.edges, epsilon, e_ind_from, co_from, crossings)
         edge, i = cross_eds[0]
         verts += [i]
         eds_crossed += [edge]
@@ -375,7 +445,7 @@ def cross_section_walker_endpoints(bme, pt, no, f_ind_from, e_ind_from, co_from,
             
             elif len(bme.faces[find_next].edges) > 4 and f_inds_dict[find_next] == 0:
                 print('more than 4 edges, and the first face we started with')
-                next_crosses = find_sorted_bmedges_crossing_plane(pt, no, f_next.edges, epsilon, eind_next, co_next)
+                next_crosses = find_sorted_bmedges_crossing_plane(pt, no, f_next.edges, epsilon, eind_next, co_next, crossings)
                 if all(e.index in e_inds_dict for e, i in next_crosses[1:]):  #all the other edges of the face have been seen, we have looped
                     print('looped, all the other edges in the ngon has been tested, and it was the first ngon we tested')
                     looped = True
@@ -411,7 +481,7 @@ def cross_section_walker_endpoints(bme, pt, no, f_ind_from, e_ind_from, co_from,
     
     return (verts,eds_crossed, faces_crossed, looped, found, error)
 
-def cross_section_walker_dynamic_endpoints(bme, f_ind_from, e_ind_from, co_from, f_ind_to, co_to, epsilon, limit_set = None, max_iters = 10000):
+def cross_section_walker_dynamic_endpoints(bme, f_ind_from, e_ind_from, co_from, f_ind_to, co_to, epsilon, limit_set = None, max_iters = 10000, crossings = None):
     '''
     bme -  bmesh
     f_ind_from - index of face which we are walking from: Int
@@ -422,6 +492,9 @@ def cross_section_walker_dynamic_endpoints(bme, f_ind_from, e_ind_from, co_from,
     epsilon
     limit_set = None, or set(BMFaces).  Used to stop walking if new faces found are not in the limit set
     max_iters - Integer, number of steps used to prevent exscessive infinite loops
+    crossings - optional cut_arrays.PlaneCrossings of the corridor plane with a unit normal.
+                Faces cut by that same plane use its lookups, the re-aimed planes of the other
+                faces are cut from the same MeshArrays snapshot, see walker_plane
     
     returns tuple (verts,ed_inds, looped, found) by walking around a bmesh near the given plane
     verts: List of intersections of edges and cutting plane (in order) mathutils.Vector  co_2 is excluded
@@ -435,6 +508,10 @@ def cross_section_walker_dynamic_endpoints(bme, f_ind_from, e_ind_from, co_from,
     
     vec = co_to - co_from
     vec.normalize()
+    if crossings != None:
+        c_pt, c_no = Vector(crossings.pt.tolist()), Vector(crossings.no.tolist()).normalized()
+    else:
+        c_pt, c_no = None, None
     # returned values
     verts = [co_from]
     eds_crossed = [bme.edges[e_ind_from]]
@@ -467,7 +544,9 @@ def cross_section_walker_dynamic_endpoints(bme, f_ind_from, e_ind_from, co_from,
     #find the edges we might cross at the end, make sure where we are headed is valid
     #co_end will be bweteen edges 0,1  2,3  3,4 even if f_end is a concve ngon sith 4,6,8... intersections
     f_end = bme.faces[f_ind_to]
-    eds_is = find_bmedges_crossing_plane(co_to, f_end.normal.cross(vec), f_end.edges, epsilon)
+    end_no = f_end.normal.cross(vec)
+    end_plane = walker_plane(crossings, c_pt, c_no, co_to, end_no, epsilon)
+    eds_is = find_bmedges_crossing_plane(co_to, end_no, f_end.edges, epsilon, crossings = end_plane)
     valid_end = False
     for i in range(0,int(len(eds_is)/2)):
         p0 = eds_is[2*i][1]
@@ -501,7 +580,8 @@ def cross_section_walker_dynamic_endpoints(bme, f_ind_from, e_ind_from, co_from,
             
         
         # find edges in the face that cross the plane
-        cross_eds = find_sorted_bmedges_crossing_plane(verts[-1], no, f_cur.edges, epsilon, e_ind_from, co_from)
+        plane = walker_plane(crossings, c_pt, c_no, verts[-1], no, epsilon)
+        cross_eds = find_sorted_bmedges_crossing_plane(verts[-1], no, f_cur.edges, epsilon, e_ind_from, co_from, crossings = plane)
         
         if not len(cross_eds):
             return verts,eds_crossed, faces_crossed, False, False, 'STOP_MID'
@@ -561,7 +641,7 @@ def cross_section_walker_dynamic_endpoints(bme, f_ind_from, e_ind_from, co_from,
             
             elif len(bme.faces[find_next].edges) > 4 and f_inds_dict[find_next] == 0:
                 print('more than 4 edges, and the first face we started with')
-                next_crosses = find_sorted_bmedges_crossing_plane(verts[-1], no, f_next.edges, epsilon, eind_next, co_next)
+                next_crosses = find_sorted_bmedges_crossing_plane(verts[-1], no, f_next.edges, epsilon, eind_next, co_next, crossings = plane)
                 if all(e.index in e_inds_dict for e, i in next_crosses[1:]):  #all the other edges of the face have been seen, we have looped
                     print('looped, all the other edges in the ngon has been tested, and it was the first ngon we tested')
                     looped = True
@@ -638,17 +718,6 @@ def path_between_2_points(bme, bvh, pt_a, pt_b,
         print('dumb rule!')
         prev_face = None
         
-    if use_limit:
-        #grow selection from A to B and from B to A this way we get good connectivity
-        faces_a = grow_selection_to_find_face(bme, bme.faces[ind_a], bme.faces[ind_b])
-        faces_b = grow_selection_to_find_face(bme, bme.faces[ind_b], bme.faces[ind_a])
-        faces_set = faces_a & faces_b
-        times.append(time.time())
-        step = times[-1] - times[-2]
-        #print('did connectivity growing in %f' % step) 
-    else:
-        faces_set = None
-    
 
 
     verts = {}
@@ -660,6 +729,15 @@ def path_between_2_points(bme, bvh, pt_a, pt_b,
     cut_no_a = no_a.cross(vec)
     cut_no_b = no_b.cross(vec)
     
+    if use_limit:
+        #corridor between A and B along the cut plane, this way we get good connectivity
+        faces_set = corridor_face_set(bme, ind_a, ind_b, loc_a, loc_b, cut_no_a)
+        times.append(time.time())
+        step = times[-1] - times[-2]
+        #print('found cut corridor in %f' % step) 
+    else:
+        faces_set = None
+    
     # find intersections of edges and cutting plane
     bmface = bme.faces[ind_a]
     bmedges = bmface.edges
@@ -757,7 +835,8 @@ def path_between_2_points_clean(bme, loc_a, ind_a,
                                 debug = True, 
                                 prev_face = None, 
                                 use_limit = True,
-                                epsilon = 0.00001):
+                                epsilon = 0.00001,
+                                mesh = None):
     '''
     Takes a bmesh and associated 
     world matrix of the object 
@@ -771,6 +850,9 @@ def path_between_2_points_clean(bme, loc_a, ind_a,
         mx:   World matrix (type Mathutils.Matrix)
         pt_A: any point close to the  bmesh surface
         pt_b:  any point close to the bmesh surface
+        mesh: MeshArrays of bme, None looks them up with mesh_arrays_for_bmesh.
+              The corridor plane is classified on it once and the walkers look
+              distances and crossings up instead of reading BMVert.co
         
     '''
     times = [time.time()]
@@ -783,17 +865,6 @@ def path_between_2_points_clean(bme, loc_a, ind_a,
         print('dumb rule!')
         prev_face = None
         
-    if use_limit:
-        #grow selection from A to B and from B to A this way we get good connectivity
-        faces_a = grow_selection_to_find_face(bme, bme.faces[ind_a], bme.faces[ind_b])
-        faces_b = grow_selection_to_find_face(bme, bme.faces[ind_b], bme.faces[ind_a])
-        faces_set = faces_a & faces_b
-        times.append(time.time())
-        step = times[-1] - times[-2]
-        #print('did connectivity growing in %f' % step) 
-    else:
-        faces_set = None
-    
 
     verts = {}
     
@@ -803,10 +874,27 @@ def path_between_2_points_clean(bme, loc_a, ind_a,
     cut_no_a = no_a.cross(vec)
     cut_no_b = no_b.cross(vec)
     
+    if mesh == None:
+        mesh = mesh_arrays_for_bmesh(bme)
+    
+    if use_limit:
+        #corridor between A and B along the cut plane, this way we get good connectivity
+        faces_set = corridor_face_set(bme, ind_a, ind_b, loc_a, loc_b, cut_no_a, mesh = mesh)
+        times.append(time.time())
+        step = times[-1] - times[-2]
+        #print('found cut corridor in %f' % step) 
+    else:
+        faces_set = None
+    
+    #classify the corridor against the cut plane once, unit normal so the distances
+    #compare to epsilon like the per face planes of the walker do
+    faces = [f.index for f in faces_set] if faces_set else None
+    crossings = PlaneCrossings(mesh, loc_a, cut_no_a.normalized(), faces = faces)
+    
     # find intersections of edges and cutting plane
     bmface = bme.faces[ind_a]
     bmedges = bmface.edges
-    ei_init = find_bmedges_crossing_plane(loc_a, cut_no_a, bmedges, epsilon)
+    ei_init = find_bmedges_crossing_plane(loc_a, cut_no_a, bmedges, epsilon, crossings = crossings)
     
     if len(ei_init) < 2:
         print('warning: it should not reach here! len(ei_init) = %d' % len(ei_init))
@@ -821,13 +909,13 @@ def path_between_2_points_clean(bme, loc_a, ind_a,
         
     # start walking one way around bmesh
     if (prev_face and prev_face not in ei0_max[0].link_faces) or not prev_face:
-        verts0, crossed_eds0, crossed_faces0, looped0, found0, error0 = cross_section_walker_dynamic_endpoints(bme, ind_a, ei0_max[0].index, ei0_max[1], ind_b, loc_b, epsilon, limit_set = faces_set)
+        verts0, crossed_eds0, crossed_faces0, looped0, found0, error0 = cross_section_walker_dynamic_endpoints(bme, ind_a, ei0_max[0].index, ei0_max[1], ind_b, loc_b, epsilon, limit_set = faces_set, crossings = crossings)
     else:
         print('prev face prevented walking in the Verts0 direction')
         verts0, crossed_eds0, crossed_faces0, looped0, found0, error0 = [], [], [], False, False, 'PREV_FACE'
         
     if (prev_face and prev_face not in ei1_max[0].link_faces) or not prev_face:
-        verts1, crossed_eds1, crossed_faces1, looped1, found1, error1 = cross_section_walker_dynamic_endpoints(bme, ind_a, ei1_max[0].index, ei1_max[1], ind_b, loc_b, epsilon, limit_set = faces_set)
+        verts1, crossed_eds1, crossed_faces1, looped1, found1, error1 = cross_section_walker_dynamic_endpoints(bme, ind_a, ei1_max[0].index, ei1_max[1], ind_b, loc_b, epsilon, limit_set = faces_set, crossings = crossings)
     else:
         print('prev face prevented walking in the Verts1 direction')
         verts1, crossed_eds1, crossed_faces1, looped1, found1, error1 = [], [], [], False, False, 'PREV_FACE'
@@ -901,8 +989,15 @@ def cross_section_2seeds_ver1(bme, point, normal,
                        debug = True, 
                        prev_face = None, 
                        epsilon = .0000001,
-                       topo_limit = True):
+                       topo_limit = True,
+                       use_arrays = False,
+                       mesh = None):
     '''
+    use_arrays - classify the flooded faces (or the whole mesh) against the plane in one
+                 NumPy pass with cut_arrays.PlaneCrossings, the walkers then only look up
+                 distances and intersections.  Pays off when many segments are cut
+    mesh - MeshArrays of bme for use_arrays, pass a snapshot taken on the main
+           thread when calling from a worker thread.  None looks them up
     '''
     #convert plane defn (point and normal) into local coords
     #imx = mx.inverted()
@@ -956,11 +1051,18 @@ def cross_section_2seeds_ver1(bme, point, normal,
     else:
         flood_set = None
     
+    if use_arrays:
+        faces = [f.index for f in flood_set] if flood_set else None
+        if mesh == None:
+            mesh = mesh_arrays_for_bmesh(bme)
+        crossings = PlaneCrossings(mesh, pt, no, faces = faces)
+    else:
+        crossings = None
     
     # find intersections of edges and cutting plane
     bmface = bme.faces[seed_index0]
     bmedges = bmface.edges
-    ei_init = find_bmedges_crossing_plane(pt, no, bmedges, epsilon)
+    ei_init = find_bmedges_crossing_plane(pt, no, bmedges, epsilon, crossings = crossings)
     
     if prev_face and (prev_face.index == seed_index0 or prev_face.index == seed_index1):
         print('dumb rule!')
@@ -980,7 +1082,7 @@ def cross_section_2seeds_ver1(bme, point, normal,
     if (prev_face and prev_face not in ei0_max[0].link_faces) or not prev_face:
         verts0, crossed_eds0, crossed_faces0, looped0, found0, error0 = cross_section_walker_endpoints(bme, pt, no, 
                                                                                seed_index0, ei0_max[0].index, ei0_max[1], 
-                                                                               seed_index1, co_1, epsilon,                                                                                limit_set=flood_set)
+                                                                               seed_index1, co_1, epsilon,                                                                                limit_set=flood_set, crossings = crossings)
     else:
         print('prev face prevented walking in the Verts0 direction')
         verts0, crossed_eds0, crossed_faces0, looped0, found0, error0 = [], [], [], False, False, 'PREV_FACE'
@@ -989,7 +1091,7 @@ def cross_section_2seeds_ver1(bme, point, normal,
         verts1, crossed_eds1, crossed_faces1, looped1, found1, error1 = cross_section_walker_endpoints(bme, pt, no, 
                                                                                seed_index0, ei1_max[0].index, ei1_max[1], 
                                                                                seed_index1, co_1, epsilon, 
-                                                                               limit_set=flood_set)
+                                                                               limit_set=flood_set, crossings = crossings)
     else:
         print('prev face prevented walking in the Verts1 direction')
         verts1, crossed_eds1, crossed_faces1, looped1, found1, error1 = [], [], [], False, False, 'PREV_FACE'
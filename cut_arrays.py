@@ -0,0 +1,642 @@
+'''
+Array versions of the plane cutting helpers in cut_algorithms
+
+find_bmedges_crossing_plane and friends compute no.dot(v.co - pt) and
+intersect_line_plane for every edge of every face the walkers visit.  For a
+fixed cut plane PlaneCrossings does that for the whole mesh (or the faces the
+walk is limited to) in one NumPy pass, and the walkers only look the results up.
+
+This module does not import bpy, bmesh or mathutils, it works on
+mesh_arrays.MeshArrays snapshots taken with edges (MeshArrays.from_bmesh)
+'''
+import heapq
+
+import numpy as np
+
+from .mesh_arrays import csr_gather
+
+
+class PlaneCrossings(object):
+    '''
+    every edge of a mesh classified against one cut plane
+
+    mesh - MeshArrays with edge_verts and face_edges
+    pt - point on the cut plane, any 3 sequence
+    no - normal of the cut plane, any 3 sequence, not necessarily unit length
+    faces - optional face indices, only the verts and edges of these faces and the ring of
+            faces around them are classified.  The ring lets a walk step one face outside
+            (where it notices it left the limit set), everything else is reported as far
+            above the plane
+
+    vert_dist - (n_verts,) float64, no.dot(co - pt) like the python helpers compute it
+    edge_t - (n_edges,) float64, parameter of the crossing along edge_verts[e], nan if the
+             edge is parallel to the plane or was not classified
+    points - (n_edges, 3) float64 crossing locations, nan where edge_t is nan
+    '''
+    def __init__(self, mesh, pt, no, faces = None):
+        self.mesh = mesh
+        self.pt = np.asarray(pt[:], dtype=np.float64)
+        self.no = np.asarray(no[:], dtype=np.float64)
+
+        if faces is None:
+            vert_inds = slice(None)
+            edge_inds = slice(None)
+        else:
+            faces = np.fromiter(faces, dtype=np.int64) if not isinstance(faces, np.ndarray) else faces
+            ef_indptr, ef_indices = mesh.edge_faces()
+            edge_inds = np.unique(csr_gather(mesh.face_indptr, mesh.face_edges, faces)[0])
+            faces = np.unique(csr_gather(ef_indptr, ef_indices, edge_inds)[0])
+            vert_inds = np.unique(csr_gather(mesh.face_indptr, mesh.face_verts, faces)[0])
+            edge_inds = np.unique(csr_gather(mesh.face_indptr, mesh.face_edges, faces)[0])
+
+        self.vert_dist = np.full(mesh.num_verts, np.inf)
+        self.vert_dist[vert_inds] = np.dot(mesh.coords[vert_inds] - self.pt, self.no)
+
+        ev = mesh.edge_verts[edge_inds]
+        s0, s1 = self.vert_dist[ev[:, 0]], self.vert_dist[ev[:, 1]]
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            t = s0/(s0 - s1)
+        t[~np.isfinite(t)] = np.nan
+
+        self.edge_t = np.full(mesh.num_edges, np.nan)
+        self.edge_t[edge_inds] = t
+        self.points = np.full((mesh.num_edges, 3), np.nan)
+        co0, co1 = mesh.coords[ev[:, 0]], mesh.coords[ev[:, 1]]
+        self.points[edge_inds] = co0 + t[:, None] * (co1 - co0)
+
+        #python floats, indexing these from the walkers is cheaper than numpy scalars
+        self.vert_dist_list = self.vert_dist.tolist()
+
+    def dist(self, v_ind):
+        return self.vert_dist_list[v_ind]
+
+    def crossing_edges(self, epsilon):
+        '''
+        bool (n_edges,), edges which are not entirely more than epsilon to one side
+        of the plane and are not parallel to it.  The same test find_bmedges_crossing_plane uses
+        '''
+        ev = self.mesh.edge_verts
+        s0, s1 = self.vert_dist[ev[:, 0]], self.vert_dist[ev[:, 1]]
+        above = (s0 > epsilon) & (s1 > epsilon)
+        below = (s0 < -epsilon) & (s1 < -epsilon)
+        return ~above & ~below & ~np.isnan(self.edge_t)
+
+    def strict_crossing_edges(self, epsilon):
+        '''
+        bool (n_edges,), edges with one vert more than epsilon above and the other more than epsilon below
+        '''
+        ev = self.mesh.edge_verts
+        s0, s1 = self.vert_dist[ev[:, 0]], self.vert_dist[ev[:, 1]]
+        return ((s0 > epsilon) & (s1 < -epsilon)) | ((s0 < -epsilon) & (s1 > epsilon))
+
+    def edge_point(self, e_ind):
+        '''
+        crossing location of edge e_ind as a tuple, None if it is parallel to the plane
+        '''
+        if np.isnan(self.edge_t[e_ind]): return None
+        return tuple(self.points[e_ind].tolist())
+
+
+def face_normals(mesh):
+    '''
+    (n_faces, 3) unit face normals by Newell's method, cached on the snapshot
+    '''
+    if 'face_normals' in mesh.cache:
+        return mesh.cache['face_normals']
+
+    nxt = np.arange(1, len(mesh.face_verts) + 1)
+    nxt[mesh.face_indptr[1:] - 1] = mesh.face_indptr[:-1]  #wrap to the first vert of each face
+    P = mesh.coords[mesh.face_verts]
+    Q = mesh.coords[mesh.face_verts[nxt]]
+    face = np.repeat(np.arange(mesh.num_faces), np.diff(mesh.face_indptr))
+
+    N = np.zeros((mesh.num_faces, 3))
+    np.add.at(N, face, np.cross(P, Q))
+    N /= np.maximum(np.linalg.norm(N, axis = 1), 1e-30)[:, None]
+    mesh.cache['face_normals'] = N
+    return N
+
+def topology_lists(mesh):
+    '''
+    python list copies of the arrays the index walkers step through, cached on the snapshot.
+    indexing lists is much cheaper than indexing numpy arrays one element at a time
+
+    returns coords, face_indptr, face_edges, edge_verts, edge_face_indptr, edge_face_indices
+    '''
+    if 'topology_lists' not in mesh.cache:
+        ef_indptr, ef_indices = mesh.edge_faces()
+        mesh.cache['topology_lists'] = ([tuple(co) for co in mesh.coords.tolist()],
+                                        mesh.face_indptr.tolist(),
+                                        mesh.face_edges.tolist(),
+                                        [tuple(ev) for ev in mesh.edge_verts.tolist()],
+                                        ef_indptr.tolist(),
+                                        ef_indices.tolist())
+    return mesh.cache['topology_lists']
+
+
+#small tuple vector helpers, the index walkers do not use mathutils
+def _sub(a, b): return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+def _dot(a, b): return a[0]*b[0] + a[1]*b[1] + a[2]*b[2]
+def _cross(a, b): return (a[1]*b[2] - a[2]*b[1], a[2]*b[0] - a[0]*b[2], a[0]*b[1] - a[1]*b[0])
+def _length(a): return _dot(a, a)**.5
+def _normalized(a):
+    l = _length(a)
+    if l == 0: return a
+    return (a[0]/l, a[1]/l, a[2]/l)
+
+
+class FacePlane(object):
+    '''
+    the PlaneCrossings lookups for a plane that is only used on a few faces,
+    eg the per face planes of the dynamic walker.  Nothing is precomputed
+
+    mesh - MeshArrays with edges
+    pt, no - 3 tuples
+    '''
+    def __init__(self, mesh, pt, no):
+        self.coords, self.edge_verts = topology_lists(mesh)[0], topology_lists(mesh)[3]
+        self.pt = tuple(pt)
+        self.no = tuple(no)
+
+    def dist(self, v_ind):
+        return _dot(self.no, _sub(self.coords[v_ind], self.pt))
+
+    def edge_point(self, e_ind):
+        v0, v1 = self.edge_verts[e_ind]
+        s0, s1 = self.dist(v0), self.dist(v1)
+        if s0 == s1: return None
+        t = s0/(s0 - s1)
+        co0, co1 = self.coords[v0], self.coords[v1]
+        return (co0[0] + t*(co1[0] - co0[0]), co0[1] + t*(co1[1] - co0[1]), co0[2] + t*(co1[2] - co0[2]))
+
+
+def _face_edges(mesh, f_ind):
+    lists = topology_lists(mesh)
+    return lists[2][lists[1][f_ind]:lists[1][f_ind + 1]]
+
+def _edge_faces(mesh, e_ind):
+    lists = topology_lists(mesh)
+    return lists[5][lists[4][e_ind]:lists[4][e_ind + 1]]
+
+def _list_shift(seq, n):
+    n = n % len(seq)
+    return seq[n:] + seq[:n]
+
+def face_crossings(mesh, f_ind, plane, epsilon):
+    '''
+    index version of cut_algorithms.find_bmedges_crossing_plane(..., sort = False)
+    plane - PlaneCrossings or FacePlane
+
+    returns [(edge index, location tuple)], crossings of concave ngons are ordered
+    across the face so that only pairs (0,1), (2,3)... make valid segments
+    '''
+    edge_verts = topology_lists(mesh)[3]
+    pt = tuple(plane.pt)
+
+    i_edges, intersects, ds = [], [], []
+    for e in _face_edges(mesh, f_ind):
+        v0, v1 = edge_verts[e]
+        s0, s1 = plane.dist(v0), plane.dist(v1)
+        if s0 > epsilon and s1 > epsilon: continue
+        if s0 < -epsilon and s1 < -epsilon: continue
+        i = plane.edge_point(e)
+        if i == None: continue
+        d = _length(_sub(i, pt))
+        if d == 0.0: d = epsilon
+        i_edges += [e]
+        intersects += [i]
+        ds += [d]
+
+    if len(i_edges) == 3 or len(i_edges) == 0:
+        return []
+
+    if len(i_edges) > 3:
+        min_i = intersects[ds.index(min(ds))]
+        min_ed = i_edges[ds.index(min(ds))]
+        max_i = intersects[ds.index(max(ds))]
+        direction = _normalized(_sub(max_i, min_i))
+        signed_ds = [_dot(_sub(i, min_i), direction) for i in intersects]
+
+        order = sorted(range(len(i_edges)), key = lambda j: (signed_ds[j], i_edges[j]))
+        i_edges = [i_edges[j] for j in order]
+        intersects = [intersects[j] for j in order]
+        n = i_edges.index(min_ed)
+        if n % 2:
+            i_edges = list(reversed(_list_shift(i_edges, n + 1)))
+            intersects = list(reversed(_list_shift(intersects, n + 1)))
+
+    return list(zip(i_edges, intersects))
+
+def sorted_face_crossings(mesh, f_ind, plane, epsilon, e_ind_from, co_from):
+    '''
+    index version of cut_algorithms.find_sorted_bmedges_crossing_plane
+    plane - PlaneCrossings or FacePlane
+
+    returns [(edge index, location tuple)], the 0th item is where the walk leaves the face
+    '''
+    edge_verts = topology_lists(mesh)[3]
+    edges = _face_edges(mesh, f_ind)
+
+    if len(edges) <= 4:
+        for e in edges:
+            if e == e_ind_from: continue
+            v0, v1 = edge_verts[e]
+            s0, s1 = plane.dist(v0), plane.dist(v1)
+            if not ((s0 > epsilon and s1 < -epsilon) or (s0 < -epsilon and s1 > epsilon)): continue
+            return [(e, plane.edge_point(e))]
+
+    i_edges, intersects, ds = [], [], []
+    for e in edges:
+        v0, v1 = edge_verts[e]
+        s0, s1 = plane.dist(v0), plane.dist(v1)
+        if s0 > epsilon and s1 > epsilon: continue
+        if s0 < -epsilon and s1 < -epsilon: continue
+        i = plane.edge_point(e)
+        if i == None: continue
+        i_edges += [e]
+        intersects += [i]
+        ds += [_length(_sub(i, co_from))]
+
+    if len(i_edges) == 2:
+        if e_ind_from not in i_edges: return []
+        j = 1 - i_edges.index(e_ind_from)
+        return [(i_edges[j], intersects[j])]
+
+    elif len(i_edges) > 2 and e_ind_from in i_edges:
+        min_i = intersects[i_edges.index(e_ind_from)]
+        max_i = intersects[ds.index(max(ds))]
+        direction = _normalized(_sub(max_i, min_i))
+        signed_ds = [_dot(_sub(i, min_i), direction) for i in intersects]
+
+        order = sorted(range(len(i_edges)), key = lambda j: (signed_ds[j], i_edges[j]))
+        i_edges = [i_edges[j] for j in order]
+        intersects = [intersects[j] for j in order]
+        n = i_edges.index(e_ind_from)
+        if n % 2 == 0:
+            i_edges = list(reversed(_list_shift(i_edges, n + 2)))
+            intersects = list(reversed(_list_shift(intersects, n + 2)))
+        else:
+            i_edges = _list_shift(i_edges, n - 1)
+            intersects = _list_shift(intersects, n - 1)
+        return list(zip(i_edges, intersects))
+
+    return []
+
+def _end_edges(mesh, f_ind_to, co_to, plane, epsilon):
+    '''
+    the 2 edges of f_ind_to whose plane crossings co_to lies between, or None
+    '''
+    end_edges = None
+    eds_is = face_crossings(mesh, f_ind_to, plane, epsilon)
+    for i in range(0, int(len(eds_is)/2)):
+        p0, p1 = eds_is[2*i][1], eds_is[2*i + 1][1]
+        seg = _sub(p1, p0)
+        l2 = _dot(seg, seg)
+        if l2 == 0: continue
+        pct = _dot(_sub(co_to, p0), seg)/l2
+        if pct >= 0 and pct <= 1:
+            end_edges = {eds_is[2*i][0]: 0, eds_is[2*i + 1][0]: 1}
+    return end_edges
+
+def _walk(mesh, plane_for_face, f_ind_from, e_ind_from, co_from, f_ind_to, end_edges, epsilon, limit_set, max_iters, stop_at_end_face):
+    '''
+    the stepping loop shared by the index walkers, see cross_section_walker_arrays
+    plane_for_face(f_ind, verts, eds_crossed, co_from) returns the plane used to leave f_ind
+    '''
+    verts = [co_from]
+    eds_crossed = [e_ind_from]
+    faces_crossed = []
+    looped = False
+    found = False
+    error = None
+
+    f_inds_dict = {f_ind_from: 0}
+    e_inds_dict = {e_ind_from: 0}
+
+    link = _edge_faces(mesh, e_ind_from)
+    if len(link) != 2:
+        return verts, eds_crossed, faces_crossed, False, False, 'NON_MANIFOLD'
+    f_cur = link[0] if link[0] != f_ind_from else link[1]
+    faces_crossed += [f_cur]
+
+    iters = 0
+    while iters < max_iters:
+        iters += 1
+        plane = plane_for_face(f_cur, verts, eds_crossed, co_from)
+        cross_eds = sorted_face_crossings(mesh, f_cur, plane, epsilon, e_ind_from, co_from)
+        if not len(cross_eds):
+            return verts, eds_crossed, faces_crossed, False, False, 'STOP_MID'
+
+        edge, i = cross_eds[0]
+        verts += [i]
+        eds_crossed += [edge]
+
+        link = _edge_faces(mesh, edge)
+        if len(link) == 1:
+            error = 'NON_MANIFOLD'
+            break
+
+        if edge in end_edges:
+            found = True
+            break
+
+        f_next = link[0] if link[0] != f_cur else link[1]
+        if stop_at_end_face and f_next == f_ind_to:
+            found = True
+            break
+
+        faces_crossed += [f_next]
+
+        if f_next in f_inds_dict:
+            n_edges = len(_face_edges(mesh, f_next))
+            if n_edges <= 4:
+                looped = True
+                if f_inds_dict[f_next] != 0:
+                    #P shaped loop, clip off the tail
+                    k = f_inds_dict[f_next]
+                    verts = verts[k:]
+                    faces_crossed = faces_crossed[k:]
+                    eds_crossed = eds_crossed[k:]
+                    error = 'P_LOOP'
+                    break
+
+            elif f_inds_dict[f_next] == 0:
+                next_crosses = sorted_face_crossings(mesh, f_next, plane, epsilon, edge, i)
+                if all(e in e_inds_dict for e, co in next_crosses[1:]):
+                    looped = True
+                    error = 'NGON_SPECIAL'
+                    break
+
+            elif edge in e_inds_dict:
+                looped = True
+                verts.pop()
+                error = 'NGON_SPECIAL'
+                break
+
+        elif limit_set and f_next not in limit_set:
+            error = 'LIMIT_SET'
+            break
+
+        else:
+            f_inds_dict[f_next] = len(f_inds_dict)
+
+        e_inds_dict[edge] = len(e_inds_dict)
+
+        e_ind_from = edge
+        co_from = i
+        f_cur = f_next
+
+    else:
+        error = 'MAX_ITERS'
+
+    return verts, eds_crossed, faces_crossed, looped, found, error
+
+def cross_section_walker_arrays(mesh, pt, no, f_ind_from, e_ind_from, co_from, f_ind_to, co_to, epsilon,
+                                limit_set = None, max_iters = 10000, crossings = None):
+    '''
+    index space version of cut_algorithms.cross_section_walker_endpoints, needs no BMesh
+
+    mesh - MeshArrays with edges
+    pt, no - the cut plane, 3 sequences
+    f_ind_from - index of face we are walking from
+    e_ind_from - index of the edge of f_ind_from we step over first
+    co_from - where the plane crosses e_ind_from
+    f_ind_to - index of the face we are walking toward
+    co_to - end point in f_ind_to
+    limit_set - None or set of face indices the walk may not leave
+    max_iters - at most this many faces are crossed
+    crossings - PlaneCrossings of pt, no covering limit_set, made here when None
+
+    returns verts, eds_crossed, faces_crossed, looped, found, error
+        verts - list of location tuples, co_from first
+        eds_crossed, faces_crossed - lists of edge and face indices
+        error - None or the same strings as cross_section_walker_endpoints, 'MAX_ITERS'
+    '''
+    co_from, co_to = tuple(co_from), tuple(co_to)
+    no = tuple(no)
+
+    #signed, like mathutils.geometry.distance_point_to_plane
+    d0 = _dot(no, _sub(co_from, tuple(pt)))/max(_length(no), 1e-30)
+    df = _dot(no, _sub(co_to, tuple(pt)))/max(_length(no), 1e-30)
+    if d0 > epsilon or df > epsilon:
+        return [co_from, co_to], [], [], False, False, 'EPSILON'
+
+    if crossings == None:
+        crossings = PlaneCrossings(mesh, pt, no, faces = None if not limit_set else list(limit_set))
+
+    end_edges = _end_edges(mesh, f_ind_to, co_to, crossings, epsilon)
+    if end_edges == None:
+        return [co_from, co_to], [], [], False, False, 'END_POINT'
+
+    plane_for_face = lambda f_ind, verts, eds_crossed, co: crossings
+    return _walk(mesh, plane_for_face, f_ind_from, e_ind_from, co_from, f_ind_to, end_edges,
+                 epsilon, limit_set, max_iters, False)
+
+def cross_section_walker_dynamic_arrays(mesh, f_ind_from, e_ind_from, co_from, f_ind_to, co_to, epsilon,
+                                        limit_set = None, max_iters = 10000):
+    '''
+    index space version of cut_algorithms.cross_section_walker_dynamic_endpoints.
+    The plane is re-aimed at co_to in every face, using the face normals of the snapshot
+
+    arguments and return values as cross_section_walker_arrays
+    '''
+    co_from, co_to = tuple(co_from), tuple(co_to)
+    normals = face_normals(mesh)
+    coords, edge_verts = topology_lists(mesh)[0], topology_lists(mesh)[3]
+
+    link = _edge_faces(mesh, e_ind_from)
+    if len(link) != 2:
+        return [co_from, co_to], [], [], False, False, 'NON_MANIFOLD'
+
+    vec = _normalized(_sub(co_to, co_from))
+    end_plane = FacePlane(mesh, co_to, _cross(tuple(normals[f_ind_to].tolist()), vec))
+    end_edges = _end_edges(mesh, f_ind_to, co_to, end_plane, epsilon)
+    if end_edges == None:
+        return [co_from, co_to], [], [], False, False, 'BAD TARGET'
+
+    def plane_for_face(f_ind, verts, eds_crossed, co):
+        vec = _normalized(_sub(co_to, verts[-1]))
+        face_no = tuple(normals[f_ind].tolist())
+        if _dot(face_no, vec) > .999:
+            #face normal parallel to the direction of travel, use the last edge to define the plane
+            v0, v1 = edge_verts[eds_crossed[-1]]
+            z = _cross(_normalized(_sub(coords[v0], coords[v1])), vec)
+            no = _cross(vec, z)
+        else:
+            no = _cross(face_no, vec)
+        return FacePlane(mesh, verts[-1], no)
+
+    return _walk(mesh, plane_for_face, f_ind_from, e_ind_from, co_from, f_ind_to, end_edges,
+                 epsilon, limit_set, max_iters, True)
+
+
+def corridor_faces(mesh, f_a, f_b, loc_a, loc_b, no, band = None, pad = 1, max_faces = None):
+    '''
+    faces to limit a cut walk between f_a and f_b to, found by a bidirectional
+    best first search.  Replaces intersecting two grow_selection_to_find_face floods,
+    which visit every face within the topological A-B distance of both ends.
+
+    mesh - MeshArrays with edges
+    f_a, f_b - face indices of the end points
+    loc_a, loc_b - the end points, 3 sequences
+    no - normal of the A-B cut plane, the plane goes through loc_a
+    band - faces whose centers are farther than this from the cut plane are not
+           entered.  Defaults to half the A-B distance
+    pad - rings of neighbors added around the faces the searches reached
+    max_faces - give up after settling this many faces, defaults to all of them
+
+    Each side pops the face closest to the plane plus closest to the other end,
+    so the two fronts run toward each other along the cut.
+
+    returns set of face indices, or None if the fronts did not meet inside the band
+    '''
+    if f_a == f_b: return set([f_a])
+
+    if 'face_centers_list' not in mesh.cache:
+        mesh.cache['face_centers_list'] = [tuple(co) for co in mesh.face_centers().tolist()]
+    centers = mesh.cache['face_centers_list']
+    nb_indptr, nb_indices = mesh.face_neighbors()
+    loc_a, loc_b = tuple(loc_a), tuple(loc_b)
+    no = _normalized(tuple(no))
+
+    if band == None:
+        band = .5 * _length(_sub(loc_b, loc_a))
+    if max_faces == None:
+        max_faces = mesh.num_faces
+
+    #cost of a face for each side, the plane offset plus the distance to the other end
+    plane_d = lambda f: abs(_dot(_sub(centers[f], loc_a), no))
+    cost = (lambda f: plane_d(f) + _length(_sub(centers[f], loc_b)),
+            lambda f: plane_d(f) + _length(_sub(centers[f], loc_a)))
+
+    #the face each side reached a face from, one dict per side
+    parents = ({f_a: -1}, {f_b: -1})
+    heaps = ([(0.0, f_a)], [(0.0, f_b)])
+    settled = (set(), set())
+    meet = None
+    n_settled = 0
+
+    while meet == None and (heaps[0] or heaps[1]) and n_settled < max_faces:
+        for side in (0, 1):
+            if not heaps[side]: continue
+            c, f = heapq.heappop(heaps[side])
+            if f in settled[side]: continue
+            settled[side].add(f)
+            n_settled += 1
+            if f in parents[1 - side]:
+                meet = f
+                break
+
+            for nb in nb_indices[nb_indptr[f]:nb_indptr[f + 1]].tolist():
+                if nb in parents[side]: continue
+                if nb != f_a and nb != f_b and plane_d(nb) > band: continue
+                parents[side][nb] = f
+                heapq.heappush(heaps[side], (cost[side](nb), nb))
+
+    if meet == None:
+        return None
+
+    corridor = set(parents[0]) | set(parents[1])
+    for i in range(pad):
+        ring = np.fromiter(corridor, dtype = np.int64)
+        corridor |= set(csr_gather(nb_indptr, nb_indices, ring)[0].tolist())
+
+    return corridor
+
+
+def _pick_walk(walk0, walk1, keep_p_loop):
+    '''
+    chooses between the walks in the two directions from the seed face, like
+    the end of path_between_2_points_clean and cross_section_2seeds_ver1
+
+    walk0, walk1 - (verts, eds_crossed, faces_crossed, looped, found, error)
+    keep_p_loop - return a P_LOOP walk (cross_section_2seeds_ver1) instead of nothing
+    returns verts, edges, eds_crossed, faces_crossed, error
+    '''
+    def result(walk, error):
+        nv = len(walk[0])
+        return walk[0], [(i, i+1) for i in range(nv - 1)], walk[1], walk[2], error
+
+    verts0, verts1 = walk0[0], walk1[0]
+    found0, found1 = walk0[4], walk1[4]
+    error0, error1 = walk0[5], walk1[5]
+
+    if found0 and found1:
+        return result(walk0 if len(verts0) < len(verts1) else walk1, 'BOTH_DIR')
+    elif found0:
+        return result(walk0, None)
+    elif found1:
+        return result(walk1, None)
+
+    if len(verts0) and error0 == 'P_LOOP':
+        return result(walk0, 'P_LOOP') if keep_p_loop else ([], [], [], [], 'P_LOOP')
+    elif len(verts1) and error1 == 'P_LOOP':
+        return result(walk1, 'P_LOOP') if keep_p_loop else ([], [], [], [], 'P_LOOP')
+    elif len(verts0) and len(verts1) and error0 == 'LIMIT_SET' and error1 == 'LIMIT_SET':
+        return result(walk0 if len(verts0) >= len(verts1) else walk1, 'LIMIT_SET')
+
+    if error0 == 'EPSILON' or error1 == 'EPSILON':
+        return [], [], [], [], 'EPSILON'
+    return [], [], [], [], 'TOTAL'
+
+def path_between_2_points_arrays(mesh, loc_a, ind_a, loc_b, ind_b, use_limit = True, epsilon = 0.00001, max_iters = 10000):
+    '''
+    index space version of cut_algorithms.path_between_2_points_clean
+
+    mesh - MeshArrays with edges
+    loc_a, loc_b - end points, 3 sequences
+    ind_a, ind_b - indices of the faces they are on
+    use_limit - keep the walks inside corridor_faces
+
+    returns verts, edges, eds_crossed, faces_crossed, error
+        verts - location tuples, eds_crossed and faces_crossed are indices
+    '''
+    loc_a, loc_b = tuple(loc_a), tuple(loc_b)
+    no_a = tuple(face_normals(mesh)[ind_a].tolist())
+    cut_no_a = _cross(no_a, _sub(loc_b, loc_a))
+
+    faces_set = None
+    if use_limit:
+        faces_set = corridor_faces(mesh, ind_a, ind_b, loc_a, loc_b, cut_no_a)
+        if faces_set == None:
+            faces_set = corridor_faces(mesh, ind_a, ind_b, loc_a, loc_b, cut_no_a, band = 4 * _length(_sub(loc_b, loc_a)))
+
+    ei_init = face_crossings(mesh, ind_a, FacePlane(mesh, loc_a, cut_no_a), epsilon)
+    if len(ei_init) < 2:
+        return [], [], [], [], 'NO_INTITIAL_CROSSES'
+
+    walks = [cross_section_walker_dynamic_arrays(mesh, ind_a, e, co, ind_b, loc_b, epsilon,
+                                                 limit_set = faces_set, max_iters = max_iters)
+             for e, co in ei_init[0:2]]
+    return _pick_walk(walks[0], walks[1], False)
+
+def cross_section_2seeds_arrays(mesh, pt, no, ind_0, co_0, ind_1, co_1, epsilon = .0000001, topo_limit = True, max_iters = 10000):
+    '''
+    index space version of cut_algorithms.cross_section_2seeds_ver1, the
+    plane is moved to cross the seed faces the same way
+
+    topo_limit - keep the walks inside corridor_faces between the seeds
+    returns verts, edges, eds_crossed, faces_crossed, error
+    '''
+    coords = topology_lists(mesh)[0]
+    pt, no = tuple(pt), tuple(no)
+
+    for ind in (ind_0, ind_1):
+        ds = [_dot(no, _sub(coords[v], pt)) for v in mesh.face_vert_indices(ind).tolist()]
+        if all(d > epsilon for d in ds) or all(d < -epsilon for d in ds):
+            shift = (min(ds) + epsilon) if ds[0] > epsilon else (max(ds) - epsilon)
+            pt = (pt[0] + no[0]*shift, pt[1] + no[1]*shift, pt[2] + no[2]*shift)
+
+    faces_set = None
+    if topo_limit:
+        faces_set = corridor_faces(mesh, ind_0, ind_1, co_0, co_1, no)
+
+    crossings = PlaneCrossings(mesh, pt, no, faces = None if not faces_set else list(faces_set))
+    ei_init = face_crossings(mesh, ind_0, crossings, epsilon)
+    if len(ei_init) < 2:
+        return [], [], [], [], 'NO_INTITIAL_CROSSES'
+
+    walks = [cross_section_walker_arrays(mesh, pt, no, ind_0, e, co, ind_1, co_1, epsilon,
+                                         limit_set = faces_set, max_iters = max_iters, crossings = crossings)
+             for e, co in ei_init[0:2]]
+    return _pick_walk(walks[0], walks[1], True)
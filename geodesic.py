@@ -10,12 +10,22 @@ http://saturno.ge.imati.cnr.it/ima/personal-old/attene/PersonalPage/pdf/steepest
 #python imports
 import time
 import math
+from heapq import heappush, heappop, heapify
+from itertools import count
+from collections import OrderedDict
+
+import numpy as np
 
 #blender imports
 import bmesh
 from mathutils import Vector, Quaternion, Matrix
 from mathutils.geometry import intersect_point_line, intersect_line_line
 
+#Cut Mesh imports
+from .mesh_arrays import mesh_arrays_for_bmesh, csr_gather
+from .geodesic_heat import HAS_SCIPY, heat_solver_for_mesh
+from .geodesic_arrays import calc_T_batch
+
 def test_obtuse(f):
     '''
     tests if any verts have obtuse angles in a bmesh face
@@ -263,7 +273,203 @@ def unwrap_tri_obtuse(vcenter, vobtuse, face):
     return v_cos[i], verts[i], v_cos
     
 
-def geodesic_walk(bme, seed, seed_location, targets = [], subset = None, max_iters = 10000, min_dist = None):
+def calc_T_scalar(v1, v2, v3, Tv1, Tv2):
+    '''
+    distance value at v3 from the distance values at v1 and v2
+    v1, v2, v3 - mathutils.Vector
+    Tv1, Tv2 - distance values at v1 and v2
+    
+    this is the reference implementation, geodesic_arrays.calc_T_batch does the same for arrays
+    '''
+    
+    #calucluate 2 origins which are the 2 intersections of 2 circles
+    #ceneterd on v1 and v2 with radii Tv1, Tv2 respectively
+    #http://mathworld.wolfram.com/Circle-CircleIntersection.html
+    
+    #transform points into the reference frame of v1 with v2 on x axis
+    #http://math.stackexchange.com/questions/856666/how-can-i-transform-a-3d-triangle-to-xy-plane
+    u = v2 - v1  #x - axis
+    v2x = u.length
+    
+    U = u.normalized()
+    
+    c = v3 - v1
+    w = u.cross(c)  #z axis
+    
+    W = w.normalized()
+    V = U.cross(W)  #y axis   x,y,z = u,v,w
+    
+    #rotation matrix from principal axes
+    T = Matrix.Identity(3)  #make the columns of matrix U, V, W
+    T[0][0], T[0][1], T[0][2]  = U[0] ,V[0],  W[0]
+    T[1][0], T[1][1], T[1][2]  = U[1], V[1],  W[1]
+    T[2][0] ,T[2][1], T[2][2]  = U[2], V[2],  W[2]
+
+    v3p = T.transposed() * c        
+    #print('converted vector to coordinates on Vo so Z should be 0')
+    #print(v3p)
+    #solution to the intersection of the 2 circles
+    A = 2 * Tv1**2 * v2x**2 - v2x**4 + 2 * Tv2**2 * v2x**2
+    B = (Tv1**2 - Tv2**2)**2
+    
+    x = 1/2 * (v2x**2 + Tv1**2 - Tv2**2)/(v2x)
+    y = 1/2 * ((A-B)**.5)/v2x
+
+    if isinstance(y, complex):
+        #print('y is complex, setting to 0')
+        y = 0
+    T3a = v3p - Vector((x,y,0))
+    T3b = v3p - Vector((x,-y,0))
+    T3 = max(T3a.length, T3b.length)
+    
+    return T3
+
+
+def obtuse_unfold_table(mesh, max_unfolds = 10):
+    '''
+    one time replacement for unwrap_tri_obtuse during the march
+    
+    for every triangle with an obtuse corner, and each of its other two corners
+    as the center, unfolds the triangle fan around the center into the plane of
+    the triangle until the unfolded vert makes an acute angle at the obtuse corner.
+    That vert is the support of the virtual edge used to update the obtuse corner
+    
+    mesh - mesh_arrays.MeshArrays
+    max_unfolds - max number of triangles to unfold around the center
+    
+    return - obtuse_vert, support, support_co
+        obtuse_vert - (n_tris,) int32, vert index of the obtuse corner or -1
+        support - (n_tris, 3) int32, support vert index for the center at each corner or -1
+        support_co - (n_tris, 3, 3) float64, unfolded location of the support vert
+    
+    cached on the mesh snapshot, so it is only rebuilt when the topology changes
+    '''
+    if 'obtuse_unfold' in mesh.cache:
+        return mesh.cache['obtuse_unfold']
+    
+    start = time.time()
+    co, tris = mesh.coords, mesh.tris
+    n_tris = len(tris)
+    
+    obtuse_vert = np.full(n_tris, -1, dtype = np.int32)
+    support = np.full((n_tris, 3), -1, dtype = np.int32)
+    support_co = np.zeros((n_tris, 3, 3))
+    
+    #squared length of the side opposite each corner
+    P = co[tris]
+    opp = np.stack([np.sum((P[:, (i + 2) % 3] - P[:, (i + 1) % 3])**2, axis = 1) for i in range(3)], axis = 1)
+    obtuse = opp > (opp.sum(axis = 1)[:, None] - opp)
+    obtuse_tris, obtuse_corners = np.nonzero(obtuse)
+    obtuse_vert[obtuse_tris] = tris[obtuse_tris, obtuse_corners]
+    
+    neighbors = mesh.tri_neighbors()
+    
+    def across(t, a, b):
+        '''the triangle on the other side of edge a, b of triangle t'''
+        tri = tris[t].tolist()
+        for i in range(3):
+            if set((tri[i], tri[(i + 1) % 3])) == set((a, b)):
+                return neighbors[t, i]
+        return -1
+    
+    for t, opos in zip(obtuse_tris.tolist(), obtuse_corners.tolist()):
+        o = tris[t, opos]
+        O = co[o]
+        for cpos in ((opos + 1) % 3, (opos + 2) % 3):
+            c = tris[t, cpos]
+            p = tris[t, 3 - opos - cpos]
+            C = co[c]
+            
+            #frame in the plane of the triangle, e1 along the unfold edge, e2 away from the obtuse corner
+            e1 = co[p] - C
+            oc = O - C
+            perp = oc - np.dot(oc, e1)/np.dot(e1, e1) * e1
+            if not np.any(e1) or not np.any(perp): continue
+            e1 = e1/np.linalg.norm(e1)
+            e2 = -perp/np.linalg.norm(perp)
+            
+            theta = 0
+            prev_t, prev_v = t, p
+            for i in range(max_unfolds):
+                nt = across(prev_t, c, prev_v)
+                if nt < 0 or nt == t: break
+                w = [vi for vi in tris[nt].tolist() if vi != c and vi != prev_v]
+                if len(w) != 1: break
+                w = w[0]
+                
+                a1, a2 = co[prev_v] - C, co[w] - C
+                r = np.linalg.norm(a2)
+                denom = np.linalg.norm(a1) * r
+                if denom == 0: break
+                theta += math.acos(min(max(np.dot(a1, a2)/denom, -1), 1))
+                if theta >= math.pi: break  #unfolded past the far side of the obtuse corner
+                
+                W = C + r * (math.cos(theta) * e1 + math.sin(theta) * e2)
+                if np.dot(C - O, W - O) > 0:
+                    support[t, cpos] = w
+                    support_co[t, cpos] = W
+                    break
+                
+                prev_t, prev_v = nt, w
+    
+    table = (obtuse_vert, support, support_co)
+    mesh.cache['obtuse_unfold'] = table
+    print('unfolded %i obtuse triangles in %f seconds' % (len(obtuse_tris), time.time() - start))
+    return table
+
+def cached_obtuse_table(bme):
+    '''
+    the obtuse unfold table built by prepare_bmesh_for_geodesic, or None if
+    it was not built or the topology has changed since.  Only valid when every
+    face is a triangle, so face index == triangle index
+    '''
+    mesh = mesh_arrays_for_bmesh(bme, build = False)
+    if mesh == None or mesh.num_tris != mesh.num_faces:
+        return None
+    return mesh.cache.get('obtuse_unfold')
+
+def obtuse_support(table, bme, f, vcenter, vobtuse):
+    '''
+    looks up the virtual edge support for updating vobtuse from vcenter across f
+    returns BMVert, Vector(unfolded location) or None, None
+    '''
+    obtuse_vert, support, support_co = table
+    if obtuse_vert[f.index] != vobtuse.index:
+        return None, None
+    
+    corner = [v.index for v in f.verts].index(vcenter.index)
+    s = support[f.index, corner]
+    if s < 0:
+        return None, None
+    
+    bme.verts.ensure_lookup_table()
+    return bme.verts[s], Vector(support_co[f.index, corner])
+
+
+def close_heap(close, geos, tiebreak):
+    '''
+    builds a binary heap of (T, tiebreak, BMVert) over the close set
+    tiebreak - itertools.count, keeps BMVerts from ever being compared
+    '''
+    heap = [(geos[v], next(tiebreak), v) for v in close]
+    heapify(heap)
+    return heap
+
+def pop_trial(heap, close, geos):
+    '''
+    pops the vertex in close with the smallest T value
+    entries are never removed from the heap when a T value is lowered or
+    a vertex is fixed, stale entries are just skipped here (lazy deletion)
+    
+    returns BMVert or None if the heap is exhausted
+    '''
+    while heap:
+        T, _, v = heappop(heap)
+        if v in close and T == geos[v]:
+            return v
+    return None
+
+def geodesic_walk(bme, seed, seed_location, targets = [], subset = None, max_iters = 10000, min_dist = None, front = 'HEAP'):
     '''
     bme - BMesh
     seed - a vertex or a face
@@ -272,6 +478,8 @@ def geodesic_walk(bme, seed, seed_location, targets = [], subset = None, max_ite
     subset - set(BMVerts) or None.  limit the marching/growth to just a subset of verts
     max_iters - limits number of marching steps
     min_distance - float.  Algo will stop when all the nearby verts in the expanding front are > min distance away (good for brush limits)
+    front - 'HEAP' or 'LINEAR'.  How the trial vertex is picked from close. 'LINEAR' scans
+            the whole close set every step and is only kept for benchmarking
     '''
     
     geos= dict()
@@ -280,6 +488,8 @@ def geodesic_walk(bme, seed, seed_location, targets = [], subset = None, max_ite
     close_edges = set() #used to flip over to get new near verts
     close = set()
     
+    obtuse_table = cached_obtuse_table(bme)
+    
     if subset == None:
         print('using all the verts')
         far = set(bme.verts) #can we do this?
@@ -293,64 +503,13 @@ def geodesic_walk(bme, seed, seed_location, targets = [], subset = None, max_ite
     def calc_T(v3, v2, v1, f, ignore_obtuse = False):
         
         
-        if not ignore_obtuse:
+        if not ignore_obtuse and obtuse_table != None:
+            #angle at v3 is obtuse, use the unfolded virtual edge from prepare_bmesh_for_geodesic
+            sv, sco = obtuse_support(obtuse_table, bme, f, v1, v3)
+            if sv != None and sv in fixed_verts:
+                return calc_T_scalar(v1.co, sco, v3.co, geos[v1], geos[sv])
             
-            if v2 not in geos:
-                if not test_accute(v3.co, v1.co, v2.co):
-                    print('new vert is obtuse and we made a virtual edge')
-                    vco, v2, vcos  = unwrap_tri_obtuse(v1, v3, f)
-                else:
-                    print("V2 not in geos and triangle is not obtuse")
-            
-        Tv1 = geos[v1]  #potentially use custom bmesh layer instead of a dictionary
-        Tv2 = geos[v2]
-        
-        #calucluate 2 origins which are the 2 intersections of 2 circles
-        #ceneterd on v1 and v2 with radii Tv1, Tv2 respectively
-        #http://mathworld.wolfram.com/Circle-CircleIntersection.html
-        
-        #transform points into the reference frame of v1 with v2 on x axis
-        #http://math.stackexchange.com/questions/856666/how-can-i-transform-a-3d-triangle-to-xy-plane
-        u = v2.co - v1.co  #x - axis
-        v2x = u.length
-        
-        U = u.normalized()
-        
-        c = v3.co - v1.co
-        w = u.cross(c)  #z axis
-        
-        W = w.normalized()
-        V = U.cross(W)  #y axis   x,y,z = u,v,w
-        
-        #rotation matrix from principal axes
-        T = Matrix.Identity(3)  #make the columns of matrix U, V, W
-        T[0][0], T[0][1], T[0][2]  = U[0] ,V[0],  W[0]
-        T[1][0], T[1][1], T[1][2]  = U[1], V[1],  W[1]
-        T[2][0] ,T[2][1], T[2][2]  = U[2], V[2],  W[2]
-
-        v3p = T.transposed() * c        
-        #print('converted vector to coordinates on Vo so Z should be 0')
-        #print(v3p)
-        #solution to the intersection of the 2 circles
-        A = 2 * Tv1**2 * v2x**2 - v2x**4 + 2 * Tv2**2 * v2x**2
-        B = (Tv1**2 - Tv2**2)**2
-        
-        x = 1/2 * (v2x**2 + Tv1**2 - Tv2**2)/(v2x)
-        y = 1/2 * ((A-B)**.5)/v2x
-
-        if isinstance(x, complex):
-            print('x is complex')
-            print(x)
-        elif isinstance(y, complex):
-            print('y is complex, setting to 0')
-            print(A-B)
-            print(y)
-            y = 0
-        T3a = v3p - Vector((x,y,0))
-        T3b = v3p - Vector((x,-y,0))
-        T3 = max(T3a.length, T3b.length)
-        
-        return T3
+        return calc_T_scalar(v1.co, v2.co, v3.co, geos[v1], geos[v2])  #potentially use custom bmesh layer instead of a dictionary
         
             
     def next_vert(ed,face):
@@ -430,16 +589,17 @@ def geodesic_walk(bme, seed, seed_location, targets = [], subset = None, max_ite
         if isinstance(ele, bmesh.types.BMFace):
             stop_targets.update(ele.verts)
         elif isinstance(ele, bmesh.types.BMVert):
-            stop_targets.update(ele)
-        
+            stop_targets.add(ele)
         
+    tiebreak = count()
+    heap = close_heap(close, geos, tiebreak)
+    
     def begin_loop():
         
-        for v in close:
-            if v not in geos:
-                print("%i not in geos but is in close" % v.index)
-                
-        trial_v = min(close, key = geos.get)  #Let Trial be the vertex in close with the smallest T value
+        if front == 'LINEAR':
+            trial_v = min(close, key = geos.get)  #Let Trial be the vertex in close with the smallest T value
+        else:
+            trial_v = pop_trial(heap, close, geos)
         
         if max_iters != None and max_iters < 100:
             print('Trial V is %i with T: %f' % (trial_v.index, geos[trial_v]))
@@ -468,24 +628,35 @@ def geodesic_walk(bme, seed, seed_location, targets = [], subset = None, max_ite
                 T = calc_T(cv, trial_v, fv, f)
                 if cv in geos:
                     #print('close vert already calced before')
-                    if T != geos[cv]:
+                    if T < geos[cv]:
                         #print('and the distance value is changing! %f, %f' % (geos[cv],T))
-                        geos[cv] = min(geos[cv],T)  #maybe min?
+                        geos[cv] = T
+                        heappush(heap, (T, next(tiebreak), cv))
                 else:
                     geos[cv] = T
+                    heappush(heap, (T, next(tiebreak), cv))
+        
+        return trial_v
+    
+    #the march is monotonic, so the farthest fixed vert only needs
+    #to be compared against each new trial vert, not searched for
+    if min_dist and len(fixed_verts):
+        max_fixed = max(fixed_verts, key=geos.get)
                     
     iters = 0                
     while len(far) and len(close) and ((max_iters and iters < max_iters) or max_iters == None) and (len(stop_targets) or targets == []):
         
         if min_dist:
-            max_fixed = max(fixed_verts, key=geos.get)
             T = geos[max_fixed]
             if T > min_dist:
                 fixed_verts.remove(max_fixed)
                 close.add(max_fixed)
+                heappush(heap, (T, next(tiebreak), max_fixed))
                 break
                 
-        begin_loop()
+        trial_v = begin_loop()
+        if min_dist and geos[trial_v] > geos[max_fixed]:
+            max_fixed = trial_v
         iters += 1
         
     return geos, fixed_verts, close, far   
@@ -493,72 +664,21 @@ def geodesic_walk(bme, seed, seed_location, targets = [], subset = None, max_ite
 
 def continue_geodesic_walk(bme, seed, seed_location,  
                            geos, fixed_verts, close, far,
-                           targets =[], subset = None, max_iters = 500, min_dist = None):
+                           targets =[], subset = None, max_iters = 500, min_dist = None, front = 'HEAP'):
 
     print('continuuing geodesic where we left off')
+    obtuse_table = cached_obtuse_table(bme)
     
     def calc_T(v3, v2, v1, f, ignore_obtuse = False):
         
         
-        if not ignore_obtuse:
-            
-            if v2 not in geos:
-                if not test_accute(v3.co, v1.co, v2.co):
-                    print('new vert is obtuse and we made a virtual edge')
-                    vco, v2, vcos  = unwrap_tri_obtuse(v1, v3, f)
-                else:
-                    print("V2 not in geos and triangle is not obtuse")
+        if not ignore_obtuse and obtuse_table != None:
+            #angle at v3 is obtuse, use the unfolded virtual edge from prepare_bmesh_for_geodesic
+            sv, sco = obtuse_support(obtuse_table, bme, f, v1, v3)
+            if sv != None and sv in fixed_verts:
+                return calc_T_scalar(v1.co, sco, v3.co, geos[v1], geos[sv])
             
-        Tv1 = geos[v1]  #potentially use custom bmesh layer instead of a dictionary
-        Tv2 = geos[v2]
-        
-        #calucluate 2 origins which are the 2 intersections of 2 circles
-        #ceneterd on v1 and v2 with radii Tv1, Tv2 respectively
-        #http://mathworld.wolfram.com/Circle-CircleIntersection.html
-        
-        #transform points into the reference frame of v1 with v2 on x axis
-        #http://math.stackexchange.com/questions/856666/how-can-i-transform-a-3d-triangle-to-xy-plane
-        u = v2.co - v1.co  #x - axis
-        v2x = u.length
-        
-        U = u.normalized()
-        
-        c = v3.co - v1.co
-        w = u.cross(c)  #z axis
-        
-        W = w.normalized()
-        V = U.cross(W)  #y axis   x,y,z = u,v,w
-        
-        #rotation matrix from principal axes
-        T = Matrix.Identity(3)  #make the columns of matrix U, V, W
-        T[0][0], T[0][1], T[0][2]  = U[0] ,V[0],  W[0]
-        T[1][0], T[1][1], T[1][2]  = U[1], V[1],  W[1]
-        T[2][0] ,T[2][1], T[2][2]  = U[2], V[2],  W[2]
-
-        v3p = T.transposed() * c        
-        #print('converted vector to coordinates on Vo so Z should be 0')
-        #print(v3p)
-        #solution to the intersection of the 2 circles
-        A = 2 * Tv1**2 * v2x**2 - v2x**4 + 2 * Tv2**2 * v2x**2
-        B = (Tv1**2 - Tv2**2)**2
-        
-        x = 1/2 * (v2x**2 + Tv1**2 - Tv2**2)/(v2x)
-        y = 1/2 * ((A-B)**.5)/v2x
-
-        if isinstance(x, complex):
-            #print('x is complex')
-            #print(x)
-            x = 0
-        elif isinstance(y, complex):
-            #print('y is complex, setting to 0')
-            #print(A-B)
-            #print(y)
-            y = 0
-        T3a = v3p - Vector((x,y,0))
-        T3b = v3p - Vector((x,-y,0))
-        T3 = max(T3a.length, T3b.length)
-        
-        return T3
+        return calc_T_scalar(v1.co, v2.co, v3.co, geos[v1], geos[v2])  #potentially use custom bmesh layer instead of a dictionary
     
     stop_targets = set()
     for ele in targets:
@@ -572,14 +692,19 @@ def continue_geodesic_walk(bme, seed, seed_location,
             if ele not in fixed_verts:
                 stop_targets.add(ele)
         
-    print('there are %i stop targets' % len(stop_targets))    
+    print('there are %i stop targets' % len(stop_targets))
+    
+    #the heap is not part of the (geos, fixed, close, far) contract
+    #so rebuild it from whatever is left in close
+    tiebreak = count()
+    heap = close_heap(close, geos, tiebreak)
+    
     def begin_loop():
         
-        for v in close:
-            if v not in geos:
-                print("%i not in geos but is in close" % v.index)
-                
-        trial_v = min(close, key = geos.get)  #Let Trial be the vertex in close with the smallest T value    
+        if front == 'LINEAR':
+            trial_v = min(close, key = geos.get)  #Let Trial be the vertex in close with the smallest T value
+        else:
+            trial_v = pop_trial(heap, close, geos)
         fixed_verts.add(trial_v) #add thsi vertex to Fixed
         close.remove(trial_v)  #remove it from close
         
@@ -605,11 +730,13 @@ def continue_geodesic_walk(bme, seed, seed_location,
                 T = calc_T(cv, trial_v, fv, f)
                 if cv in geos:
                     #print('close vert already calced before')
-                    if T != geos[cv]:
+                    if T < geos[cv]:
                         #print('and the distance value is changing! %f, %f' % (geos[cv],T))
-                        geos[cv] = min(geos[cv],T)  #maybe min?
+                        geos[cv] = T
+                        heappush(heap, (T, next(tiebreak), cv))
                 else:
                     geos[cv] = T
+                    heappush(heap, (T, next(tiebreak), cv))
                     
     iters = 0                
     while len(far) and len(close) and ((max_iters and iters < max_iters) or max_iters == None) and (len(stop_targets) != 0 or targets == []):
@@ -621,7 +748,420 @@ def continue_geodesic_walk(bme, seed, seed_location,
     if len(far) and len(stop_targets) == 0 and len(targets) != 0:
         print('stopped when we found the new target')
     
-    print('continuued walking in %i additional iters' % iters)      
+    print('continuued walking in %i additional iters' % iters)
+    return
+
+
+#vertex states for the array backed march
+FAR, CLOSE, FIXED = 0, 1, 2
+
+class GeodesicVertSet(object):
+    '''
+    set like view of the verts of a GeodesicField in one state
+    so that "v in fixed", len(close) and "for v in far" keep working
+    '''
+    def __init__(self, field, state):
+        self.field = field
+        self.state = state
+
+    def __contains__(self, v):
+        return self.field.state[self.field.vert_index(v)] == self.state
+
+    def __len__(self):
+        return int(np.count_nonzero(self.field.state == self.state))
+
+    def indices(self):
+        return np.flatnonzero(self.field.state == self.state)
+
+    def __iter__(self):
+        bme = self.field.mesh.bme
+        if bme == None:
+            for i in self.indices().tolist():
+                yield i
+            return
+
+        bme.verts.ensure_lookup_table()
+        for i in self.indices().tolist():
+            yield bme.verts[i]
+
+
+class GeodesicField(object):
+    '''
+    Distance field of the array backed fast march
+
+    dist - float64 array, distance value of each vert, inf when far
+    state - int8 array, FAR, CLOSE or FIXED for each vert
+    heap - lazy deletion heap of (T, vert index) over close, kept so a walk can be continued
+    obtuse - the mesh's obtuse_unfold_table
+    labels - int32 array of seed labels for multi source walks, otherwise None
+    touched - list of every vert index given a distance, only recorded when it is a list
+    grads - cached face_gradients, cleared whenever the field changes
+
+    field[v] and field.get(v) accept a BMVert or a vert index and behave like
+    the geos dictionary, far verts are not in the field.
+    '''
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.dist = np.full(mesh.num_verts, np.inf)
+        self.state = np.zeros(mesh.num_verts, dtype = np.int8)
+        self.heap = []
+        self.obtuse = obtuse_unfold_table(mesh)
+        self.labels = None
+        self.touched = None
+        self.grads = None
+
+        self.fixed = GeodesicVertSet(self, FIXED)
+        self.close = GeodesicVertSet(self, CLOSE)
+        self.far = GeodesicVertSet(self, FAR)
+
+    def reset(self, labels = False):
+        '''
+        clears the field so that another walk can reuse the arrays
+        labels - keep a seed label per vert, for multi source walks
+        '''
+        self.dist.fill(np.inf)
+        self.state.fill(FAR)
+        self.heap = []
+        self.grads = None
+
+        if not labels:
+            self.labels = None
+        elif self.labels is None:
+            self.labels = np.full(self.mesh.num_verts, -1, dtype = np.int32)
+        else:
+            self.labels.fill(-1)
+
+    def clear_touched(self):
+        '''
+        like reset, but only visits the verts touched since the last clear
+        so the cost is the size of the last walk and not the size of the mesh
+        '''
+        if self.touched:
+            touched = np.array(self.touched)
+            self.dist[touched] = np.inf
+            self.state[touched] = FAR
+            if self.labels is not None:
+                self.labels[touched] = -1
+        self.touched = []
+        self.heap = []
+        self.grads = None
+
+    def add_seed(self, seed, seed_location, label = None):
+        '''
+        fixes the verts of a seed with their euclidian distance to it
+        where seeds overlap the smaller distance (and its label) wins
+
+        seed - BMVert or BMFace
+        seed_location - mathutils.Vector, a point on the seed face
+        label - int, stored in labels for the verts this seed is closest to
+
+        return - int array, the verts which were fixed
+        '''
+        coords = self.mesh.coords
+        if isinstance(seed, bmesh.types.BMVert):
+            #seed is 0, ring neighbors get euclidian distance to initialize
+            s = seed.index
+            ring = np.setdiff1d(self.mesh.tris[self.mesh.vert_tris(s)].ravel(), [s])
+            inds = np.concatenate(([s], ring)).astype(np.int32)
+            d = np.linalg.norm(coords[inds] - coords[s], axis = 1)
+
+        elif isinstance(seed, bmesh.types.BMFace):
+            inds = self.mesh.face_vert_indices(seed.index)
+            d = np.linalg.norm(coords[inds] - np.array(seed_location[:]), axis = 1)
+
+        closer = d < self.dist[inds]
+        self.dist[inds[closer]] = d[closer]
+        self.state[inds] = FIXED
+        if label != None and self.labels is not None:
+            self.labels[inds[closer]] = label
+        if self.touched is not None:
+            self.touched.extend(inds.tolist())
+        return inds
+
+    def vert_index(self, v):
+        if isinstance(v, bmesh.types.BMVert):
+            return v.index
+        return int(v)
+
+    def __getitem__(self, v):
+        i = self.vert_index(v)
+        if self.state[i] == FAR:
+            raise KeyError(v)
+        return float(self.dist[i])
+
+    def get(self, v, default = None):
+        i = self.vert_index(v)
+        if self.state[i] == FAR:
+            return default
+        return float(self.dist[i])
+
+    def __contains__(self, v):
+        return self.state[self.vert_index(v)] != FAR
+
+    def __len__(self):
+        return int(np.count_nonzero(self.state))
+
+    def geo_data(self):
+        '''
+        the (geos, fixed, close, far) tuple that geodesic_walk returns
+        '''
+        return self, self.fixed, self.close, self.far
+
+    def face_gradients(self):
+        '''
+        face_gradients of this field, computed once per walk
+        '''
+        if self.grads is None:
+            self.grads = face_gradients(self.mesh, self.dist)
+        return self.grads
+
+    def update_front(self, v, subset_mask = None):
+        '''
+        recomputes the distance of every non fixed vert which shares a
+        triangle with the newly fixed vert v and one other fixed vert
+        '''
+        mesh = self.mesh
+        dist, state, coords = self.dist, self.state, mesh.coords
+
+        #rotate every incident triangle so that v comes first
+        tri_inds = mesh.vert_tris(v)
+        tris = mesh.tris[tri_inds]
+        k = np.argmax(tris == v, axis = 1)
+        rows = np.arange(len(tris))
+        o1 = tris[rows, (k + 1) % 3]
+        o2 = tris[rows, (k + 2) % 3]
+
+        #exactly one of the other two verts fixed
+        f1 = state[o1] == FIXED
+        one_fixed = f1 != (state[o2] == FIXED)
+        fv = np.where(f1, o1, o2)[one_fixed]
+        cv = np.where(f1, o2, o1)[one_fixed]
+        fcorner = np.where(f1, (k + 1) % 3, (k + 2) % 3)[one_fixed]
+        tri_inds = tri_inds[one_fixed]
+
+        if subset_mask is not None:
+            cv_in = subset_mask[cv]
+            fv, cv, fcorner, tri_inds = fv[cv_in], cv[cv_in], fcorner[cv_in], tri_inds[cv_in]
+        if not len(cv): return
+
+        T = calc_T_batch(coords[fv], coords[v], coords[cv], dist[fv], dist[v])
+
+        #obtuse at cv, use the virtual edge to the unfolded support vert if it is fixed
+        obtuse_vert, support, support_co = self.obtuse
+        sv = support[tri_inds, fcorner]
+        virtual = (obtuse_vert[tri_inds] == cv) & (sv >= 0)
+        virtual[virtual] = state[sv[virtual]] == FIXED
+        if np.any(virtual):
+            T[virtual] = calc_T_batch(coords[fv[virtual]], support_co[tri_inds[virtual], fcorner[virtual]],
+                                      coords[cv[virtual]], dist[fv[virtual]], dist[sv[virtual]])
+
+        labels = self.labels
+        if labels is not None:
+            #fronts from different seeds meet, don't mix them in one triangle
+            #update, just walk the edge from v
+            mixed = labels[fv] != labels[v]
+            if np.any(mixed):
+                T[mixed] = dist[v] + np.linalg.norm(coords[cv[mixed]] - coords[v], axis = 1)
+
+        lower = T < dist[cv]
+
+        #a vert can show up in two triangles of the batch, keep the smallest T
+        touched = self.touched
+        for i, T3 in zip(cv[lower].tolist(), T[lower].tolist()):
+            if T3 < dist[i]:
+                if touched is not None and state[i] == FAR: touched.append(i)
+                dist[i] = T3
+                state[i] = CLOSE
+                if labels is not None: labels[i] = labels[v]
+                heappush(self.heap, (T3, i))
+
+    def march(self, stop_targets, use_targets, max_iters = 10000, min_dist = None, subset_mask = None):
+        '''
+        fixes the close vert with the smallest distance until the heap runs out,
+        max_iters is reached, all stop_targets are fixed or the front passes min_dist
+
+        stop_targets - set of vert indices, emptied as they are fixed
+        returns number of marching steps
+        '''
+        dist, state, heap = self.dist, self.state, self.heap
+        self.grads = None
+
+        iters = 0
+        while heap and (max_iters == None or iters < max_iters) and (len(stop_targets) or not use_targets):
+            T, v = heappop(heap)
+            if state[v] != CLOSE or T != dist[v]: continue  #stale entry
+
+            if min_dist and T > min_dist:
+                heappush(heap, (T, v))
+                break
+
+            state[v] = FIXED
+            stop_targets.discard(v)
+            self.update_front(v, subset_mask)
+            iters += 1
+
+        return iters
+
+
+class GeodesicBrushWorkspace(object):
+    '''
+    radius bounded fast march for the paint brush
+
+    the field arrays are allocated once per stroke and every dab only clears
+    the verts the previous dab reached, so a dab costs O(brush area)
+    instead of O(mesh) like geodesic_walk(..., min_dist = radius) does
+    '''
+    def __init__(self, bme):
+        self.mesh = mesh_arrays_for_bmesh(bme)
+        self.field = GeodesicField(self.mesh)
+        self.field.touched = []
+
+    def dab(self, seed, seed_location, radius):
+        '''
+        seed - BMFace under the brush
+        seed_location - mathutils.Vector, the brush location on the seed face
+        radius - geodesic radius of the brush
+
+        return - int array, the faces whose verts are all within radius
+        '''
+        field, mesh = self.field, self.mesh
+        field.clear_touched()
+
+        for v in field.add_seed(seed, seed_location).tolist():
+            field.update_front(v)
+        field.march(set(), False, max_iters = None, min_dist = radius)
+
+        touched = np.unique(np.array(field.touched, dtype = np.int64))
+        fixed = touched[field.state[touched] == FIXED]
+
+        tris, _ = csr_gather(mesh.vert_tri_indptr, mesh.vert_tri_indices, fixed)
+        faces = np.unique(mesh.tri_face[tris])
+        if not len(faces): return faces
+
+        verts, offsets = csr_gather(mesh.face_indptr, mesh.face_verts, faces)
+        return faces[np.logical_and.reduceat(field.state[verts] == FIXED, offsets)]
+
+
+def target_vert_indices(targets):
+    stop_targets = set()
+    for ele in targets:
+        if isinstance(ele, bmesh.types.BMFace):
+            stop_targets.update(v.index for v in ele.verts)
+        elif isinstance(ele, bmesh.types.BMVert):
+            stop_targets.add(ele.index)
+    return stop_targets
+
+def subset_vert_mask(mesh, subset):
+    if subset == None: return None
+    mask = np.zeros(mesh.num_verts, dtype = bool)
+    mask[[v.index for v in subset]] = True
+    return mask
+
+def geodesic_walk_arrays(bme, seed, seed_location, targets = [], subset = None, max_iters = 10000, min_dist = None, field = None):
+    '''
+    geodesic_walk on flat arrays (see mesh_arrays.MeshArrays) instead of
+    BMVert dictionaries and sets.  Same arguments as geodesic_walk plus
+
+    field - GeodesicField from a previous walk on the same bme to reuse its arrays
+
+    return - geos, fixed, close, far where geos is the GeodesicField and the
+             others are set like views on it
+    '''
+    mesh = mesh_arrays_for_bmesh(bme)
+    if field == None or field.mesh is not mesh:
+        field = GeodesicField(mesh)
+    else:
+        field.reset()
+
+    subset_mask = subset_vert_mask(mesh, subset)
+
+    for v in field.add_seed(seed, seed_location).tolist():
+        field.update_front(v, subset_mask)
+
+    stop_targets = target_vert_indices(targets)
+    field.march(stop_targets, targets != [], max_iters = max_iters, min_dist = min_dist, subset_mask = subset_mask)
+
+    return field.geo_data()
+
+def geodesic_walk_multi(bme, seeds, seed_locations, targets = [], subset = None, max_iters = None, min_dist = None, field = None):
+    '''
+    one fast march from many seeds at once
+
+    seeds - list of BMVerts or BMFaces
+    seed_locations - list of mathutils.Vector, one per seed (ignored for BMVert seeds)
+    other arguments like geodesic_walk_arrays
+
+    return - field, labels
+        field - GeodesicField, distance to the nearest seed
+        labels - int32 array, index into seeds of the nearest seed for each vert, -1 if not reached
+    '''
+    mesh = mesh_arrays_for_bmesh(bme)
+    if field == None or field.mesh is not mesh:
+        field = GeodesicField(mesh)
+    field.reset(labels = True)
+
+    subset_mask = subset_vert_mask(mesh, subset)
+
+    seed_inds = [field.add_seed(seed, loc, label = i) for i, (seed, loc) in enumerate(zip(seeds, seed_locations))]
+    if len(seed_inds):
+        for v in np.unique(np.concatenate(seed_inds)).tolist():
+            field.update_front(v, subset_mask)
+
+    stop_targets = target_vert_indices(targets)
+    field.march(stop_targets, targets != [], max_iters = max_iters, min_dist = min_dist, subset_mask = subset_mask)
+
+    return field, field.labels
+
+def heat_seed_weights(mesh, seed, seed_location):
+    '''
+    initial heat for the heat method, 1 at a seed vert or the barycentric
+    weights of seed_location spread over the verts of a seed face
+    '''
+    weights = np.zeros(mesh.num_verts)
+    if isinstance(seed, bmesh.types.BMVert):
+        weights[seed.index] = 1
+        return weights
+
+    vs = mesh.face_vert_indices(seed.index)
+    P = mesh.coords[vs]
+    loc = np.array(seed_location[:])
+    if len(vs) == 3:
+        #sub triangle areas opposite each vert
+        w = np.array([np.linalg.norm(np.cross(P[(i + 1) % 3] - loc, P[(i + 2) % 3] - loc)) for i in range(3)])
+    else:
+        w = 1/np.maximum(np.linalg.norm(P - loc, axis = 1), 1e-9)
+    weights[vs] = w/np.sum(w)
+    return weights
+
+def heat_geodesic_walk(bme, seed, seed_location, field = None, t_factor = 1.0):
+    '''
+    geodesic distance by the heat method (see geodesic_heat), the
+    operators are factored the first time a mesh snapshot is used and
+    every later seed costs two back substitutions
+
+    every vert the heat reaches is fixed, so there is nothing to continue
+    return - same as geodesic_walk_arrays
+    '''
+    mesh = mesh_arrays_for_bmesh(bme)
+    if field == None or field.mesh is not mesh:
+        field = GeodesicField(mesh)
+    else:
+        field.reset()
+
+    solver = heat_solver_for_mesh(mesh, t_factor = t_factor)
+    field.dist[:] = solver.distance(heat_seed_weights(mesh, seed, seed_location))
+    field.state[np.isfinite(field.dist)] = FIXED
+
+    return field.geo_data()
+
+def continue_geodesic_walk_arrays(field, targets = [], subset = None, max_iters = 500, min_dist = None):
+    '''
+    picks up a geodesic_walk_arrays where it stopped
+    '''
+    stop_targets = set(v for v in target_vert_indices(targets) if field.state[v] != FIXED)
+    subset_mask = subset_vert_mask(field.mesh, subset)
+    iters = field.march(stop_targets, targets != [], max_iters = max_iters, min_dist = min_dist, subset_mask = subset_mask)
+    print('continuued walking in %i additional iters' % iters)
     return
 
 def gradient_face(f, geos):
@@ -849,10 +1389,220 @@ def gradient_descent(bme, geos, start_element, start_location, epsilon = .000000
         
     return path_elements, path_coords
         
+def barycentric_gradients(P):
+    '''
+    P - (..., 3, 3) triangle corner coordinates
+    return - (..., 3, 3) gradient of each barycentric coordinate, they lie in the triangle plane
+    '''
+    N = np.cross(P[..., 1, :] - P[..., 0, :], P[..., 2, :] - P[..., 0, :])
+    double_area = np.linalg.norm(N, axis = -1)[..., None]
+    n = N/np.maximum(double_area, 1e-300)
+    G = np.stack([np.cross(n, P[..., (i + 2) % 3, :] - P[..., (i + 1) % 3, :]) for i in range(3)], axis = -2)
+    return G/np.maximum(double_area, 1e-300)[..., None]
+
+def face_gradients(mesh, dist):
+    '''
+    gradient of the linear interpolation of dist over every triangle, in one pass
+    
+    mesh - MeshArrays
+    dist - (n_verts,) distance values, eg GeodesicField.dist
+    return - (n_tris, 3), zero for triangles with a vert the walk did not reach
+    '''
+    G = barycentric_gradients(mesh.coords[mesh.tris])
+    u = dist[mesh.tris]
+    reached = np.all(np.isfinite(u), axis = 1)
+    u = np.where(np.isfinite(u), u, 0)
+    grads = np.einsum('ti,tij->tj', u, G)
+    grads[~reached] = 0
+    return grads
+
+def trace_gradient(mesh, grads, dist, start_tri = None, start_location = None, start_vert = None, max_steps = 1000, epsilon = 1e-9):
+    '''
+    walks down a precomputed face gradient field, see face_gradients
+    starts either at start_location inside start_tri or at start_vert
+    
+    the walk crosses triangles in a straight line along -gradient, steps onto
+    a vert when it hits one and slides along an edge into the lower vert where
+    the gradients of both neighboring triangles point at their shared edge.
+    It stops at a local minimum, a mesh boundary or after max_steps
+    
+    return - path, tris
+        path - list of (3,) arrays, the points where the walk entered each element
+        tris - list of triangle index (or -1 for a vert) for each point
+    '''
+    co, tris = mesh.coords, mesh.tris
+    neighbors = mesh.tri_neighbors()
+    
+    def leave_vert(v):
+        '''
+        the steepest incident triangle whose -gradient points into the triangle from v
+        otherwise walk the edge to the lowest neighbor vert.  returns (tri, vert)
+        '''
+        best, best_len = None, 0
+        for t in mesh.vert_tris(v).tolist():
+            d = -grads[t]
+            length = np.linalg.norm(d)
+            if length <= best_len: continue
+            db = barycentric_gradients(co[tris[t]]).dot(d)
+            if np.all(db[tris[t] != v] >= -epsilon * length):
+                best, best_len = t, length
+        if best != None:
+            return best, None
+        
+        ring = np.setdiff1d(tris[mesh.vert_tris(v)].ravel(), [v])
+        if not len(ring): return None, None
+        w = ring[np.argmin(dist[ring])]
+        if dist[w] >= dist[v]:
+            return None, None  #local minimum
+        return None, int(w)
+    
+    path, path_tris = [], []
+    vert = start_vert
+    t = start_tri
+    p = co[vert] if vert != None else np.array(start_location[:], dtype = np.float64)
+    path += [p]
+    path_tris += [-1 if vert != None else t]
+    
+    stalled = 0
+    for step in range(max_steps):
+        if vert != None:
+            t, w = leave_vert(vert)
+            if t == None and w == None: break
+            if w != None:
+                vert = w
+                p = co[w]
+                path += [p]
+                path_tris += [-1]
+                continue
+            vert = None
+        
+        d = -grads[t]
+        if not np.any(d): break
+        
+        P = co[tris[t]]
+        G = barycentric_gradients(P)
+        b = np.maximum(G.dot(p - P[0]) + np.array([1, 0, 0]), 0)
+        db = G.dot(d)
+        
+        #first barycentric coordinate to reach 0 is the exit edge, opposite corner i
+        exits = np.where(db < -epsilon * np.linalg.norm(d), -b/np.where(db < 0, db, -1), np.inf)
+        i = int(np.argmin(exits))
+        s = exits[i]
+        if not np.isfinite(s): break
+        
+        q = p + s * d
+        bq = b + s * db
+        if np.max(bq) > 1 - 1e-6:
+            #ran into a vert
+            vert = int(tris[t, np.argmax(bq)])
+            p = co[vert]
+            path += [p]
+            path_tris += [-1]
+            continue
+        
+        if s > epsilon:
+            stalled = 0
+            path += [q]
+            path_tris += [t]
+        else:
+            stalled += 1
+        
+        nt = neighbors[t, (i + 1) % 3]
+        if nt < 0: break
+        
+        if stalled > 1:
+            #both sides of this edge point at it, slide into its lower vert
+            a, c = tris[t, (i + 1) % 3], tris[t, (i + 2) % 3]
+            vert = int(a if dist[a] < dist[c] else c)
+            p = co[vert]
+            path += [p]
+            path_tris += [-1]
+            stalled = 0
+            continue
+        
+        t, p = nt, q
+    
+    return path, path_tris
+
+def gradient_descent_arrays(bme, geos, start_element, start_location, grads = None):
+    '''
+    gradient_descent for a GeodesicField using trace_gradient
+    
+    grads - face_gradients of the field, pass them in when tracing many
+            starts from one field, or use gradient_descent_many
+    
+    return - path_tris, path_coords.  path_coords are like gradient_descent,
+             path_tris are the triangle indices crossed (-1 at verts), not the
+             BMVerts and BMEdges gradient_descent returns as path_elements
+    '''
+    mesh = geos.mesh
+    if grads is None:
+        grads = face_gradients(mesh, geos.dist)
+    
+    if isinstance(start_element, bmesh.types.BMVert):
+        path, path_tris = trace_gradient(mesh, grads, geos.dist, start_vert = start_element.index)
+    else:
+        #pick the fan triangle of the face which contains the start location
+        loc = np.array(start_location[:])
+        face_tris = mesh.face_tris(start_element.index)
+        P = mesh.coords[mesh.tris[face_tris]]
+        b = np.einsum('tij,tj->ti', barycentric_gradients(P), loc - P[:, 0]) + np.array([1, 0, 0])
+        t = int(face_tris[np.argmax(np.min(b, axis = 1))])
+        path, path_tris = trace_gradient(mesh, grads, geos.dist, start_tri = t, start_location = loc)
+    
+    return path_tris, [Vector(p) for p in path]
+
+def gradient_descent_many(bme, geos, starts):
+    '''
+    traces every (start_element, start_location) in starts down one field,
+    the face gradients are only computed once
+    
+    return - list of (path_tris, path_coords), see gradient_descent_arrays
+    '''
+    grads = geos.face_gradients()
+    return [gradient_descent_arrays(bme, geos, ele, loc, grads = grads) for ele, loc in starts]
+
+def geodesic_paths_batch(bme, jobs, max_iters = 100000, engine = 'ARRAY'):
+    '''
+    many seed -> target geodesic paths, with one march per unique seed
+    
+    jobs - list of (seed, seed_location, target, target_location), seeds and targets are BMFaces
+    max_iters - marching step limit for each seed
+    engine - 'HEAT' solves each seed with heat_geodesic_walk, anything else marches
+             with geodesic_walk_arrays
+    
+    jobs with the same seed face and location share a field.  The march for a seed
+    stops once its farthest target is fixed, then every target is traced down
+    the shared gradient field
+    
+    return - list of (geo_data, path_coords) in job order, each path runs from
+             the target down to the seed like gradient_descent
+    '''
+    groups = OrderedDict()
+    for i, job in enumerate(jobs):
+        key = (job[0].index, tuple(job[1]))
+        groups.setdefault(key, []).append(i)
+    
+    results = [None] * len(jobs)
+    for inds in groups.values():
+        seed, seed_loc = jobs[inds[0]][0:2]
+        targets = [jobs[i][2] for i in inds]
+        
+        if engine == 'HEAT' and HAS_SCIPY:
+            geo_data = heat_geodesic_walk(bme, seed, seed_loc)
+        else:
+            geo_data = geodesic_walk_arrays(bme, seed, seed_loc, targets = targets, max_iters = max_iters)
+        paths = gradient_descent_many(bme, geo_data[0], [(jobs[i][2], jobs[i][3]) for i in inds])
+        for i, (path_tris, path) in zip(inds, paths):
+            results[i] = (geo_data, path)
+    
+    print('%i geodesic paths from %i fields' % (len(jobs), len(groups)))
+    return results
+
 def prepare_bmesh_for_geodesic(bme, qmeth = 0):
     '''
     will triangulate any quads
-    will bisect any obtuse triangles
+    will build the obtuse triangle unfold table, see obtuse_unfold_table
     '''
     start = time.time()
     
@@ -866,46 +1616,9 @@ def prepare_bmesh_for_geodesic(bme, qmeth = 0):
     bme.edges.ensure_lookup_table()
     bme.verts.ensure_lookup_table()
     
-    '''
-    bisect_edges = []
-    bisect_inds = []
-    bisect_locations = dict()
-
-    for f in bme.faces:
-        obtuse, v_ind, e_ind, bisect = test_obtuse(f)
-        if obtuse:
-            if e_ind in bisect_locations:
-                print('found twice!')
-                bisect_locations[e_ind] += [bisect]
-                
-            else:
-                bisect_edges += [bme.edges[e_ind]]
-                bisect_locations[e_ind] = [bisect]
-                bisect_inds += [e_ind]  #this keeps the order in which we bisec the edge
-                
-    geom = bmesh.ops.bisect_edges(bme, edges = bisect_edges, cuts = 1)
-    new_bmverts = [ele for ele in geom['geom_split'] if isinstance(ele, bmesh.types.BMVert)]
-
-    #assign new verts their locations
-    for v, e_ind in zip(new_bmverts, bisect_inds):
-        
-        #do this very explicity for error detection
-        co = Vector((0,0,0))
-        n = 0
-        for b_loc in bisect_locations[e_ind]:
-            if not isinstance(b_loc, Vector):
-                print('not a vector')
-            co += b_loc
-            n += 1
-        co = 1/n * co
-        
-        v.co = co
-    
-    #now, triangulate those faces which because quads due to bissection    
-    bme.faces.ensure_lookup_table()    
-    not_tris = [f for f in bme.faces if len(f.verts)>3]
-    bmesh.ops.triangulate(bme, faces = not_tris)
-    '''
+    #unfold the obtuse triangles once instead of inside every march
+    #this used to bisect the obtuse triangles instead, which changed the mesh
+    obtuse_unfold_table(mesh_arrays_for_bmesh(bme))
     
     finish = time.time()
     elapsed = finish - start
@@ -915,14 +1628,23 @@ class GeoPath(object):
     '''
     A class which manages a geodesic gradient on a BMesh
     
+    engine - 'BMESH' marches on BMVert dictionaries and sets
+             'ARRAY' marches on flat arrays, see geodesic_walk_arrays
+             'HEAT' solves with the heat method, see heat_geodesic_walk.  needs scipy,
+             falls back to 'ARRAY' without it
     '''
-    def __init__(self, bme, bvh, mx):   
+    def __init__(self, bme, bvh, mx, engine = 'BMESH'):   
         
         self.bme = bme
         non_tris = [f for f in self.bme.faces if len(f.verts) > 3]
         print('there are %i non tris' % len(non_tris))
         self.bvh = bvh
         self.mx = mx
+        if engine == 'HEAT' and not HAS_SCIPY:
+            print('scipy is not available for the heat method, using fast marching')
+            engine = 'ARRAY'
+        self.engine = engine
+        self.field = None  #GeodesicField, reused between walks by the 'ARRAY' engine
         
         self.seed = None  #BMFace
         self.seed_loc = None #Vector in local coordinates, preferable ony the seed face
@@ -945,7 +1667,8 @@ class GeoPath(object):
         self.target_loc = None
         self.geo_data = [dict(), set(), set(), set()]  #geos, fixed, close, far
         self.path = []
-        self.path_elements = []
+        self.path_elements = []  #BMVerts and BMEdges crossed, gradient_descent only
+        self.path_tris = []  #triangle indices crossed, gradient_descent_arrays only
         
     
     #TODO?  Maybe some get, set fns    
@@ -960,6 +1683,19 @@ class GeoPath(object):
         return
                 
     def calculate_walk(self, iterations = 100000):  #TODO, this is more of a gradient field
+        if self.engine == 'HEAT':
+            self.geo_data = list(heat_geodesic_walk(self.bme, self.seed, self.seed_loc, field = self.field))
+            self.field = self.geo_data[0]
+            return
+        
+        if self.engine == 'ARRAY':
+            self.geo_data = list(geodesic_walk_arrays(self.bme, self.seed, self.seed_loc,
+                                                      targets = [self.target],
+                                                      max_iters = iterations,
+                                                      field = self.field))
+            self.field = self.geo_data[0]
+            return
+        
         geos, fixed, close, far = geodesic_walk(self.bme, self.seed, self.seed_loc, 
                                                 targets = [self.target], 
                                                 subset = None, 
@@ -973,7 +1709,12 @@ class GeoPath(object):
         if self.found_target(): return True
         
         geos, fixed, close, far = self.geo_data
-        continue_geodesic_walk(self.bme, self.seed, self.seed_loc, 
+        if self.engine == 'HEAT':
+            return self.found_target()  #the heat method reaches everything at once
+        elif self.engine == 'ARRAY':
+            continue_geodesic_walk_arrays(geos, targets = [self.target], max_iters = iterations)
+        else:
+            continue_geodesic_walk(self.bme, self.seed, self.seed_loc, 
                            geos, fixed, close, far,
                            targets =[self.target], 
                            subset = None, 
@@ -989,8 +1730,15 @@ class GeoPath(object):
         
         geos, fixed, close, far = self.geo_data
         
+        if isinstance(geos, GeodesicField):
+            self.path_tris, self.path = gradient_descent_arrays(self.bme, geos,
+                                self.target, self.target_loc, grads = geos.face_gradients())
+            self.path_elements = []
+            return
+        
         self.path_elements, self.path = gradient_descent(self.bme, geos, 
                                 self.target, self.target_loc, epsilon = .0000001)
+        self.path_tris = []
         
     def found_target(self):
         '''
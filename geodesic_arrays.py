@@ -0,0 +1,134 @@
+'''
+Triangle update of the array backed fast march
+
+calc_T_batch is the numpy version of geodesic.calc_T_scalar.  It lives here
+because this module does not import bpy, bmesh or mathutils, so it can be
+checked outside of Blender
+
+    python geodesic_arrays.py
+'''
+import numpy as np
+
+
+def calc_T_batch(v1, v2, v3, T1, T2):
+    '''
+    calc_T_scalar for a whole batch of triangles, without building rotation
+    matrices.  In the frame with v1 at the origin and v2 on the x axis, v3 sits
+    at (x3, h) and the virtual source at (x, -y)
+
+    v1, v2, v3 - (n,3) arrays, or (3,) arrays which broadcast
+    T1, T2 - (n,) arrays or floats, distance values at v1 and v2
+
+    return - (n,) array, the distance values at v3
+    '''
+    u = v2 - v1
+    c = v3 - v1
+    LL = np.sum(u * u, axis = -1)
+    cc = np.sum(c * c, axis = -1)
+    T1 = np.asarray(T1, dtype = np.float64)
+    T2 = np.asarray(T2, dtype = np.float64)
+
+    degenerate = LL == 0
+    L = np.sqrt(np.where(degenerate, 1, LL))
+
+    x3 = np.sum(c * u, axis = -1)/L
+    h = np.sqrt(np.maximum(cc - x3**2, 0))
+
+    A = 2 * T1**2 * LL - LL**2 + 2 * T2**2 * LL
+    B = (T1**2 - T2**2)**2
+    x = (LL + T1**2 - T2**2)/(2 * L)
+    y = np.sqrt(np.maximum(A - B, 0))/(2 * L)  #no intersection, y = 0 like calc_T_scalar
+
+    T3 = np.sqrt((x3 - x)**2 + (h + y)**2)
+    return np.where(degenerate, T1 + np.sqrt(cc), T3)
+
+
+def calc_T_reference(v1, v2, v3, Tv1, Tv2):
+    '''
+    line by line numpy port of geodesic.calc_T_scalar, rotation matrix and all
+    v1, v2, v3 - (3,) arrays
+    Tv1, Tv2 - distance values at v1 and v2
+    '''
+    u = v2 - v1  #x - axis
+    v2x = np.linalg.norm(u)
+    U = u/v2x
+
+    c = v3 - v1
+    w = np.cross(u, c)  #z axis
+    W = w/np.linalg.norm(w)
+    V = np.cross(U, W)  #y axis
+
+    T = np.column_stack((U, V, W))
+    v3p = T.T.dot(c)
+
+    A = 2 * Tv1**2 * v2x**2 - v2x**4 + 2 * Tv2**2 * v2x**2
+    B = (Tv1**2 - Tv2**2)**2
+
+    x = 1/2 * (v2x**2 + Tv1**2 - Tv2**2)/(v2x)
+    if A - B < 0:
+        #the circles do not intersect, calc_T_scalar gets a complex y and sets it to 0
+        y = 0
+    else:
+        y = 1/2 * ((A-B)**.5)/v2x
+
+    T3a = v3p - np.array((x, y, 0))
+    T3b = v3p - np.array((x, -y, 0))
+    return max(np.linalg.norm(T3a), np.linalg.norm(T3b))
+
+
+def check_calc_T_batch(n = 2000, noise = .5, seed = 0, tolerance = 1e-9):
+    '''
+    asserts calc_T_batch matches calc_T_reference on n random triangles
+    n - number of triangles
+    noise - random error added to the distance values, large enough that a good
+            share of the pairs of circles do not intersect
+    seed - for the random triangles
+
+    also asserts that for exact distances from a source in the plane of the
+    triangle, across the v1 v2 edge from v3, the result is the distance from
+    v3 to that source
+
+    returns the largest relative difference
+    '''
+    rng = np.random.RandomState(seed)
+    V1 = rng.uniform(-1, 1, (n, 3))
+    V2 = rng.uniform(-1, 1, (n, 3))
+    V3 = rng.uniform(-1, 1, (n, 3))
+
+    #distances from a random source, plus noise
+    source = rng.uniform(-3, 3, 3)
+    T1 = np.linalg.norm(V1 - source, axis = 1) + rng.uniform(0, noise, n)
+    T2 = np.linalg.norm(V2 - source, axis = 1) + rng.uniform(0, noise, n)
+
+    LL = np.sum((V2 - V1)**2, axis = 1)
+    A = 2 * T1**2 * LL - LL**2 + 2 * T2**2 * LL
+    B = (T1**2 - T2**2)**2
+    apart = A - B < 0
+    assert np.any(apart) and not np.all(apart), 'need both intersecting and non intersecting circles'
+
+    batch = calc_T_batch(V1, V2, V3, T1, T2)
+    reference = np.array([calc_T_reference(V1[i], V2[i], V3[i], T1[i], T2[i]) for i in range(n)])
+    err = np.abs(batch - reference)/np.maximum(reference, 1)
+    assert np.all(err <= tolerance), 'calc_T_batch differs from calc_T_scalar by %e' % np.max(err)
+    assert np.all(err[apart] <= tolerance), 'non intersecting fallback differs'
+
+    #closed form, a planar source across the v1 v2 edge from v3
+    u = V2 - V1
+    c = V3 - V1
+    U = u/np.linalg.norm(u, axis = 1)[:, None]
+    side = c - np.sum(c * U, axis = 1)[:, None] * U
+    side /= np.linalg.norm(side, axis = 1)[:, None]
+    S = V1 + rng.uniform(-1, 2, (n, 1)) * u - rng.uniform(.1, 2, (n, 1)) * side
+    exact = calc_T_batch(V1, V2, V3, np.linalg.norm(S - V1, axis = 1), np.linalg.norm(S - V2, axis = 1))
+    expected = np.linalg.norm(V3 - S, axis = 1)
+    closed_err = np.abs(exact - expected)/np.maximum(expected, 1)
+    assert np.all(closed_err <= 1e-6), 'calc_T_batch misses a planar source by %e' % np.max(closed_err)
+
+    max_err = float(max(np.max(err), np.max(closed_err)))
+    print('%i triangles, %i with non intersecting circles, max difference %e' % (n, np.count_nonzero(apart), max_err))
+    return max_err
+
+
+if __name__ == '__main__':
+    # run tests
+    check_calc_T_batch()
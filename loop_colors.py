@@ -0,0 +1,115 @@
+'''
+Per loop colors of a BMesh kept in a numpy buffer
+
+Patches and paint strokes used to be shown by assigning loop[color_layer] one
+loop at a time and writing the whole BMesh back with to_mesh, which lags after
+a cut on a 1M loop mesh and on every paint dab.  LoopColorBuffer keeps one
+color per face, expands the faces that changed into the loop buffer and
+writes it to the Mesh vertex color layer with a single foreach_set.
+
+Loops are in face order, the way BMesh.to_mesh writes them, so face f owns
+loops face_indptr[f]:face_indptr[f+1] of the MeshArrays snapshot.
+
+This module does not import bpy, bmesh or mathutils
+'''
+import numpy as np
+
+from .mesh_arrays import mesh_arrays_for_bmesh
+
+
+class LoopColorBuffer(object):
+    '''
+    bme - the BMesh the colors belong to
+    face_rgb - (n_faces, 3) float32, the color of every face
+    loop_rgb - (n_loops, 3) float32, face_rgb expanded to the loops
+    dirty - (n_faces,) bool, faces changed since the loops were last updated
+    changed - the loop buffer differs from what was last written
+    '''
+    def __init__(self, bme):
+        self.bme = bme
+        self.signature = None
+        self.sync()
+
+    def sync(self):
+        '''
+        takes the loop layout again when the topology of bme changed, every
+        face goes back to white.  returns True if it did
+        '''
+        bme = self.bme
+        signature = (len(bme.verts), len(bme.edges), len(bme.faces))
+        if signature == self.signature: return False
+
+        mesh = mesh_arrays_for_bmesh(bme)
+        self.signature = signature
+        self.face_indptr = mesh.face_indptr
+        self.face_rgb = np.ones((mesh.num_faces, 3), dtype=np.float32)
+        self.loop_rgb = np.ones((len(mesh.face_verts), 3), dtype=np.float32)
+        self.dirty = np.zeros(mesh.num_faces, dtype=bool)
+        self.changed = True
+        return True
+
+    def set_face_colors(self, face_inds, color):
+        '''
+        face_inds - int array or list of face indices
+        color - 3 sequence
+        '''
+        self.sync()
+        face_inds = np.asarray(face_inds, dtype=np.int64)
+        if len(face_inds) == 0: return
+        self.face_rgb[face_inds] = tuple(color)[:3]
+        self.dirty[face_inds] = True
+
+    def set_label_colors(self, labels, palette):
+        '''
+        colors every labelled face by its label, faces labelled -1 are left alone
+
+        labels - (n_faces,) int array
+        palette - (n_labels, 3) colors
+        '''
+        self.sync()
+        labelled = np.flatnonzero(labels >= 0)
+        if len(labelled) == 0: return
+        rgb = np.asarray(palette, dtype=np.float32).reshape(-1, 3)[labels[labelled]]
+        differs = np.any(self.face_rgb[labelled] != rgb, axis = 1)
+        self.face_rgb[labelled[differs]] = rgb[differs]
+        self.dirty[labelled[differs]] = True
+
+    def update(self):
+        '''
+        expands the dirty faces into the loop buffer
+        returns the number of faces updated
+        '''
+        faces = np.flatnonzero(self.dirty)
+        if len(faces) == 0: return 0
+
+        starts = self.face_indptr[faces]
+        counts = self.face_indptr[faces + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        loops = np.arange(np.sum(counts)) - np.repeat(offsets, counts) + np.repeat(starts, counts)
+        self.loop_rgb[loops] = np.repeat(self.face_rgb[faces], counts, axis = 0)
+        self.dirty[faces] = False
+        self.changed = True
+        return len(faces)
+
+    def write(self, color_data, force = False):
+        '''
+        color_data - Mesh.vertex_colors[name].data, 3 floats per loop in 2.79 and 4 after
+        force - write even if nothing changed, eg after BMesh.to_mesh wrote stale colors
+        returns True if it wrote
+        '''
+        self.sync()
+        self.update()
+        if not (self.changed or force): return False
+        if len(color_data) != len(self.loop_rgb):
+            print('vertex color layer has %i loops, expected %i' % (len(color_data), len(self.loop_rgb)))
+            return False
+
+        width = len(color_data[0].color) if len(color_data) else 3
+        if width == 3:
+            buf = self.loop_rgb
+        else:
+            buf = np.ones((len(self.loop_rgb), width), dtype=np.float32)
+            buf[:, :3] = self.loop_rgb
+        color_data.foreach_set('color', buf.ravel())
+        self.changed = False
+        return True
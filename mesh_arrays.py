@@ -0,0 +1,551 @@
+'''
+Flat NumPy snapshots of BMesh topology.
+
+Walking BMesh elements from python is slow and the BMesh is not safe to share
+between threads or processes.  MeshArrays pulls coordinates and connectivity
+into plain integer/float arrays once, and everything else (geodesics, cut
+walkers, patch labelling) works on indices.
+
+This module does not import bpy, bmesh or mathutils so it can be used from
+worker processes.
+'''
+import copy
+
+import numpy as np
+
+#optional, see connected_components
+try:
+    import scipy.sparse as sparse
+    from scipy.sparse.csgraph import connected_components as _csgraph_components
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+
+def csr_from_pairs(rows, cols, n_rows):
+    '''
+    rows - int array, the row of each entry
+    cols - int array, the value stored for each entry
+    n_rows - int, number of rows
+
+    returns indptr, indices
+    row r holds indices[indptr[r]:indptr[r+1]], in the order the entries were given
+    '''
+    rows = np.asarray(rows, dtype=np.int64)
+    order = np.argsort(rows, kind='mergesort')  #stable, keeps entry order within a row
+    indices = np.asarray(cols, dtype=np.int32)[order]
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, indices
+
+
+def csr_gather(indptr, indices, rows):
+    '''
+    concatenation of the CSR rows, without a python loop
+    returns values, offsets where row i starts at values[offsets[i]]
+    '''
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    offsets = np.cumsum(lengths) - lengths
+    positions = np.arange(np.sum(lengths)) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+    return indices[positions], offsets
+
+
+def connected_components(n, a, b):
+    '''
+    n - int, number of nodes
+    a, b - int arrays, node a[i] is joined to node b[i]
+
+    returns n_components, labels
+    labels - (n,) int32, components numbered in order of their smallest node
+
+    uses scipy.sparse.csgraph when it can be imported, otherwise min label
+    hooking with pointer jumping, a few numpy passes per halving of the
+    longest label chain
+    '''
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    if n == 0:
+        return 0, np.zeros(0, dtype=np.int32)
+
+    if HAS_SCIPY:
+        graph = sparse.coo_matrix((np.ones(len(a), dtype=np.int8), (a, b)), shape=(n, n))
+        n_components, labels = _csgraph_components(graph, directed = False)
+        return n_components, labels.astype(np.int32)
+
+    parent = np.arange(n, dtype=np.int64)
+    while True:
+        pa, pb = parent[a], parent[b]
+        hooking = pa != pb
+        if not np.any(hooking): break
+        lo = np.minimum(pa[hooking], pb[hooking])
+        hi = np.maximum(pa[hooking], pb[hooking])
+        np.minimum.at(parent, hi, lo)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent): break
+            parent = jumped
+
+    #every node now points at the smallest node of its component
+    roots, labels = np.unique(parent, return_inverse = True)
+    return len(roots), labels.astype(np.int32)
+
+
+def relabel_masked(labels, mask):
+    '''
+    component labels of the masked nodes numbered from 0 again, -1 elsewhere
+    returns n_components, labels
+    '''
+    out = np.full(len(labels), -1, dtype=np.int32)
+    components, out[mask] = np.unique(labels[mask], return_inverse = True)
+    return len(components), out
+
+
+class MeshArrays(object):
+    '''
+    Read only array snapshot of a mesh
+
+    coords - (n_verts, 3) float64
+    face_indptr, face_verts - CSR face -> verts, in winding order
+    tris - (n_tris, 3) int32, faces fan triangulated
+    tri_face - (n_tris,) int32, the face each triangle came from
+    vert_tri_indptr, vert_tri_indices - CSR vert -> incident triangles
+    edge_verts - (n_edges, 2) int32 or None
+    face_edges - int32 aligned with face_verts, face_edges[k] joins face_verts[k]
+                 to the next vert of the face.  None when edges were not given
+
+    bme - the BMesh the arrays were taken from, or None
+    cache - derived tables keyed by name, they go away with the snapshot
+    '''
+    def __init__(self, coords, face_indptr, face_verts, bme = None, edge_verts = None, face_edges = None):
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        self.face_indptr = np.asarray(face_indptr, dtype=np.int64)
+        self.face_verts = np.asarray(face_verts, dtype=np.int32)
+        self.edge_verts = None if edge_verts is None else np.asarray(edge_verts, dtype=np.int32).reshape(-1, 2)
+        self.face_edges = None if face_edges is None else np.asarray(face_edges, dtype=np.int32)
+        self.bme = bme
+        self.cache = {}
+
+        self.tris, self.tri_face = self.fan_triangulate()
+        self.vert_tri_indptr, self.vert_tri_indices = csr_from_pairs(self.tris.ravel(),
+                                                                     np.arange(3 * len(self.tris)) // 3,
+                                                                     self.num_verts)
+
+    def __getstate__(self):
+        '''
+        pickles without the BMesh and the derived tables, eg to send to a worker process
+        '''
+        state = self.__dict__.copy()
+        state['bme'] = None
+        state['cache'] = {}
+        return state
+
+    @classmethod
+    def from_bmesh(cls, bme):
+        '''
+        takes a snapshot of bme, updating element indices first
+        '''
+        bme.verts.index_update()
+        bme.edges.index_update()
+        bme.faces.index_update()
+
+        coords = np.array([v.co[:] for v in bme.verts], dtype=np.float64).reshape(-1, 3)
+        counts = [len(f.verts) for f in bme.faces]
+        face_verts = [v.index for f in bme.faces for v in f.verts]
+        face_edges = [l.edge.index for f in bme.faces for l in f.loops]
+        edge_verts = [v.index for ed in bme.edges for v in ed.verts]
+
+        face_indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=face_indptr[1:])
+        return cls(coords, face_indptr, face_verts, bme = bme, edge_verts = edge_verts, face_edges = face_edges)
+
+    def num_verts(self): return len(self.coords)
+    def num_faces(self): return len(self.face_indptr) - 1
+    def num_tris(self): return len(self.tris)
+    def num_edges(self): return 0 if self.edge_verts is None else len(self.edge_verts)
+    num_verts = property(num_verts)
+    num_faces = property(num_faces)
+    num_tris = property(num_tris)
+    num_edges = property(num_edges)
+
+    def face_vert_indices(self, f_ind):
+        return self.face_verts[self.face_indptr[f_ind]:self.face_indptr[f_ind + 1]]
+
+    def face_edge_indices(self, f_ind):
+        return self.face_edges[self.face_indptr[f_ind]:self.face_indptr[f_ind + 1]]
+
+    def edge_faces(self):
+        '''
+        CSR edge -> faces as indptr, indices, cached
+        an edge with one face is a boundary, more than two is non manifold
+        '''
+        if 'edge_faces' not in self.cache:
+            rows = self.face_edges
+            faces = np.repeat(np.arange(self.num_faces, dtype=np.int32), np.diff(self.face_indptr))
+            self.cache['edge_faces'] = csr_from_pairs(rows, faces, self.num_edges)
+        return self.cache['edge_faces']
+
+    def face_tris(self, f_ind):
+        '''
+        the fan triangles of a face, every face before it has len(verts) - 2 of them
+        '''
+        start = self.face_indptr[f_ind] - 2 * f_ind
+        return np.arange(start, self.face_indptr[f_ind + 1] - 2 * (f_ind + 1))
+
+    def vert_tris(self, v_ind):
+        return self.vert_tri_indices[self.vert_tri_indptr[v_ind]:self.vert_tri_indptr[v_ind + 1]]
+
+    def face_neighbors(self):
+        '''
+        CSR face -> faces sharing an edge with it as indptr, indices, cached
+        '''
+        if 'face_neighbors' not in self.cache:
+            ef_indptr, ef_indices = self.edge_faces()
+            slot_face = np.repeat(np.arange(self.num_faces), np.diff(self.face_indptr))
+            others, offsets = csr_gather(ef_indptr, ef_indices, self.face_edges)
+            rows = np.repeat(slot_face, np.diff(np.append(offsets, len(others))))
+            keep = others != rows
+            self.cache['face_neighbors'] = csr_from_pairs(rows[keep], others[keep], self.num_faces)
+        return self.cache['face_neighbors']
+
+    def face_components(self, cut_edges = None, face_mask = None):
+        '''
+        connected components of the face dual graph, faces joined across
+        every edge not in cut_edges.  Not cached, the cut changes
+
+        cut_edges - int array or list of edge indices, or a (n_edges,) bool mask
+        face_mask - (n_faces,) bool, only these faces are joined, through each other.
+                    the others are labelled -1
+        returns n_components, labels (n_faces,) int32
+        '''
+        ef_indptr, ef_indices = self.edge_faces()
+        entry_edge = np.repeat(np.arange(self.num_edges), np.diff(ef_indptr))
+        entry_face = ef_indices
+        if cut_edges is not None:
+            cut_edges = np.asarray(cut_edges)
+            if cut_edges.dtype == bool:
+                cut = cut_edges
+            else:
+                cut = np.zeros(self.num_edges, dtype=bool)
+                cut[cut_edges.astype(np.int64)] = True
+            keep = ~cut[entry_edge]
+            entry_edge, entry_face = entry_edge[keep], entry_face[keep]
+        if face_mask is not None:
+            keep = face_mask[entry_face]
+            entry_edge, entry_face = entry_edge[keep], entry_face[keep]
+
+        #join every face of an edge to the first face left on that edge
+        starts = np.ones(len(entry_edge), dtype=bool)
+        starts[1:] = entry_edge[1:] != entry_edge[:-1]
+        first = entry_face[np.maximum.accumulate(np.where(starts, np.arange(len(entry_edge)), 0))]
+        n, labels = connected_components(self.num_faces, first[~starts], entry_face[~starts])
+        if face_mask is None:
+            return n, labels
+        return relabel_masked(labels, face_mask)
+
+    def vert_components(self, vert_mask = None):
+        '''
+        connected components of the verts joined by edges, needs edge_verts
+
+        vert_mask - (n_verts,) bool, only these verts are joined, through each other.
+                    the others are labelled -1
+        returns n_components, labels (n_verts,) int32
+        '''
+        a, b = self.edge_verts[:, 0], self.edge_verts[:, 1]
+        if vert_mask is not None:
+            keep = vert_mask[a] & vert_mask[b]
+            a, b = a[keep], b[keep]
+        n, labels = connected_components(self.num_verts, a, b)
+        if vert_mask is None:
+            return n, labels
+        return relabel_masked(labels, vert_mask)
+
+    def label_boundaries(self, labels, manifold = False):
+        '''
+        the border edges of every label in one pass.  A label is a set of faces,
+        eg a patch, faces labelled -1 are in none
+
+        labels - (n_faces,) int array
+        manifold - only edges with exactly 2 faces, the mesh border is not a label border
+        returns edges, edge_labels, edge_faces
+            an edge between two labels is listed once for each label,
+            edge_faces[i] is the face labelled edge_labels[i] on edges[i]
+        '''
+        labels = np.asarray(labels)
+        ef_indptr, ef_indices = self.edge_faces()
+        counts = np.diff(ef_indptr)
+        entry_edge = np.repeat(np.arange(self.num_edges, dtype=np.int64), counts)
+        entry_label = labels[ef_indices].astype(np.int64)
+        keep = entry_label >= 0
+        if manifold:
+            keep &= counts[entry_edge] == 2
+        if not np.any(keep):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+
+        entry_edge, entry_label, entry_face = entry_edge[keep], entry_label[keep], ef_indices[keep]
+        key = entry_edge * (np.max(entry_label) + 1) + entry_label
+        _, first, n = np.unique(key, return_index = True, return_counts = True)
+        single = first[n == 1]
+        return entry_edge[single], entry_label[single], entry_face[single].astype(np.int64)
+
+    def label_boundary_loops(self, labels, manifold = False):
+        '''
+        the borders of every label as ordered edge loops, one pass for all labels.
+        A label with lakes or several islands has a loop for each.  Loops run
+        with the winding of the labelled faces.  With manifold = True borders
+        which reach the mesh border are open chains
+
+        returns dictionary
+            loop_indptr - CSR loop -> positions in loop_edges, loop_verts
+            loop_edges - edge indices in loop order
+            loop_verts - the vert each edge starts from
+            loop_labels - (n_loops,) the label each loop bounds
+            loop_closed - (n_loops,) bool
+        '''
+        edges, edge_labels, edge_faces = self.label_boundaries(labels, manifold = manifold)
+        n = len(edges)
+
+        #the slot of each border edge in its face gives its direction
+        slot_face = np.repeat(np.arange(self.num_faces, dtype=np.int64), np.diff(self.face_indptr))
+        slot_key = slot_face * self.num_edges + self.face_edges
+        slot_order = np.argsort(slot_key, kind='mergesort')
+        slots = slot_order[np.searchsorted(slot_key[slot_order], edge_faces * self.num_edges + edges)]
+        next_slots = slots + 1
+        wrap = next_slots == self.face_indptr[edge_faces + 1]
+        next_slots[wrap] = self.face_indptr[edge_faces[wrap]]
+        v_from = self.face_verts[slots].astype(np.int64)
+        v_to = self.face_verts[next_slots].astype(np.int64)
+
+        #the next edge starts where this one ends, on the same label
+        nxt = np.full(n, -1, dtype=np.int64)
+        if n:
+            from_key = edge_labels * self.num_verts + v_from
+            from_order = np.argsort(from_key, kind='mergesort')
+            to_key = edge_labels * self.num_verts + v_to
+            found = np.minimum(np.searchsorted(from_key[from_order], to_key), n - 1)
+            hit = from_key[from_order][found] == to_key
+            nxt[hit] = from_order[found[hit]]
+
+            #at a vert where a label touches itself there are several candidates,
+            #the right one is found by walking the fan of the label's faces around the vert
+            n_candidates = np.searchsorted(from_key[from_order], to_key, side = 'right') - found
+            pinched = np.flatnonzero(hit & (n_candidates > 1))
+            if len(pinched):
+                self._fan_next_boundary(labels, pinched, nxt, edges, edge_faces, edge_labels, slots, v_to)
+
+            #anything still claimed twice, eg around faces with flipped winding, first come first served
+            claimed = np.flatnonzero(nxt >= 0)
+            _, first_claim = np.unique(nxt[claimed], return_index = True)
+            twice = np.ones(len(claimed), dtype=bool)
+            twice[first_claim] = False
+            nxt[claimed[twice]] = -1
+
+        linked = np.flatnonzero(nxt >= 0)
+        n_loops, loop_of = connected_components(n, linked, nxt[linked])
+
+        #chains start at the edge nobody leads to, closed loops at their first edge
+        has_prev = np.zeros(n, dtype=bool)
+        has_prev[nxt[linked]] = True
+        head = np.full(n_loops, -1, dtype=np.int64)
+        _, first_in_loop = np.unique(loop_of, return_index = True)
+        head[loop_of[first_in_loop]] = first_in_loop
+        open_heads = np.flatnonzero(~has_prev)
+        head[loop_of[open_heads]] = open_heads
+        loop_closed = np.ones(n_loops, dtype=bool)
+        loop_closed[loop_of[open_heads]] = False
+        closing = np.flatnonzero(nxt >= 0)
+        closing = closing[nxt[closing] == head[loop_of[closing]]]
+        nxt[closing] = -1
+
+        #list ranking by pointer jumping, distance of every edge to the end of its loop
+        succ = np.where(nxt >= 0, nxt, np.arange(n))
+        dist = (nxt >= 0).astype(np.int64)
+        while n and np.any(succ[succ] != succ):
+            dist = dist + dist[succ]
+            succ = succ[succ]
+        loop_len = np.bincount(loop_of, minlength = n_loops)
+        position = loop_len[loop_of] - 1 - dist
+        order = np.lexsort((position, loop_of))
+
+        loop_indptr = np.zeros(n_loops + 1, dtype=np.int64)
+        np.cumsum(loop_len, out=loop_indptr[1:])
+        return {'loop_indptr': loop_indptr,
+                'loop_edges': edges[order],
+                'loop_verts': v_from[order],
+                'loop_labels': edge_labels[head] if n_loops else np.zeros(0, dtype=np.int64),
+                'loop_closed': loop_closed}
+
+    def _fan_next_boundary(self, labels, pinched, nxt, edges, edge_faces, edge_labels, slots, v_to):
+        '''
+        for the border half edges in pinched, which end at a vert with more than one
+        border half edge of their label leaving it, sets nxt to the border half edge
+        reached by turning around the vert through faces of the same label.
+        Left alone when the winding of the fan is not consistent
+        '''
+        ef_indptr, ef_indices = self.edge_faces()
+        border_key = edge_faces * self.num_edges + edges
+        border_order = np.argsort(border_key, kind='mergesort')
+        sorted_border = border_key[border_order]
+        slot_key = np.repeat(np.arange(self.num_faces, dtype=np.int64), np.diff(self.face_indptr)) * self.num_edges + self.face_edges
+        slot_order = np.argsort(slot_key, kind='mergesort')
+        sorted_slots = slot_key[slot_order]
+
+        def next_slot(s, f):
+            s += 1
+            return self.face_indptr[f] if s == self.face_indptr[f + 1] else s
+
+        for i in pinched.tolist():
+            f, s, label, v = int(edge_faces[i]), int(slots[i]), edge_labels[i], v_to[i]
+            for step in range(len(ef_indices)):
+                s = next_slot(s, f)
+                if self.face_verts[s] != v: break  #winding flips
+                e = int(self.face_edges[s])
+                key = f * self.num_edges + e
+                k = np.searchsorted(sorted_border, key)
+                if k < len(sorted_border) and sorted_border[k] == key:
+                    nxt[i] = border_order[k]
+                    break
+
+                #an inner edge of the label, go on in the face across it
+                across = [g for g in ef_indices[ef_indptr[e]:ef_indptr[e + 1]].tolist() if g != f and labels[g] == label]
+                if not len(across): break
+                f = across[0]
+                s = int(slot_order[np.searchsorted(sorted_slots, f * self.num_edges + e)])
+
+    def face_centers(self):
+        '''
+        (n_faces, 3) median of the face verts, cached
+        '''
+        if 'face_centers' not in self.cache:
+            counts = np.diff(self.face_indptr)
+            sums = np.add.reduceat(self.coords[self.face_verts], self.face_indptr[:-1], axis = 0)
+            self.cache['face_centers'] = sums/np.maximum(counts, 1)[:, None]
+        return self.cache['face_centers']
+
+    def tri_neighbors(self):
+        '''
+        (n_tris, 3) int32, the triangle across edge (tris[t,i], tris[t,(i+1)%3])
+        -1 on boundary and non manifold edges
+        '''
+        if 'tri_neighbors' in self.cache:
+            return self.cache['tri_neighbors']
+
+        a = self.tris.ravel()
+        b = self.tris[:, [1, 2, 0]].ravel()
+        key = np.minimum(a, b).astype(np.int64) * self.num_verts + np.maximum(a, b)
+        order = np.argsort(key, kind='mergesort')
+        skey = key[order]
+
+        neighbors = np.full(len(a), -1, dtype=np.int32)
+        if len(a) > 1:
+            #manifold edges are keys which show up exactly twice
+            same = skey[1:] == skey[:-1]
+            prev_same = np.concatenate(([False], same[:-1]))
+            next_same = np.concatenate((same[1:], [False]))
+            first = np.flatnonzero(same & ~prev_same & ~next_same)
+            h0, h1 = order[first], order[first + 1]
+            neighbors[h0] = h1 // 3
+            neighbors[h1] = h0 // 3
+
+        neighbors = neighbors.reshape(-1, 3)
+        self.cache['tri_neighbors'] = neighbors
+        return neighbors
+
+    def fan_triangulate(self):
+        '''
+        splits every face into (v0, vi, vi+1) triangles
+        returns tris, tri_face
+        '''
+        counts = np.diff(self.face_indptr)
+        n_tris = np.maximum(counts - 2, 0)
+        tri_face = np.repeat(np.arange(len(counts), dtype=np.int32), n_tris)
+
+        #position of each triangle within its face fan, starting at 1
+        first_tri = np.cumsum(n_tris) - n_tris
+        fan = np.arange(len(tri_face)) - np.repeat(first_tri, n_tris) + 1
+
+        start = self.face_indptr[tri_face]
+        tris = np.empty((len(tri_face), 3), dtype=np.int32)
+        tris[:, 0] = self.face_verts[start]
+        tris[:, 1] = self.face_verts[start + fan]
+        tris[:, 2] = self.face_verts[start + fan + 1]
+        return tris, tri_face
+
+
+#a few snapshots are kept so that re-entering a tool on the same
+#BMesh does not pay for extraction again.  Entries are
+#[bme, generation, generation of the arrays, signature, arrays]
+_bmesh_arrays = []
+_max_cached = 4
+
+def _find_entry(bme):
+    for entry in _bmesh_arrays:
+        if entry[0] is bme:
+            return entry
+    return None
+
+def bump_mesh_generation(bme):
+    '''
+    call after editing bme, the next mesh_arrays_for_bmesh(bme) extracts
+    again even if the element counts came out the same
+    '''
+    entry = _find_entry(bme)
+    if entry != None:
+        entry[1] += 1
+
+def mesh_arrays_for_bmesh(bme, rebuild = False, build = True):
+    '''
+    returns MeshArrays for bme, extracting them only once per BMesh
+
+    the snapshot is rebuilt after bump_mesh_generation(bme) or when the
+    element counts change.  Callers that move verts without changing
+    topology need to pass rebuild = True
+    build - if False, returns None instead of extracting a new snapshot
+    '''
+    signature = (len(bme.verts), len(bme.edges), len(bme.faces))
+    entry = _find_entry(bme)
+    if entry != None:
+        if entry[1] == entry[2] and entry[3] == signature and not rebuild:
+            return entry[4]
+        _bmesh_arrays.remove(entry)
+        generation = entry[1]
+    else:
+        generation = 0
+
+    if not build: return None
+
+    arrays = MeshArrays.from_bmesh(bme)
+    _bmesh_arrays.insert(0, [bme, generation, generation, signature, arrays])
+    del _bmesh_arrays[_max_cached:]
+    return arrays
+
+def adopt_mesh_arrays(bme, arrays):
+    '''
+    registers a snapshot taken from an identical BMesh (eg the one bme was
+    copied from) as the snapshot of bme, so it is not extracted again.
+    the arrays and derived tables are shared, only the bme reference differs
+    '''
+    arrays = copy.copy(arrays)
+    arrays.bme = bme
+    bme.verts.index_update()
+    bme.faces.index_update()
+
+    signature = (len(bme.verts), len(bme.edges), len(bme.faces))
+    entry = _find_entry(bme)
+    generation = 0
+    if entry != None:
+        _bmesh_arrays.remove(entry)
+        generation = entry[1]
+    _bmesh_arrays.insert(0, [bme, generation, generation, signature, arrays])
+    del _bmesh_arrays[_max_cached:]
+    return arrays
+
+def clear_mesh_arrays():
+    '''
+    drops every snapshot and the BMesh references they hold, called when an
+    operator ends.  MeshCacheEntry keeps its own arrays, so the next run on
+    an unchanged mesh adopts them again
+    '''
+    del _bmesh_arrays[:]
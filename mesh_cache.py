@@ -0,0 +1,141 @@
+'''
+Per object cache of the data every cut operator builds on entry
+
+NetworkUIContext, PolyGeodesicPath, Slice and GeoPath all start by making a
+BMesh from the object, a BVH, the non manifold edge loops and a KD tree of the
+boundary.  That is only redone when common.hasher.hash_object says the mesh,
+its modifiers or its transform changed, or the object was given another Mesh
+datablock, so re-entering an operator on an unchanged mesh is nearly free.
+Entries live across operator runs, _max_entries bounds them and
+clear_mesh_cache frees them on unregister.
+
+The cached BMesh is never handed out, callers get their own copy to edit.
+'''
+#python imports
+import time
+from collections import OrderedDict
+
+#blender imports
+import bmesh
+from mathutils import kdtree
+from mathutils.bvhtree import BVHTree
+
+#Cut Mesh imports
+from .bmesh_fns import edge_loops_from_bmedges_linear, ensure_lookup
+from .common.hasher import hash_object
+from .mesh_arrays import MeshArrays, adopt_mesh_arrays, clear_mesh_arrays, mesh_arrays_for_bmesh
+
+
+class MeshCacheEntry(object):
+    '''
+    bme - pristine BMesh of the object, do not edit, see new_bmesh
+    bvh - BVHTree.FromBMesh(bme)
+    non_man_eds - indices of the non manifold edges
+    non_man_ed_loops - edge_loops_from_bmedges_linear of non_man_eds, lists of vert indices
+    non_man_bmverts - vert indices of all the loops
+    non_man_points - world locations of non_man_bmverts
+    kd - KDTree of non_man_points or None
+    arrays - mesh_arrays.MeshArrays, made the first time they are asked for
+    '''
+    def __init__(self, key, ob, bme):
+        start = time.time()
+        self.key = key
+        self.bme = bme
+        ensure_lookup(self.bme)
+        self.signature = (len(bme.verts), len(bme.edges), len(bme.faces))
+
+        self.bvh = BVHTree.FromBMesh(self.bme)
+
+        mx = ob.matrix_world
+        self.non_man_eds = [ed.index for ed in self.bme.edges if not ed.is_manifold]
+        self.non_man_ed_loops = edge_loops_from_bmedges_linear(self.bme, self.non_man_eds)['VERTS']
+        self.non_man_bmverts = []
+        self.non_man_points = []
+        for loop in self.non_man_ed_loops:
+            self.non_man_points += [mx * self.bme.verts[ind].co for ind in loop]
+            self.non_man_bmverts += [ind for ind in loop]
+
+        if len(self.non_man_points):
+            self.kd = kdtree.KDTree(len(self.non_man_points))
+            for i, v in enumerate(self.non_man_points):
+                self.kd.insert(v, i)
+            self.kd.balance()
+        else:
+            self.kd = None
+
+        self.arrays = None
+        print('built mesh cache in %f seconds' % (time.time() - start))
+
+    def new_bmesh(self):
+        '''
+        a copy of the cached BMesh for the caller to edit
+        '''
+        bme = self.bme.copy()
+        ensure_lookup(bme)
+        return bme
+
+    def mesh_arrays(self, bme):
+        '''
+        MeshArrays of the cached mesh, registered for bme so that
+        mesh_arrays_for_bmesh(bme) finds them without extracting again.
+        Once bme has been cut its own snapshot is used instead
+        '''
+        if (len(bme.verts), len(bme.edges), len(bme.faces)) != self.signature:
+            return mesh_arrays_for_bmesh(bme)
+        if self.arrays == None:
+            self.arrays = MeshArrays.from_bmesh(self.bme)
+        return adopt_mesh_arrays(bme, self.arrays)
+
+
+#a few objects are kept, eg the cut object and a couple of others
+#keyed by (object name, triangulate) so the triangulated GeoPath mesh and
+#the plain one do not evict each other
+_entries = OrderedDict()
+_max_entries = 4
+
+def object_mesh_cache(ob, triangulate = False):
+    '''
+    ob - mesh object
+    triangulate - cache the mesh with every face triangulated (GeoPath)
+
+    return - bme, entry
+        bme - a new BMesh of ob.data for the caller to edit
+        entry - MeshCacheEntry matching bme before any edits
+    '''
+    #the pointer catches ob.data swapped for another mesh with equal content
+    key = (hash_object(ob), ob.data.as_pointer())
+    name = (ob.name, triangulate)
+
+    entry = _entries.get(name)
+    if entry != None and entry.key == key:
+        print('reusing cached BVH and boundary data for %s' % ob.name)
+        _entries.move_to_end(name)
+        return entry.new_bmesh(), entry
+
+    if entry != None:
+        entry.bme.free()
+        del _entries[name]
+
+    bme = bmesh.new()
+    bme.from_mesh(ob.data)
+    if triangulate:
+        non_tris = [f for f in bme.faces if len(f.verts) > 3]
+        bmesh.ops.triangulate(bme, faces = non_tris, quad_method = 0, ngon_method = 0)
+
+    entry = MeshCacheEntry(key, ob, bme)
+    _entries[name] = entry
+    while len(_entries) > _max_entries:
+        name, old = _entries.popitem(last = False)
+        old.bme.free()
+
+    return entry.new_bmesh(), entry
+
+def clear_mesh_cache():
+    '''
+    frees every cached BMesh and drops the MeshArrays snapshots,
+    called on unregister
+    '''
+    for entry in _entries.values():
+        entry.bme.free()
+    _entries.clear()
+    clear_mesh_arrays()
@@ -0,0 +1,140 @@
+'''
+Struct of arrays storage for sketched networks
+
+InputPoint and CurveNode used to carry three Vectors, a face index and a
+__dict__ each, and a dense sketch has tens of thousands of points.  Their
+numbers now live in rows of a NetworkArrays and the python objects are small
+handles holding a row, so drawing and snapping can read whole arrays.
+
+This module does not import bpy, bmesh or mathutils
+'''
+import numpy as np
+
+
+class NetworkArrays(object):
+    '''
+    growable point rows and edge rows between them, freed rows are reused
+
+    world, local - (capacity, 3) float64 locations
+    view - (capacity, 3) float64, nan when the point has no view direction
+    face_index - (capacity,) int32, -1 when the point has no face
+    point_alive - (capacity,) bool
+    edges - (edge capacity, 2) int32 point rows
+    edge_alive - (edge capacity,) bool
+    revision - bumped on every added or removed row, see touch
+    '''
+    def __init__(self, capacity = 64):
+        self.world = np.zeros((capacity, 3), dtype=np.float64)
+        self.local = np.zeros((capacity, 3), dtype=np.float64)
+        self.view = np.full((capacity, 3), np.nan, dtype=np.float64)
+        self.face_index = np.full(capacity, -1, dtype=np.int32)
+        self.point_alive = np.zeros(capacity, dtype=bool)
+        self.free_points = []
+        self.n_point_rows = 0  #rows ever handed out
+
+        self.edges = np.full((capacity, 2), -1, dtype=np.int32)
+        self.edge_alive = np.zeros(capacity, dtype=bool)
+        self.free_edges = []
+        self.n_edge_rows = 0
+        self.revision = 0
+
+    def num_points(self): return self.n_point_rows - len(self.free_points)
+    def num_edges(self): return self.n_edge_rows - len(self.free_edges)
+    num_points = property(num_points)
+    num_edges = property(num_edges)
+
+    def touch(self):
+        '''
+        marks a change the rows do not see, eg a segment unlinked from its points
+        '''
+        self.revision += 1
+
+    def _grow_points(self):
+        n = 2 * len(self.world)
+        for name, fill in (('world', 0), ('local', 0), ('view', np.nan), ('face_index', -1), ('point_alive', False)):
+            old = getattr(self, name)
+            new = np.full((n,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _grow_edges(self):
+        n = 2 * len(self.edges)
+        for name, fill in (('edges', -1), ('edge_alive', False)):
+            old = getattr(self, name)
+            new = np.full((n,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add_point(self, world, local, view, face_index):
+        '''
+        world, local, view - 3 sequences, view may be None
+        face_index - int or None
+        returns the row of the new point
+        '''
+        if len(self.free_points):
+            row = self.free_points.pop()
+        else:
+            if self.n_point_rows == len(self.world):
+                self._grow_points()
+            row = self.n_point_rows
+            self.n_point_rows += 1
+
+        self.world[row] = tuple(world)
+        self.local[row] = tuple(local)
+        self.view[row] = np.nan if view is None else tuple(view)
+        self.face_index[row] = -1 if face_index is None else face_index
+        self.point_alive[row] = True
+        self.revision += 1
+        return row
+
+    def remove_point(self, row):
+        if not self.point_alive[row]: return
+        self.point_alive[row] = False
+        self.view[row] = np.nan
+        self.face_index[row] = -1
+        self.free_points.append(row)
+        self.revision += 1
+
+    def add_edge(self, row0, row1):
+        '''
+        returns the row of a new edge between point rows row0 and row1
+        '''
+        if len(self.free_edges):
+            row = self.free_edges.pop()
+        else:
+            if self.n_edge_rows == len(self.edges):
+                self._grow_edges()
+            row = self.n_edge_rows
+            self.n_edge_rows += 1
+
+        self.edges[row] = (row0, row1)
+        self.edge_alive[row] = True
+        self.revision += 1
+        return row
+
+    def remove_edge(self, row):
+        if not self.edge_alive[row]: return
+        self.edge_alive[row] = False
+        self.edges[row] = -1
+        self.free_edges.append(row)
+        self.revision += 1
+
+    def edge_positions(self, point_rows, edge_rows):
+        '''
+        the edges as positions into point_rows instead of point rows, eg to
+        index world[point_rows].  -1 where an edge point is not in point_rows
+        '''
+        position = np.full(self.n_point_rows, -1, dtype=np.int64)
+        position[point_rows] = np.arange(len(point_rows))
+        return position[self.edges[edge_rows]]
+
+    def nearest_point(self, point_rows, loc):
+        '''
+        point_rows - int array, the candidate points
+        loc - 3 sequence, world location
+        returns position in point_rows of the closest point and its distance, None, None if there are no candidates
+        '''
+        if len(point_rows) == 0: return None, None
+        d2 = np.sum((self.world[point_rows] - tuple(loc))**2, axis = 1)
+        i = int(np.argmin(d2))
+        return i, float(np.sqrt(d2[i]))
@@ -14,7 +14,8 @@ from bpy_extras import view3d_utils
 
 from ..bmesh_fns import grow_selection_to_find_face, flood_selection_faces
 from ..cut_algorithms import cross_section_2seeds_ver1, path_between_2_points
-from ..geodesic import geodesic_walk, continue_geodesic_walk, gradient_descent
+from ..geodesic import GeoPath as GeodesicWalker
+from ..mesh_cache import object_mesh_cache
 from .. import common_drawing
 from ..common.blender import bversion
 
@@ -23,19 +24,15 @@ class GeoPath(object):
     A class which manages user placed points on an object to create a
     piecewise path of geodesics, adapted to the objects surface.
     '''
-    def __init__(self,context, cut_object):   
+    def __init__(self,context, cut_object, geodesic_engine = 'ARRAY'):   
         
         self.cut_ob = cut_object
-        self.bme = bmesh.new()
-        self.bme.from_mesh(cut_object.data)
-        self.bme.verts.ensure_lookup_table()
-        self.bme.edges.ensure_lookup_table()
-        self.bme.faces.ensure_lookup_table()
+        #triangulated copy of the mesh and its BVH, only rebuilt when the mesh changed
+        self.bme, self.mesh_cache = object_mesh_cache(cut_object, triangulate = True)
+        self.bvh = self.mesh_cache.bvh
         
-        
-        non_tris = [f for f in self.bme.faces if len(f.verts) > 3]
-        bmesh.ops.triangulate(self.bme, faces = non_tris, quad_method = 0, ngon_method = 0)
-        self.bvh = BVHTree.FromBMesh(self.bme)
+        #walks and descends the field with the 'BMESH', 'ARRAY' or 'HEAT' engine
+        self.walker = GeodesicWalker(self.bme, self.bvh, cut_object.matrix_world, engine = geodesic_engine)
         
         
         self.seed = None
@@ -58,7 +55,30 @@ class GeoPath(object):
         self.target_loc = None
         self.geo_data = [dict(), set(), set(), set()]  #geos, fixed, close, far
         self.path = []
+        self.walker.reset_vars()
+        
+    def walk(self, restart):
+        '''
+        restart - walk a new field from the seed, otherwise the current one
+                  is continued until it reaches the target
+        updates self.geo_data and self.path
+        '''
+        walker = self.walker
+        walker.add_seed(self.seed, self.seed_loc)
+        walker.add_target(self.target, self.target_loc)
+        walker.geo_data = self.geo_data
+        
+        if restart:
+            walker.calculate_walk()
+        elif walker.found_target():
+            print('great we have already waked the geodesic this far')
+        else:
+            print('continue geo walk until we find it, then get it')
+            walker.continue_walk(100000)
         
+        walker.gradient_descend()
+        self.geo_data = walker.geo_data
+        self.path = walker.path
         
     def grab_initiate(self):
         if self.target != None :
@@ -92,25 +112,9 @@ class GeoPath(object):
                 return
         
         #check if first or end point and it's a non man edge!   
-        geos, fixed, close, far = self.geo_data
-        
         self.target = self.bme.faces[face_ind]
         self.target_loc = loc
-        
-        if all([v in fixed for v in self.target.verts]):
-            
-            path_elements, self.path = gradient_descent(self.bme, geos, 
-                                self.target, self.target_loc, epsilon = .0000001)
-            print('great we have already waked the geodesic this far')
-            
-        else:
-            print('continue geo walk until we find it, then get it')
-            continue_geodesic_walk(self.bme, self.seed, self.seed_loc, 
-                           geos, fixed, close, far,
-                           targets =[self.bme.faces[face_ind]], subset = None, max_iters = 100000, min_dist = None)
-            
-            path_elements, self.path = gradient_descent(self.bme, geos, 
-                                self.target, self.target_loc, epsilon = .0000001)
+        self.walk(restart = False)
             
         
         
@@ -182,16 +186,7 @@ class GeoPath(object):
                          
         self.target = self.bme.faces[face_ind]
         self.target_loc = loc
-        
-        
-        geos, fixed, close, far = geodesic_walk(self.bme, self.seed, self.seed_loc, 
-                                                targets = [self.target], subset = None, max_iters = 100000,
-                                                min_dist = None)
-        
-        path_elements, self.path  = gradient_descent(self.bme, geos, 
-                                self.target, self.target_loc, epsilon = .0000001)
-        
-        self.geo_data = [geos, fixed, close, far]
+        self.walk(restart = True)
         return
                 
     def draw(self,context):
@@ -4,6 +4,7 @@ Created on Oct 8, 2015
 @author: Patrick
 '''
 from ..modaloperator import ModalOperator
+from ..mesh_arrays import clear_mesh_arrays
 from .geopath_ui           import GeoPath_UI
 from .geopath_ui_modalwait  import GeoPath_UI_ModalWait
 from .geopath_ui_draw       import GeoPath_UI_Draw
@@ -48,6 +49,7 @@ class CGC_Geopath(ModalOperator, GeoPath_UI, GeoPath_UI_ModalWait, GeoPath_UI_Dr
     def end(self, context):
         ''' Called when tool is ending modal '''
         self.end_ui(context)
+        clear_mesh_arrays()  #the edited BMesh is freed, the object cache is kept for next time
     
     def end_commit(self, context):
         ''' Called when tool is committing '''
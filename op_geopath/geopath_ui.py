@@ -11,6 +11,7 @@ from mathutils import Matrix, Vector
 
 from .geopath_datastructure import GeoPath
 from .cache import geopath_undo_cache
+from ..common.utils import get_settings
 
 class GeoPath_UI:
     
@@ -25,7 +26,7 @@ class GeoPath_UI:
         self.sketch_curpos   = (0, 0)
         self.sketch          = []
         
-        self.geopath = GeoPath(context,context.object)
+        self.geopath = GeoPath(context,context.object, geodesic_engine = get_settings().geodesic_engine)
         context.window.cursor_modal_set('CROSSHAIR')
         context.area.header_text_set('Geodesic Path on Mesh')
         
@@ -14,7 +14,10 @@ from bpy_extras import view3d_utils
 
 from ..bmesh_fns import grow_selection_to_find_face, flood_selection_faces, edge_loops_from_bmedges_old, flood_selection_by_verts, flood_selection_edge_loop
 from ..cut_algorithms import cross_section_2seeds_ver1, path_between_2_points
-from ..geodesic import geodesic_walk, continue_geodesic_walk, gradient_descent
+from ..geodesic import geodesic_walk, continue_geodesic_walk, gradient_descent, geodesic_paths_batch
+from ..geodesic import GeodesicField, geodesic_walk_arrays, continue_geodesic_walk_arrays, heat_geodesic_walk, gradient_descent_arrays
+from ..geodesic_heat import HAS_SCIPY
+from ..mesh_cache import object_mesh_cache
 from .. import common_drawing
 from ..common.blender import bversion
 
@@ -24,13 +27,10 @@ class PolyGeodesicPath(object):
     A class which manages user placed points on an object to create a
     poly_line, adapted to the objects surface.
     '''
-    def __init__(self,context, cut_object, ui_type = 'DENSE_POLY'):   
+    def __init__(self,context, cut_object, ui_type = 'DENSE_POLY', geodesic_engine = 'ARRAY'):   
         self.cut_ob = cut_object
-        self.bme = bmesh.new()
-        self.bme.from_mesh(cut_object.data)
-        self.bme.verts.ensure_lookup_table()
-        self.bme.edges.ensure_lookup_table()
-        self.bme.faces.ensure_lookup_table()
+        self.geodesic_engine = geodesic_engine  #'BMESH', 'ARRAY' or 'HEAT', see GeoPath
+        self.bme, self.mesh_cache = object_mesh_cache(cut_object)
         
         non_tris = [f for f in self.bme.faces if len(f.verts) > 3]
         #if len(non_tris):
@@ -39,7 +39,7 @@ class PolyGeodesicPath(object):
             #self.bme.edges.ensure_lookup_table()
             #self.bme.faces.ensure_lookup_table()
         
-        self.bvh = BVHTree.FromBMesh(self.bme)
+        self.bvh = self.mesh_cache.bvh
         
         self.cyclic = False
         self.start_edge = None
@@ -61,24 +61,13 @@ class PolyGeodesicPath(object):
         self.face_chain = set()  #all faces crossed by the cut curve. set of type BMFace
         
         
-        self.non_man_eds = [ed.index for ed in self.bme.edges if not ed.is_manifold]
-        self.non_man_ed_loops = edge_loops_from_bmedges_old(self.bme, self.non_man_eds)
+        self.non_man_eds = list(self.mesh_cache.non_man_eds)
+        self.non_man_ed_loops = [list(loop) for loop in self.mesh_cache.non_man_ed_loops]
         
         #print(self.non_man_ed_loops)
-        self.non_man_points = []
-        self.non_man_bmverts = []
-        for loop in self.non_man_ed_loops:
-            self.non_man_points += [self.cut_ob.matrix_world * self.bme.verts[ind].co for ind in loop]
-            self.non_man_bmverts += [self.bme.verts[ind].index for ind in loop]
-        if len(self.non_man_points):  
-            kd = kdtree.KDTree(len(self.non_man_points))
-            for i, v in enumerate(self.non_man_points):
-                kd.insert(v, i)
-                
-            kd.balance()            
-            self.kd = kd
-        else:
-            self.kd = None
+        self.non_man_points = list(self.mesh_cache.non_man_points)
+        self.non_man_bmverts = list(self.mesh_cache.non_man_bmverts)
+        self.kd = self.mesh_cache.kd
             
         
         if ui_type not in {'SPARSE_POLY','DENSE_POLY', 'BEZIER'}:
@@ -779,6 +768,11 @@ class PolyGeodesicPath(object):
         #print('there are %i cut points' % len(self.cut_pts))
         #print('there are %i face changes' % len(self.face_changes))
 
+        #every other cut point seeds the segments on both of its sides
+        #so the loop needs half as many marches, see geodesic_paths_batch
+        jobs = []
+        seeded_at_end = []
+        new_geos = []
         for m, ind in enumerate(self.face_changes):
 
             
@@ -809,15 +803,31 @@ class PolyGeodesicPath(object):
             p0 = self.cut_pts[ind]
             p1 = self.cut_pts[n_p1]
             
-            geo = GeoPath(self.bme, self.bvh, self.cut_ob.matrix_world)
+            geo = GeoPath(self.bme, self.bvh, self.cut_ob.matrix_world, engine = self.geodesic_engine)
             geo.seed = f0
             geo.seed_loc = p0
             geo.target = f1
             geo.target_loc = p1
             
-            geo.calculate_walk()
+            if n_p1 % 2 == 0:
+                jobs += [(f1, p1, f0, p0)]
+                seeded_at_end += [True]
+            else:
+                jobs += [(f0, p0, f1, p1)]
+                seeded_at_end += [False]
             
-            self.geo_segments += [geo]
+            new_geos += [geo]
+        
+        for geo, (geo_data, path), reverse in zip(new_geos, geodesic_paths_batch(self.bme, jobs, engine = self.geodesic_engine), seeded_at_end):
+            if reverse:
+                #the field was marched from the far end, seed the GeoPath there
+                #so geo_data and path match it when the segment is grabbed
+                geo.seed, geo.target = geo.target, geo.seed
+                geo.seed_loc, geo.target_loc = geo.target_loc, geo.seed_loc
+            geo.geo_data = list(geo_data)
+            geo.path = path
+        
+        self.geo_segments += new_geos
                 
             
     
@@ -839,7 +849,6 @@ class PolyGeodesicPath(object):
         
         #print('there are %i cut points' % len(self.cut_pts))
         #print('there are %i face changes' % len(self.face_changes))
-
         for m, ind in enumerate(self.face_changes):
 
             #print('m, IND')
@@ -1821,11 +1830,20 @@ class GeoPath(object):
     A class which manages user placed points on an object to create a
     piecewise path of geodesics, adapted to the objects surface.
     '''
-    def __init__(self, bme, bvh, mx):   
-        
+    def __init__(self, bme, bvh, mx, engine = 'BMESH'):   
+        '''
+        engine - 'BMESH' marches with geodesic_walk on the BMesh
+                 'ARRAY' marches with geodesic_walk_arrays, see GeodesicField
+                 'HEAT' solves with the heat method, see heat_geodesic_walk.  needs scipy,
+                 falls back to 'ARRAY' without it
+        '''
         self.bme = bme
         self.bvh = bvh
         self.mx = mx
+        if engine == 'HEAT' and not HAS_SCIPY:
+            print('scipy is not available for the heat method, using fast marching')
+            engine = 'ARRAY'
+        self.engine = engine
         
         self.seed = None  #BMFace
         self.seed_loc = None #Vector in local coordinates
@@ -1887,19 +1905,12 @@ class GeoPath(object):
         self.target_loc = loc
         
         if all([v in fixed for v in self.target.verts]):
-            
-            path_elements, self.path = gradient_descent(self.bme, geos, 
-                                self.target, self.target_loc, epsilon = .0000001)
             print('great we have already waked the geodesic this far')
-            
         else:
             print('continue geo walk until we find it, then get it')
-            continue_geodesic_walk(self.bme, self.seed, self.seed_loc, 
-                           geos, fixed, close, far,
-                           targets =[self.bme.faces[face_ind]], subset = None, max_iters = 100000, min_dist = None)
+            self.continue_walk()
             
-            path_elements, self.path = gradient_descent(self.bme, geos, 
-                                self.target, self.target_loc, epsilon = .0000001)
+        self.gradient_descend()
                    
     def grab_cancel(self):
         self.target_loc = self.grab_undo_loc
@@ -1968,29 +1979,49 @@ class GeoPath(object):
         self.target = self.bme.faces[face_ind]
         self.target_loc = loc
         
-        
-        geos, fixed, close, far = geodesic_walk(self.bme, self.seed, self.seed_loc, 
-                                                targets = [self.target], subset = None, max_iters = 100000,
-                                                min_dist = None)
-        
-        path_elements, self.path  = gradient_descent(self.bme, geos, 
-                                self.target, self.target_loc, epsilon = .0000001)
-        
-        self.geo_data = [geos, fixed, close, far]
+        self.calculate_walk()
         return
                 
     def calculate_walk(self):
-        
-        geos, fixed, close, far = geodesic_walk(self.bme, self.seed, self.seed_loc, 
+        '''
+        walks the field from the seed with self.engine and descends from the target
+        '''
+        if self.engine == 'HEAT':
+            self.geo_data = list(heat_geodesic_walk(self.bme, self.seed, self.seed_loc))
+        elif self.engine == 'ARRAY':
+            self.geo_data = list(geodesic_walk_arrays(self.bme, self.seed, self.seed_loc,
+                                                      targets = [self.target], max_iters = 100000))
+        else:
+            self.geo_data = list(geodesic_walk(self.bme, self.seed, self.seed_loc, 
                                                 targets = [self.target], subset = None, max_iters = 100000,
-                                                min_dist = None)
-        
-        path_elements, self.path  = gradient_descent(self.bme, geos, 
-                                self.target, self.target_loc, epsilon = .0000001)
-        
-        self.geo_data = [geos, fixed, close, far]
+                                                min_dist = None))
         
+        self.gradient_descend()
         return
+    
+    def continue_walk(self):
+        '''
+        extends the field until the target is reached, geo_data may be a
+        GeodesicField from geodesic_paths_batch whatever the engine is
+        '''
+        geos, fixed, close, far = self.geo_data
+        if isinstance(geos, GeodesicField):
+            #a heat field already reaches every vert, this returns at once
+            continue_geodesic_walk_arrays(geos, targets = [self.target], max_iters = 100000)
+        else:
+            continue_geodesic_walk(self.bme, self.seed, self.seed_loc, 
+                           geos, fixed, close, far,
+                           targets =[self.target], subset = None, max_iters = 100000, min_dist = None)
+    
+    def gradient_descend(self):
+        geos, fixed, close, far = self.geo_data
+        if isinstance(geos, GeodesicField):
+            path_tris, self.path = gradient_descent_arrays(self.bme, geos,
+                                self.target, self.target_loc, grads = geos.face_gradients())
+            return
+        
+        path_elements, self.path = gradient_descent(self.bme, geos, 
+                                self.target, self.target_loc, epsilon = .0000001)
         
     
     def draw(self,context):
@@ -4,6 +4,7 @@ Created on Oct 8, 2015
 @author: Patrick
 '''
 from ..modaloperator import ModalOperator
+from ..mesh_arrays import clear_mesh_arrays
 from .p_geopath_ui           import PGeopath_UI
 from .p_geopath_ui_modalwait  import PGeopath_UI_ModalWait
 from .p_geopath_ui_draw       import PGeopath_UI_Draw
@@ -54,6 +55,7 @@ class CutMesh_PGeopath(ModalOperator, PGeopath_UI, PGeopath_UI_ModalWait, PGeopa
     def end(self, context):
         ''' Called when tool is ending modal '''
         self.end_ui(context)
+        clear_mesh_arrays()  #the edited BMesh is freed, the object cache is kept for next time
     
     def end_commit(self, context):
         ''' Called when tool is committing '''
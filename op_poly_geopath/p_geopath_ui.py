@@ -11,6 +11,7 @@ from mathutils import Matrix, Vector
 
 from .p_geopath_datastructure import PolyGeodesicPath
 from .cache import p_geopath_undo_cache
+from ..common.utils import get_settings
 
 class PGeopath_UI:
     
@@ -25,7 +26,7 @@ class PGeopath_UI:
         self.sketch_curpos   = (0, 0)
         self.sketch          = []
         
-        self.knife = PolyGeodesicPath(context,context.object)
+        self.knife = PolyGeodesicPath(context,context.object, geodesic_engine = get_settings().geodesic_engine)
         context.window.cursor_modal_set('CROSSHAIR')
         context.area.header_text_set("Poly Trim.  Left click to place cut points on the mesh, then press 'C' to preview the cut")
         
@@ -3,4 +3,83 @@ Created on Oct 8, 2015
 
 @author: Patrick
 '''
-polytrim_undo_cache = []
\ No newline at end of file
+import threading
+from collections import OrderedDict
+
+polytrim_undo_cache = []
+
+
+class CutResultCache(object):
+    '''
+    bounded LRU of precomputed segment cuts, so undo, re-inserting a point or
+    dragging a point back to where it was does not walk the mesh again
+
+    max_size - number of cuts kept
+    hits, misses - counters, see stats()
+
+    every accessor holds self.lock, so it is safe to share with
+    background workers
+    '''
+    def __init__(self, max_size = 256):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(f0, loc0, f1, loc1, cut_no, revision, digits = 6):
+        '''
+        f0, f1 - face indices of the segment end points
+        loc0, loc1 - local end point locations, rounded so a point dragged back
+                     to the same spot finds its old cut
+        cut_no - cut plane normal, compared by direction
+        revision - mesh revision, cuts of an older mesh never match
+        '''
+        no = cut_no.normalized()
+        return (f0, tuple(round(c, digits) for c in loc0),
+                f1, tuple(round(c, digits) for c in loc1),
+                tuple(round(c, 4) for c in no), revision)
+
+    def get(self, key, validate = None):
+        '''
+        returns the cached result or None
+        validate - optional function of the result, an entry it rejects is dropped and counts as a miss
+        '''
+        with self.lock:
+            result = self.entries.get(key)
+            if result != None and validate != None and not validate(result):
+                del self.entries[key]
+                result = None
+
+            if result == None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last = False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        '''
+        returns hits, misses, hit rate
+        '''
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return hits, misses, hits/total if total else 0.0
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
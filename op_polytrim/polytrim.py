@@ -14,6 +14,8 @@ from .polytrim_states        import Polytrim_States
 from .polytrim_ui_tools      import Polytrim_UI_Tools
 from .polytrim_ui_draw       import Polytrim_UI_Draw
 from .polytrim_datastructure import InputNetwork, NetworkCutter, SplineNetwork
+from ..mesh_arrays import clear_mesh_arrays
+from ..segment_pool import SegmentPool
 from ..common.utils import get_settings
 
 
@@ -85,6 +87,8 @@ class CutMesh_Polytrim(Polytrim_States, Polytrim_UI_Init, Polytrim_UI_Tools, Pol
         self.input_net = InputNetwork(self.net_ui_context)
         self.spline_net = SplineNetwork(self.net_ui_context)
         self.network_cutter = NetworkCutter(self.input_net, self.net_ui_context)
+        self.network_cutter.segment_backend = prefs.segment_precompute
+        self.network_cutter.segment_processes = prefs.segment_processes or SegmentPool.default_processes()
         self.sketcher = self.SketchManager(self.input_net, self.spline_net, self.net_ui_context, self.network_cutter)
         self.grabber = self.GrabManager(self.input_net, self.net_ui_context, self.network_cutter)
         self.brush = None
@@ -105,6 +109,8 @@ class CutMesh_Polytrim(Polytrim_States, Polytrim_UI_Init, Polytrim_UI_Tools, Pol
         ''' Called when tool is ending modal '''
         self.header_text_set()
         self.cursor_modal_restore()
+        self.network_cutter.close_segment_pool()
+        clear_mesh_arrays()  #the edited BMesh is freed, the object cache is kept for next time
 
     def update(self):
-        pass
\ No newline at end of file
+        self.network_cutter.collect_segment_results()
\ No newline at end of file
@@ -18,6 +18,7 @@ import random
 import bpy
 import bmesh
 import bgl
+import numpy as np
 
 from collections import defaultdict
 from mathutils import Vector, Matrix, Color, kdtree
@@ -26,8 +27,12 @@ from mathutils.geometry import intersect_point_line, intersect_line_plane
 from bpy_extras import view3d_utils
 
 from ..bmesh_fns import grow_selection_to_find_face, flood_selection_faces, edge_loops_from_bmedges_old, edge_loops_from_bmedges, flood_selection_by_verts, flood_selection_edge_loop, ensure_lookup
-from ..bmesh_fns import face_region_boundary_loops, bmesh_loose_parts_faces
 from ..cut_algorithms import cross_section_2seeds_ver1, path_between_2_points, path_between_2_points_clean, find_bmedges_crossing_plane
+from ..mesh_arrays import bump_mesh_generation, mesh_arrays_for_bmesh, csr_from_pairs
+from ..network_arrays import NetworkArrays
+from ..loop_colors import LoopColorBuffer
+from ..segment_pool import SegmentPool
+from .cache import CutResultCache
 from ..geodesic import GeoPath, geodesic_walk, continue_geodesic_walk, gradient_descent
 from .. import common_drawing
 from ..common.rays import get_view_ray_data, ray_cast
@@ -39,7 +44,6 @@ from ..common.shaders import circleShader
 from ..common.simplify import simplify_RDP, relax_vert_chain
 from ..common.profiler import profiler
 
-from concurrent.futures.thread import ThreadPoolExecutor
 
 #helper function to split a face
 def split_face_by_verts(bme, f, ed_enter, ed_exit, bmvert_chain):
@@ -53,6 +57,21 @@ def split_face_by_verts(bme, f, ed_enter, ed_exit, bmvert_chain):
     
     returns f1 and f2 the newly split faces
     '''
+    verts1, verts2 = split_face_vert_lists(f, ed_enter, ed_exit, bmvert_chain)
+    if verts1 == None: return None, None
+    
+    f1 = bme.faces.new(verts1)
+    f2 = bme.faces.new(verts2)
+    return f1, f2
+
+def split_face_vert_lists(f, ed_enter, ed_exit, bmvert_chain):
+    '''
+    the vertex lists of the two faces split_face_by_verts would make, without
+    editing the BMesh.  Lets a whole network of splits be gathered first
+    and committed at once, see NetworkCutter.knife_geometry_bulk
+    
+    returns verts1, verts2 lists of BMVerts, None, None if f can not be split
+    '''
 
     if ed_enter not in f.edges:
         print('ed_enter not in f.edges')
@@ -134,14 +153,9 @@ def split_face_by_verts(bme, f, ed_enter, ed_exit, bmvert_chain):
             print(f, ed_enter, ed_exit)
             return None, None
         if d0 < d1:
-            f1 = bme.faces.new(verts + bmvert_chain)
-            f2 = bme.faces.new(bmvert_chain[::-1])
-            
+            return verts + bmvert_chain, bmvert_chain[::-1]
         else:
-            f1 = bme.faces.new(verts + bmvert_chain[::-1])
-            f2 = bme.faces.new(bmvert_chain)
-        
-        return f1, f2
+            return verts + bmvert_chain[::-1], bmvert_chain
     else:
         iters = 0
         verts = []  #the link_loop.vert will be behind the intersection so we don't need to include it
@@ -169,10 +183,7 @@ def split_face_by_verts(bme, f, ed_enter, ed_exit, bmvert_chain):
             print(f, ed_enter, ed_exit)
             return None, None
         
-        
-        f1 = bme.faces.new(f1verts)
-        f2 = bme.faces.new(verts + bmvert_chain)
-        return f1, f2
+        return f1verts, verts + bmvert_chain
     
 
 class BMFacePatch(object):
@@ -180,15 +191,17 @@ class BMFacePatch(object):
     Data Structure for managing patches on BMeshes meant to help
     in segmentation of surface patches
     '''
-    def __init__(self, bmface, local_loc, world_loc, vcol_layer, color = (1.0, .7, 0)):
+    def __init__(self, bmface, local_loc, world_loc, vcol_layer, color = (1.0, .7, 0), colors = None):
         self.seed_face = bmface
         self.local_loc = local_loc
         self.world_loc = world_loc
         
         self.patch_faces = set()  #will find these
         self.boundary_edges = set() #set of BMEdges will be calculated
+        self.boundary_loops = []  #(n, 3) arrays of local vert locations, perimeter first then lakes
         self.color = Color(color)
         self.color_layer = vcol_layer
+        self.colors = colors  #LoopColorBuffer, when None colors are written into color_layer loop by loop
         
         #mapping to DiscreteNetwork
         self.input_net_segments = []
@@ -203,6 +216,7 @@ class BMFacePatch(object):
         self.bez_data = []
         
         self.paint_modified = False  #flag for when boundary needs to be updated when re-entering stroke modes
+        self.labels_dirty = False  #patch_faces changed behind NetworkCutter.face_label_array
         
     def set_color(self, color): 
         self.color = Color(color)
@@ -226,6 +240,7 @@ class BMFacePatch(object):
             self.un_color_patch()
         island = flood_selection_edge_loop(bme, boundary_edges, self.seed_face, max_iters = 10000)
         self.patch_faces = island
+        self.labels_dirty = True
         
     def grow_seed_faces(self, bme, boundary_faces):
         if len(self.patch_faces)  != 0:
@@ -233,6 +248,7 @@ class BMFacePatch(object):
         island = flood_selection_faces(bme, boundary_faces, self.seed_face)
         island -= boundary_faces  #because boundary_faces are between all segments
         self.patch_faces = island
+        self.labels_dirty = True
     
         self.boundary_edges.clear()  #no longer valid
         
@@ -267,6 +283,10 @@ class BMFacePatch(object):
             
     def color_patch(self, color_layer = None):
         
+        if color_layer == None and self.colors != None:
+            self.colors.set_face_colors([f.index for f in self.patch_faces], self.color)
+            return
+        
         if color_layer == None:
             color_layer = self.color_layer
             
@@ -276,6 +296,10 @@ class BMFacePatch(object):
 
     def un_color_patch(self, color_layer = None):
         color = Color((1,1,1))
+        if color_layer == None and self.colors != None:
+            self.colors.set_face_colors([f.index for f in self.patch_faces if f.is_valid], color)
+            return
+        
         if color_layer == None:
             color_layer = self.color_layer
             
@@ -285,39 +309,56 @@ class BMFacePatch(object):
                 loop[color_layer] = color
                 
     def find_boundary_edges(self, bme):
-        #TODO refactor bmesh_fns to not use indices
-        #for now, only biggest patch
+        '''
+        finds boundary_edges, perimeter_path and boundary_loops
+        only the biggest island of the patch is kept
+        '''
         if len(self.patch_faces) == 0: return
         
-        islands = bmesh_loose_parts_faces(bme, self.patch_faces)
-        self.perimeter_path = []
-        self.boundary_edges.clear()
-        if len(islands) > 1:
-            mainland = max(islands, key = len)
-            geom = face_region_boundary_loops(bme, [f.idnex for f in mainland])
+        mesh = mesh_arrays_for_bmesh(bme)
+        labels = np.full(mesh.num_faces, -1, dtype=np.int32)
+        labels[[f.index for f in self.patch_faces]] = 0
+        outline_patches(bme, mesh, labels, [self])
+    
+    def set_boundary_loops(self, bme, mesh, loops, inds):
+        '''
+        takes the boundary of this patch from a MeshArrays.label_boundary_loops result
         
-            for island in islands:
-                if island == mainland: continue
-                self.patch_faces.difference_update(island)
-        else:
-            geom = face_region_boundary_loops(bme, [f.index for f in self.patch_faces])
+        loops - the dictionary
+        inds - the loops that belong to this patch
+        the longest closed loop is the perimeter, the others are lakes
+        '''
+        indptr = loops['loop_indptr']
+        inds = sorted(inds, key = lambda i: (not loops['loop_closed'][i], indptr[i] - indptr[i + 1]))
         
-        #TODO, face patch could have interior lakes
-        loop = geom['EDGES'][0]
-        for ind in loop:
-            self.boundary_edges.add(bme.edges[ind])
+        self.boundary_edges.clear()
+        self.boundary_loops = []
+        self.perimeter_path = []
+        for i in inds:
+            edge_inds = loops['loop_edges'][indptr[i]:indptr[i + 1]]
+            vert_inds = loops['loop_verts'][indptr[i]:indptr[i + 1]]
+            self.boundary_edges.update(bme.edges[j] for j in edge_inds.tolist())
+            self.boundary_loops += [mesh.coords[vert_inds]]
         
-        loop = geom['VERTS'][0]
-        for ind in loop:
-            self.perimeter_path += [bme.verts[ind].co.copy()]
-    
-    def find_all_boundary_edges(self):
+        if len(inds):
+            self.perimeter_path = [Vector(co) for co in self.boundary_loops[0].tolist()]
+            
+    def find_all_boundary_edges(self, bme = None):
         '''
         this does not need loops, will find all MANIFOLD boundary edges
-        
+        bme - when given, the edges come from the MeshArrays of bme instead
+              of testing link_faces edge by edge
         '''
         if len(self.patch_faces) == 0: return set()
         
+        if bme != None:
+            mesh = mesh_arrays_for_bmesh(bme)
+            labels = np.full(mesh.num_faces, -1, dtype=np.int32)
+            labels[[f.index for f in self.patch_faces]] = 0
+            edges, _, _ = mesh.label_boundaries(labels, manifold = True)
+            bme.edges.ensure_lookup_table()
+            return set(bme.edges[i] for i in edges.tolist())
+        
         all_edges = set()
         for f in self.patch_faces:
             all_edges.update([ed for ed in f.edges])
@@ -332,16 +373,214 @@ class BMFacePatch(object):
         
         return keep_edges    
             
+
+def outline_patches(bme, mesh, labels, patches):
+    '''
+    boundary edges and loops of many patches from one pass over a face label array
+    
+    bme - the BMesh mesh was taken from
+    mesh - MeshArrays
+    labels - (n_faces,) int array, position of the face's patch in patches or -1.
+             faces of islands cut off from the biggest part of their patch are
+             set to -1 and removed from the patch
+    patches - BMFacePatches
+    '''
+    bme.verts.ensure_lookup_table()
+    bme.edges.ensure_lookup_table()
+    bme.faces.ensure_lookup_table()
+    
+    #islands, the components of the faces once every patch border is cut
+    border_edges, _, _ = mesh.label_boundaries(labels)
+    _, islands = mesh.face_components(border_edges)
+    inside = np.flatnonzero(labels >= 0)
+    if len(inside):
+        pair_key = labels[inside].astype(np.int64) * mesh.num_faces + islands[inside]
+        keys, counts = np.unique(pair_key, return_counts = True)
+        #biggest island of each label, the last of each label once sorted by count
+        order = np.lexsort((counts, keys // mesh.num_faces))
+        pair_label = keys[order] // mesh.num_faces
+        last = np.append(pair_label[1:] != pair_label[:-1], True)
+        mainland = np.full(len(patches), -1, dtype=np.int64)
+        mainland[pair_label[last]] = keys[order][last] % mesh.num_faces
+        
+        drop = inside[islands[inside] != mainland[labels[inside]]]
+        if len(drop):
+            print('removing %i island faces from patches' % len(drop))
+            for i in np.unique(labels[drop]).tolist():
+                patch_drop = drop[labels[drop] == i]
+                patches[i].patch_faces.difference_update(bme.faces[j] for j in patch_drop.tolist())
+            labels[drop] = -1
+    
+    loops = mesh.label_boundary_loops(labels)
+    loop_labels = loops['loop_labels']
+    order = np.argsort(loop_labels, kind='mergesort')
+    starts = np.searchsorted(loop_labels[order], np.arange(len(patches) + 1))
+    for i, patch in enumerate(patches):
+        patch.set_boundary_loops(bme, mesh, loops, order[starts[i]:starts[i + 1]].tolist())
+    
         
 #Input Net Topolocy Functons to help
 def next_segment(ip, current_seg): #TODO Code golf this
     if len(ip.link_segments) != 2: return None  #TODO, the the segment to right
     return [seg for seg in ip.link_segments if seg != current_seg][0]
 
+def network_cycles_and_chains(points):
+    '''
+    splits a network into cycles and chains, visiting every segment once
+    
+    points - InputPoints or CurveNodes, the segments are found through link_segments
+    
+    returns dictionary
+        ip_cycles, seg_cycles - closed loops and chains that run between points that
+                                are not endpoints, eg from mesh boundary to mesh boundary
+        ip_chains, seg_chains - chains that stop at an endpoint or a branch point
+        branch_points - points with more than 2 segments
+    a closed loop lists each point once and ends on the segment back to its first point
+    '''
+    ip_cycles, seg_cycles = [], []
+    ip_chains, seg_chains = [], []
+    branch_points = [p for p in points if len(p.link_segments) > 2]
+    visited = set()
+    
+    def walk(ip_start, seg):
+        '''
+        follows points with 2 segments from ip_start along seg
+        '''
+        node_chain = [ip_start]
+        seg_chain = [seg]
+        visited.add(seg)
+        current_ip = ip_start
+        while True:
+            next_ip = seg.other_point(current_ip)
+            if next_ip == ip_start: break  #closed loop
+            node_chain += [next_ip]
+            seg = next_segment(next_ip, seg)
+            if seg == None or seg in visited: break  #an endpoint or a branch point
+            visited.add(seg)
+            seg_chain += [seg]
+            current_ip = next_ip
+        return node_chain, seg_chain
+    
+    #chains start at points which are not in the middle of a chain
+    #edge points first, so a boundary to boundary cut starts on the boundary
+    ends = [p for p in points if len(p.link_segments) and len(p.link_segments) != 2]
+    ends.sort(key = lambda p: 0 if p.is_edgepoint() else 1)
+    for ip in ends:
+        for seg in ip.link_segments:
+            if seg in visited: continue
+            node_chain, seg_chain = walk(ip, seg)
+            open_ends = [p for p in (node_chain[0], node_chain[-1]) if p.is_endpoint or len(p.link_segments) > 2]
+            if len(open_ends):
+                ip_chains += [node_chain]
+                seg_chains += [seg_chain]
+            else:
+                ip_cycles += [node_chain]
+                seg_cycles += [seg_chain]
+    
+    #everything left is a loop of points with 2 segments each
+    for ip in points:
+        if len(ip.link_segments) != 2 or ip.link_segments[0] in visited: continue
+        node_chain, seg_chain = walk(ip, ip.link_segments[0])
+        ip_cycles += [node_chain]
+        seg_cycles += [seg_chain]
+    
+    return {'ip_cycles': ip_cycles, 'seg_cycles': seg_cycles,
+            'ip_chains': ip_chains, 'seg_chains': seg_chains,
+            'branch_points': branch_points}
+    
 #TODO def next_segment_to_right(ip, current_segment):
     #if len(ip.link_sgements) > 2:  find the winding
     #if len(ip.link_segments == 2: normal
     #if len(ip.link_segments_ == 1:  return None            
+class FaceAncestry(object):
+    '''
+    which original face every split face came from, and which faces an
+    original face has been split into so far.  Every face points straight
+    at its original face, so neither question drills through generations
+    
+    parent - {new BMFace: the BMFace it was split from}
+    children - {old BMFace: [new BMFaces]}
+    root - {BMFace: original BMFace}, path compressed
+    leaves - {original BMFace: set of the faces it is split into now}
+    '''
+    def __init__(self):
+        self.parent = {}
+        self.children = {}
+        self.root = {}
+        self.leaves = {}
+    
+    def is_original(self, f):
+        return f not in self.parent
+    
+    def was_split(self, f):
+        return f in self.children
+    
+    def original(self, f):
+        '''
+        the face of the uncut mesh that f was split from, f itself if it is original
+        '''
+        r = f
+        while r in self.root and self.root[r] != r:
+            r = self.root[r]
+        while f != r:  #compress the path
+            self.root[f], f = r, self.root[f]
+        return r
+    
+    def record_split(self, old_f, new_fs):
+        '''
+        old_f was split into new_fs, old_f is about to be removed from the BMesh
+        '''
+        r = self.original(old_f)
+        if r not in self.leaves:
+            self.leaves[r] = set([r])
+        self.leaves[r].discard(old_f)
+        self.leaves[r].update(new_fs)
+        
+        self.children[old_f] = list(new_fs)
+        for f in new_fs:
+            self.parent[f] = old_f
+            self.root[f] = r
+    
+    def newest_faces(self, f):
+        '''
+        the current faces that f has been split into, [] if f was never split
+        '''
+        if f not in self.children: return []
+        if f not in self.parent:
+            return list(self.leaves[f])
+        
+        #a face that was split again, only its own part of the tree
+        newest = []
+        stack = list(self.children[f])
+        while len(stack):
+            child = stack.pop()
+            if child in self.children:
+                stack += self.children[child]
+            else:
+                newest.append(child)
+        return newest
+    
+    def descendants(self, f):
+        '''
+        every face split off f, current or not, breadth first
+        '''
+        new_fs = []
+        child_fs = self.children.get(f, [])
+        while len(child_fs):
+            new_fs += child_fs
+            next_gen = []
+            for child in child_fs:
+                next_gen += self.children.get(child, [])
+            child_fs = next_gen
+        return new_fs
+    
+    def clear(self):
+        self.parent.clear()
+        self.children.clear()
+        self.root.clear()
+        self.leaves.clear()
+
+
 class NetworkCutter(object):
     ''' Manages cuts in the InputNetwork '''
 
@@ -350,9 +589,22 @@ class NetworkCutter(object):
         self.input_net = input_net
         self.net_ui_context = net_ui_context
 
-        #this is fancy "que" of things to be processed
-        self.executor = ThreadPoolExecutor()  
-        self.executor_tasks = {}
+        #background precompute, see segment_pool.  'PROCESSES' falls back to
+        #'THREADS' where SegmentPool.available() is False.  0 processes uses every core
+        self.segment_backend = 'PROCESSES'
+        self.segment_processes = 0
+        self.segment_pool = None
+        self.pool_tasks = {}  #seg: (MeshArrays the job was computed on, generation, AsyncResult)
+        self.pool_dirty = set()  #segments edited while their pool job was running
+        self.pool_keys = {}  #seg: cut_cache key of its pool job
+        
+        #every precompute job is stamped, only the latest job for a segment may store its result
+        self.generation = 0
+        self.seg_generations = {}
+        
+        #solved cuts by end points and plane, outlives the segments themselves
+        self.cut_cache = CutResultCache()
+        self.mesh_revision = 0  #bumped whenever the knife changes self.input_net.bme
         
         
         self.new_bmverts = set()
@@ -364,8 +616,9 @@ class NetworkCutter(object):
         self.completed_segments = set()
         
         self.original_indices_map = {}
-        self.new_to_old_face_map = {}
-        self.old_to_new_face_map = {}
+        self.face_ancestry = FaceAncestry()
+        self.new_to_old_face_map = self.face_ancestry.parent  #kept for reading, record splits with face_ancestry
+        self.old_to_new_face_map = self.face_ancestry.children
         self.completed_input_points = set()
         
         #have to store all these beacuse we are about to alter the bme
@@ -377,6 +630,16 @@ class NetworkCutter(object):
         #list of BMFacePatch 
         self.face_patches = []
         self.active_patch = None  #used when painting
+        
+        #int32 per face of input_net.bme, position of its patch in face_patches or -1, see face_label_array
+        self.face_labels = None
+        self.face_labels_key = None
+        #faces of the cut mesh grouped by connected component, see cut_face_components
+        self.components = None
+        self.components_key = None
+        
+        #patch and paint colors, written over the "patches" vertex colors, see to_mesh
+        self.patch_colors = LoopColorBuffer(self.input_net.bme)
             
         #this is used to create coars boudaries from the input segments
         self.boundary_faces = set()
@@ -399,9 +662,13 @@ class NetworkCutter(object):
     ###########################################
         
     def update_segments(self):
-        for seg in self.input_net.segments:
-            if seg.needs_calculation and not seg.calculation_complete:
-                self.precompute_cut(seg)
+        segs = [seg for seg in self.input_net.segments if seg.needs_calculation and not seg.calculation_complete]
+        if len(segs) > 1:
+            self.update_segments_pool(segs, block = True)
+            return
+        
+        for seg in segs:
+            self.precompute_cut(seg)
                 
         return
     
@@ -409,19 +676,158 @@ class NetworkCutter(object):
         
         self.validate_cdata()
         
-        for seg in self.input_net.segments:
-            
-            if seg.needs_calculation and not seg.calculation_complete:
-                seg.needs_calculation = False #this will prevent it from submitting it again before it's done
-                                
-                #TODO check for existing task
-                #TODO if still computing, cancel it
-                #start a new task
-                future = self.executor.submit(self.precompute_cut, (seg))
-                
-                self.executor_tasks[seg] = future  
+        segs = [seg for seg in self.input_net.segments if seg.needs_calculation and not seg.calculation_complete]
+        self.update_segments_pool(segs)
         return
     
+    def new_generation(self, seg):
+        '''
+        stamps a new job for seg, results of older jobs for seg will be dropped
+        '''
+        self.generation += 1
+        self.seg_generations[seg] = self.generation
+        return self.generation
+    
+    def is_current(self, seg, generation):
+        return self.seg_generations.get(seg) == generation
+    
+    def use_process_pool(self):
+        return self.segment_backend == 'PROCESSES' and SegmentPool.available()
+    
+    def update_segments_pool(self, segs, block = False):
+        '''
+        precomputes segs in the workers of self.segment_pool, processes where
+        use_process_pool() and threads walking the MeshArrays snapshot otherwise.
+        The BMesh is only read here and in collect_segment_results, on the main thread
+        block - wait for all of them, otherwise collect_segment_results picks them up
+        
+        A segment edited while its job is still running is not submitted again
+        right away, it goes in self.pool_dirty and is resubmitted with its latest
+        geometry when the running job comes back.  So rapid edits while dragging
+        coalesce and each segment has at most one job in the pool.
+        '''
+        bme = self.net_ui_context.bme
+        mesh = mesh_arrays_for_bmesh(bme)
+        if self.segment_pool == None or self.segment_pool.mesh is not mesh:
+            #the mesh was cut, the workers need the new snapshot
+            self.close_segment_pool()
+            self.segment_pool = SegmentPool(mesh, processes = self.segment_processes,
+                                            threads = not self.use_process_pool())
+        
+        jobs = []
+        for seg in segs:
+            seg.needs_calculation = False #this will prevent it from submitting it again before it's done
+            generation = self.new_generation(seg)
+            if seg.ip0.face_index == seg.ip1.face_index:
+                self.store_same_face_cut(seg)
+                continue
+            if not block and seg in self.pool_tasks:
+                self.pool_dirty.add(seg)
+                continue
+            cut_pt, cut_no = self.segment_cut_plane(seg)
+            cache_key = self.cut_cache_key(seg, cut_no)
+            if self.replay_cached_cut(seg, cache_key, generation):
+                continue
+            self.pool_keys[seg] = cache_key
+            jobs += [(seg, generation, (generation, seg.ip0.face_index, seg.ip0.local_loc[:], seg.ip1.face_index, seg.ip1.local_loc[:], cut_pt[:], cut_no[:]))]
+        
+        if block:
+            start = time.time()
+            try:
+                results = self.segment_pool.map([job for seg, generation, job in jobs])
+            except Exception as e:
+                print('segment workers failed, precomputing here')
+                print(e)
+                for seg, generation, job in jobs:
+                    self.precompute_cut(seg)
+                return
+            for (seg, generation, job), result in zip(jobs, results):
+                self.pool_dirty.discard(seg)
+                self.apply_segment_result(seg, result)
+            print('precomputed %i segments in %f seconds' % (len(jobs), time.time() - start))
+            return
+        
+        for seg, generation, job in jobs:
+            self.pool_tasks[seg] = (mesh, generation, self.segment_pool.submit(job))
+    
+    def collect_segment_results(self):
+        '''
+        maps finished process pool results back onto the BMesh, call from the main thread.
+        results of superseded jobs are dropped and their segments resubmitted
+        '''
+        if not self.pool_tasks: return
+        
+        mesh = mesh_arrays_for_bmesh(self.net_ui_context.bme, build = False)
+        resubmit = []
+        for seg in [seg for seg, task in self.pool_tasks.items() if task[2].ready()]:
+            task_mesh, generation, result = self.pool_tasks.pop(seg)
+            if seg not in self.input_net.segments:
+                self.pool_dirty.discard(seg)
+                continue
+            if seg in self.pool_dirty or task_mesh is not mesh:
+                #edited while computing, or computed before the mesh was cut
+                self.pool_dirty.discard(seg)
+                resubmit += [seg]
+                continue
+            if not self.is_current(seg, generation):
+                #a newer result was stored by precompute_cut in the mean time
+                continue
+            try:
+                result = result.get()
+            except Exception as e:
+                print('segment worker failed, precomputing here')
+                print(e)
+                self.precompute_cut(seg)
+                continue
+            self.apply_segment_result(seg, result)
+        
+        if len(resubmit):
+            print('resubmitting %i superseded segments' % len(resubmit))
+            self.update_segments_pool(resubmit)
+    
+    def apply_segment_result(self, seg, result):
+        '''
+        result - dictionary from segment_pool.precompute_segment
+        '''
+        bme = self.net_ui_context.bme
+        ensure_lookup(bme)
+        method = result['method']
+        cache_key = self.pool_keys.pop(seg, None)
+        
+        if method == 'SAME_FACE':
+            self.store_same_face_cut(seg)
+        
+        elif method == 'ADJACENT_FACE':
+            cross = result['verts'][0]
+            ed, cross = bme.edges[result['edges'][0]], Vector(cross) if cross != None else None
+            if cache_key != None:
+                self.cut_cache.put(cache_key, (method, ed, cross))
+            self.store_adjacent_cut(seg, ed, cross)
+        
+        else:
+            seg.cut_method = method
+            vs = [Vector(co) for co in result['verts']]
+            eds_crossed = [bme.edges[i] for i in result['edges']]
+            faces_crossed = [bme.faces[i] for i in result['faces']]
+            if cache_key != None:
+                self.cut_cache.put(cache_key, (method, vs, eds_crossed, faces_crossed))
+            self.store_path_cut(seg, vs, eds_crossed, faces_crossed)
+    
+    def close_segment_pool(self):
+        if self.segment_pool != None:
+            self.segment_pool.close()
+            self.segment_pool = None
+        self.pool_tasks = {}
+        self.pool_dirty = set()
+    
+    def mesh_changed(self):
+        '''
+        call after the knife edits self.input_net.bme, so the caches keyed on
+        mesh_revision and the MeshArrays snapshot of bme are made again
+        '''
+        self.mesh_revision += 1
+        bump_mesh_generation(self.input_net.bme)
+    
     def validate_cdata(self):
         old_cdata = []
         for seg, cdata in self.cut_data.items():
@@ -431,6 +837,11 @@ class NetworkCutter(object):
         print('deleting %i old seg cut data' % len(old_cdata))
         for seg in old_cdata:
             self.cut_data.pop(seg, None)
+        
+        #forget the generations of deleted segments
+        segments = set(self.input_net.segments)
+        for seg in [seg for seg in self.seg_generations if seg not in segments and seg not in self.pool_tasks]:
+            self.seg_generations.pop(seg)
                         
     def compute_cut_normal(self, seg):
         surf_no = self.net_ui_context.imx.to_3x3() * seg.ip0.view.lerp(seg.ip1.view, 0.5)  #must be a better way.
@@ -439,9 +850,35 @@ class NetworkCutter(object):
         cut_no = e_vec.cross(surf_no)
         
         return cut_no              
-    def precompute_cut(self, seg):
-
+    def segment_cut_plane(self, seg):
+        '''
+        returns cut_pt, cut_no, the local space plane segment seg is cut along
+        '''
+        if seg.ip1.view.dot(seg.ip0.view) < 0:
+            surf_no = self.net_ui_context.imx.to_3x3() * seg.ip0.view.lerp(-1 * seg.ip1.view, 0.5)
+        else:
+            surf_no = self.net_ui_context.imx.to_3x3() * seg.ip0.view.lerp(seg.ip1.view, 0.5)  #must be a better way.
+        
+        
+        e_vec = seg.ip1.local_loc - seg.ip0.local_loc  #edge vector
+        #define
+        cut_no = e_vec.cross(surf_no)
+        #cut_pt = .5*self.cut_pts[ind_p1] + 0.5*self.cut_pts[ind]
+        cut_pt = .5 * seg.ip0.local_loc + 0.5 * seg.ip1.local_loc
+        return cut_pt, cut_no
+    
+    def precompute_cut(self, seg, generation = None):
+        '''
+        generation - stamp from new_generation when run in the background, the
+                     results are dropped if the segment was edited since.  None
+                     starts a new generation, superseding any background job
+        '''
         print('precomputing cut!')
+        if generation == None:
+            generation = self.new_generation(seg)
+        elif not self.is_current(seg, generation):
+            print('segment was edited before this precompute started, skipping')
+            return
         #TODO  shuld only take bmesh, input faces and locations.  Should not take BVH or matrix as inputs
         self.face_chain = []
 
@@ -450,64 +887,39 @@ class NetworkCutter(object):
         f1 = self.net_ui_context.bme.faces[seg.ip1.face_index] #<<--- Next BMFace #TODO use actual BMFace reference
 
         if f0 == f1:
-            seg.path = [seg.ip0.world_loc, seg.ip1.world_loc]
-            seg.bad_segment = False  #perhaps a dict self.bad_segments[seg] = True
-            seg.needs_calculation = False
-            seg.calculation_complete = True
-            seg.cut_method = 'SAME_FACE'
+            if self.is_current(seg, generation):
+                self.store_same_face_cut(seg)
             return
 
         ###########################
         ## Define the cutting plane for this segment#
         ############################
 
+        cut_pt, cut_no = self.segment_cut_plane(seg)
         
-        if seg.ip1.view.dot(seg.ip0.view) < 0:
-            surf_no = self.net_ui_context.imx.to_3x3() * seg.ip0.view.lerp(-1 * seg.ip1.view, 0.5)
-        else:
-            surf_no = self.net_ui_context.imx.to_3x3() * seg.ip0.view.lerp(seg.ip1.view, 0.5)  #must be a better way.
-        
-        
-        e_vec = seg.ip1.local_loc - seg.ip0.local_loc  #edge vector
-        #define
-        cut_no = e_vec.cross(surf_no)
-        #cut_pt = .5*self.cut_pts[ind_p1] + 0.5*self.cut_pts[ind]
-        cut_pt = .5 * seg.ip0.local_loc + 0.5 * seg.ip1.local_loc
+        cache_key = self.cut_cache_key(seg, cut_no)
+        if self.replay_cached_cut(seg, cache_key, generation):
+            return
 
         #find the shared edge,, check for adjacent faces for this cut segment
         cross_ed = None
         for ed in f0.edges:
             if f1 in ed.link_faces:
                 print('this face is adjacent to the next face')
-                cut_data = {} 
-                cut_data['face_crosses'] = []
-                cut_data['face_set'] = set()
-                cut_data['edge_crosses'] = [ed]
                 cross = intersect_line_plane(ed.verts[0].co, ed.verts[1].co, cut_pt, cut_no)
-                cut_data['verts'] = [cross]
-                self.cut_data[seg] = cut_data
                 
-
                 #print(seg.ip0.local_loc, seg.ip1.local_loc)
                 print(seg.ip0.view, seg.ip1.view)
-                print(surf_no)
                 print(cut_no)
                 print(cross)
                 
                 print(f1.index, f0.index)
                 print(ed.index)
                 
-                
-                if cross == None:
-                    print('No CROSS PRODUCT')
-                    seg.path= [self.net_ui_context.mx * v for v in [seg.ip0.local_loc, seg.ip1.local_loc]]
-                else:    
-                    seg.path = [self.net_ui_context.mx * v for v in [seg.ip0.local_loc, cross, seg.ip1.local_loc]] #TODO
+                self.cut_cache.put(cache_key, ('ADJACENT_FACE', ed, cross))
+                if self.is_current(seg, generation):
+                    self.store_adjacent_cut(seg, ed, cross)
                 cross_ed = ed
-                seg.needs_calculation = False
-                seg.calculation_complete = True
-                seg.bad_segment = False
-                seg.cut_method = 'ADJACENT_FACE'
                 break
 
         #if no shared edge, need to cut across to the next face
@@ -559,7 +971,7 @@ class NetworkCutter(object):
                         #f1.index, self.cut_pts[ind_p1],
                         f1.index, seg.ip1.local_loc,
                         max_tests = 10000, debug = True, prev_face = p_face,
-                        epsilon = epp)
+                        epsilon = epp, use_arrays = True)
                     if len(vs) and error == 'LIMIT_SET':
                         vs = []
                         use_limit = False
@@ -571,75 +983,152 @@ class NetworkCutter(object):
                         print(f0)
                         break
 
-            if len(vs):
-                print('crossed %i faces' % len(faces_crossed))
-                seg.face_chain = faces_crossed
-                seg.path = [self.net_ui_context.mx * v for v in vs]
-                seg.bad_segment = False
-                seg.needs_calculation = False
-                seg.calculation_complete = True
-
-                cut_data = {} 
-                cut_data['face_crosses'] = faces_crossed
-                cut_data['face_set'] = set(faces_crossed)
-                cut_data['edge_crosses'] = eds_crossed
-                cut_data['verts'] = vs
+            if not len(vs):
+                eds_crossed, faces_crossed = [], []
+            self.cut_cache.put(cache_key, (seg.cut_method, vs, eds_crossed, faces_crossed))
+            if not self.is_current(seg, generation):
+                print('segment was edited while computing, dropping the result')
+                return
+            self.store_path_cut(seg, vs, eds_crossed, faces_crossed)
                 
-                old_cdata = []
-                self.cut_data[seg] = cut_data
-                for other_seg, cdata in self.cut_data.items():
-                    if other_seg == seg: continue
-                    if other_seg not in self.input_net.segments:
-                        print('old seg data in self.cut_data')
-                        continue
-                    
-                    if not cut_data['face_set'].isdisjoint(cdata['face_set']):
-                        bad_seg = False
+        return
+    
+    def cut_cache_key(self, seg, cut_no):
+        bme = self.net_ui_context.bme
+        revision = (self.mesh_revision, len(bme.verts), len(bme.edges), len(bme.faces))
+        return CutResultCache.make_key(seg.ip0.face_index, seg.ip0.local_loc,
+                                       seg.ip1.face_index, seg.ip1.local_loc,
+                                       cut_no, revision)
+    
+    def replay_cached_cut(self, seg, cache_key, generation):
+        '''
+        stores the cached cut for cache_key on seg
+        returns True if there was one
+        '''
+        def valid(result):
+            if result[0] == 'ADJACENT_FACE':
+                return result[1].is_valid
+            return all(ed.is_valid for ed in result[2]) and all(f.is_valid for f in result[3])
+        
+        result = self.cut_cache.get(cache_key, valid)
+        if result == None:
+            return False
+        
+        if not self.is_current(seg, generation):
+            return True
+        
+        if result[0] == 'ADJACENT_FACE':
+            self.store_adjacent_cut(seg, result[1], result[2])
+        else:
+            seg.cut_method = result[0]
+            self.store_path_cut(seg, result[1], result[2], result[3])
+        hits, misses, rate = self.cut_cache.stats()
+        print('cut cache hit, %i hits %i misses' % (hits, misses))
+        return True
+    
+    def store_same_face_cut(self, seg):
+        seg.path = [seg.ip0.world_loc, seg.ip1.world_loc]
+        seg.bad_segment = False  #perhaps a dict self.bad_segments[seg] = True
+        seg.needs_calculation = False
+        seg.calculation_complete = True
+        seg.cut_method = 'SAME_FACE'
+    
+    def store_adjacent_cut(self, seg, ed, cross):
+        '''
+        seg crosses the one BMEdge ed shared by its end faces at cross (None if the plane misses it)
+        '''
+        cut_data = {} 
+        cut_data['face_crosses'] = []
+        cut_data['face_set'] = set()
+        cut_data['edge_crosses'] = [ed]
+        cut_data['verts'] = [cross]
+        self.cut_data[seg] = cut_data
+        
+        if cross == None:
+            print('No CROSS PRODUCT')
+            seg.path= [self.net_ui_context.mx * v for v in [seg.ip0.local_loc, seg.ip1.local_loc]]
+        else:    
+            seg.path = [self.net_ui_context.mx * v for v in [seg.ip0.local_loc, cross, seg.ip1.local_loc]] #TODO
+        seg.needs_calculation = False
+        seg.calculation_complete = True
+        seg.bad_segment = False
+        seg.cut_method = 'ADJACENT_FACE'
+    
+    def store_path_cut(self, seg, vs, eds_crossed, faces_crossed):
+        '''
+        stores the walk found for seg in self.cut_data and checks it against the
+        other segments.  An empty vs marks seg as a bad segment
+        
+        vs - local locations, mathutils.Vector
+        eds_crossed - BMEdges
+        faces_crossed - BMFaces
+        '''
+        if len(vs):
+            print('crossed %i faces' % len(faces_crossed))
+            seg.face_chain = faces_crossed
+            seg.path = [self.net_ui_context.mx * v for v in vs]
+            seg.bad_segment = False
+            seg.needs_calculation = False
+            seg.calculation_complete = True
+
+            cut_data = {} 
+            cut_data['face_crosses'] = faces_crossed
+            cut_data['face_set'] = set(faces_crossed)
+            cut_data['edge_crosses'] = eds_crossed
+            cut_data['verts'] = vs
+            
+            old_cdata = []
+            self.cut_data[seg] = cut_data
+            for other_seg, cdata in self.cut_data.items():
+                if other_seg == seg: continue
+                if other_seg not in self.input_net.segments:
+                    print('old seg data in self.cut_data')
+                    continue
                 
-                        print("\n Found self intersection on this segment")
-                        print("\n")
-                        
-                        overlap = cut_data['face_set'].intersection(cdata['face_set'])
-                        
-                        middle_overlap = overlap - set([cdata['face_crosses'][0], cdata['face_crosses'][-1]])
-                        
-                        if len(middle_overlap):
-                            print('there is a middle self intersection')
-                            bad_seg = True
-                        #if overlap includes faces other than tip and tail
-                        
-                        #check that it does not touch any InputPoint faces
-                        ipfaces = set(ip.bmface for ip in self.input_net.points)
-                        if not cut_data['face_set'].isdisjoint(ipfaces):
-                            print('crossed an IP Face, needs to not do that')
-                            bad_seg = True
-                        
-                        if bad_seg:
-                            seg.bad_segment = True #intersection
-                            if seg in self.cut_data:
-                                print('\n')
-                                print('removing cut data for this segment')
-                                print('\n')
-                                print(seg)
-                                print(seg.ip0.bmface)
-                                print(seg.ip1.bmface)
-                                self.cut_data.pop(seg, None)
-                        
+                if not cut_data['face_set'].isdisjoint(cdata['face_set']):
+                    bad_seg = False
+            
+                    print("\n Found self intersection on this segment")
+                    print("\n")
+                    
+                    overlap = cut_data['face_set'].intersection(cdata['face_set'])
+                    
+                    middle_overlap = overlap - set([cdata['face_crosses'][0], cdata['face_crosses'][-1]])
+                    
+                    if len(middle_overlap):
+                        print('there is a middle self intersection')
+                        bad_seg = True
+                    #if overlap includes faces other than tip and tail
+                    
+                    #check that it does not touch any InputPoint faces
+                    ipfaces = set(ip.bmface for ip in self.input_net.points)
+                    if not cut_data['face_set'].isdisjoint(ipfaces):
+                        print('crossed an IP Face, needs to not do that')
+                        bad_seg = True
+                    
+                    if bad_seg:
+                        seg.bad_segment = True #intersection
+                        if seg in self.cut_data:
+                            print('\n')
+                            print('removing cut data for this segment')
                             print('\n')
-                            #only return if there is a forbidden self intersection
-                            return  #found a self intersection, for now forbidden
+                            print(seg)
+                            print(seg.ip0.bmface)
+                            print(seg.ip1.bmface)
+                            self.cut_data.pop(seg, None)
                     
+                        print('\n')
+                        #only return if there is a forbidden self intersection
+                        return  #found a self intersection, for now forbidden
                 
-                
-            else:  #we failed to find the next face in the face group
-                seg.bad_segment = True
-                seg.needs_calculation = False
-                seg.calculation_complete = True
-                seg.path = [seg.ip0.world_loc, seg.ip1.world_loc]
-                print('cut failure!!!')
-                
-        return
-    
+            
+            
+        else:  #we failed to find the next face in the face group
+            seg.bad_segment = True
+            seg.needs_calculation = False
+            seg.calculation_complete = True
+            seg.path = [seg.ip0.world_loc, seg.ip1.world_loc]
+            print('cut failure!!!')
     
     def pre_vis_geo(self, seg, bme, bvh, mx):
 
@@ -848,7 +1337,7 @@ class NetworkCutter(object):
             #        loop[cl]  = Color((.1,.1,.1))   
             
             
-            b_edges = patch.find_all_boundary_edges()
+            b_edges = patch.find_all_boundary_edges(self.input_net.bme)
             print('there are %i free boundary edges' % len(b_edges))
             
             
@@ -1068,79 +1557,30 @@ class NetworkCutter(object):
     #### Helper Functions for committing cut to BMesh #######
     #########################################################
     
-    def find_old_face(self, new_f, max_iters = 5):
+    def find_old_face(self, new_f, max_iters = None):
         '''
-        iteratively drill down to find source face of new_f
-        TODO return a list in order of inheritance?
+        the original face new_f was split from, None if new_f is original
+        max_iters - unused, any number of splits is followed
         '''
-        iters = 0
-        old_f = None
-        while iters < max_iters:
-            iters += 1
-            if new_f not in self.new_to_old_face_map: break
-            old_f = self.new_to_old_face_map[new_f]
-            new_f = old_f
-            
-        return old_f
+        if self.face_ancestry.is_original(new_f): return None
+        return self.face_ancestry.original(new_f)
         
-    def find_new_faces(self, old_f, max_iters = 5):
+    def find_new_faces(self, old_f, max_iters = None):
         '''
-        TODO, may want to only find NEWEST
-        faces
+        every face split off old_f, see FaceAncestry.descendants
         '''    
-        if old_f not in self.old_to_new_face_map: return []
-        
-        iters = 0
-        new_fs = []
-        
-        child_fs = self.old_to_new_face_map[old_f]
-        new_fs += child_fs
-        while iters < max_iters and len(child_fs):
-            iters += 1
-            next_gen = []
-            for f in child_fs:
-                if f in self.old_to_new_face_map:
-                    next_gen += self.old_to_new_face_map[f] #this is always a pair
-            
-            new_fs += next_gen
-            child_fs = next_gen
-
-        #new_fs = old_to_new_face_map[old_f]
+        return self.face_ancestry.descendants(old_f)
             
-        return new_fs
-            
-    def find_newest_faces(self,old_f, max_iters = 5):
+    def find_newest_faces(self,old_f, max_iters = None):
         '''
+        the current faces old_f has been split into
         '''    
-        if old_f not in self.old_to_new_face_map: return []
-        
-        iters = 0
-        child_fs = self.old_to_new_face_map[old_f]
-        newest_faces = []
-        
-        if not any([f in self.old_to_new_face_map for f in child_fs]):
-            return child_fs
-        
-        while iters < max_iters and any([f in self.old_to_new_face_map for f in child_fs]):
-            iters += 1
-            next_gen = []
-            for f in child_fs:
-                if f in self.old_to_new_face_map:
-                    next_gen += self.old_to_new_face_map[f]
-            
-                else:
-                    newest_faces += [f]
-                    
-                print(f)
-            print(next_gen)
-            child_fs = next_gen
-
-        return newest_faces  
+        return self.face_ancestry.newest_faces(old_f)
     
     def remap_input_point(self, ip):
 
-        if ip.bmface not in self.old_to_new_face_map: return
-        newest_faces = self.find_newest_faces(ip.bmface)
+        if not self.face_ancestry.was_split(ip.bmface): return
+        newest_faces = self.face_ancestry.newest_faces(ip.bmface)
         found = False
         for new_f in newest_faces:
             if bmesh.geometry.intersect_face_point(new_f, ip.local_loc):
@@ -1318,6 +1758,53 @@ class NetworkCutter(object):
             
         return ed_enter, ed_exit, bmv_chain
                 
+    def create_segment_verts(self, seg):
+        '''
+        adds a BMVert at every edge crossing of seg
+        returns the cut data map {crossed BMEdge: new BMVert}
+        '''
+        cdata = self.cut_data[seg]
+        if 'bmedge_to_new_bmv' not in cdata:
+            bmedge_to_new_vert_map = {}
+            cdata['bmedge_to_new_bmv'] = bmedge_to_new_vert_map  #yes, keep a map on the per segment level and on the whole network level
+        else:
+            bmedge_to_new_vert_map = cdata['bmedge_to_new_bmv']
+            
+        #create all verts on this segment
+        for i, co in enumerate(cdata['verts']):
+            bmedge = cdata['edge_crosses'][i]
+            bmv = self.input_net.bme.verts.new(co)
+            bmedge_to_new_vert_map[bmedge] = bmv
+            self.new_bmverts.add(bmv)
+        return bmedge_to_new_vert_map
+    
+    def segment_face_edges(self, cdata, f):
+        '''
+        the two edges of f the segment with cut data cdata crosses
+        returns ed_enter, ed_exit, bmvs  the new BMVerts on them, None for a missing edge
+        '''
+        ed_enter = None
+        ed_exit = None
+        bmvs = []
+        for ed in f.edges:
+            if ed in cdata['bmedge_to_new_bmv']:
+                bmvs.append(cdata['bmedge_to_new_bmv'][ed])
+                if ed_enter == None:
+                    ed_enter = ed
+                else:
+                    ed_exit = ed
+                    
+            elif ed in self.reprocessed_edge_map:
+                print('Found reprocessed edge')
+                re_ed = self.reprocessed_edge_map[ed]
+                if re_ed in cdata['bmedge_to_new_bmv']:
+                    bmvs.append(cdata['bmedge_to_new_bmv'][ed])
+                    if ed_enter == None:
+                        ed_enter = ed
+                    else:
+                        ed_exit = ed
+        return ed_enter, ed_exit, bmvs
+    
     def process_segment(self, seg):
         if seg not in self.cut_data:  #check for pre-processed cut data
             print('no cut data for this segment, must need to precompute or perhaps its internal to a face')
@@ -1349,41 +1836,12 @@ class NetworkCutter(object):
         start = time.time()
         
         cdata = self.cut_data[seg]
-        if 'bmedge_to_new_bmv' not in cdata:
-            bmedge_to_new_vert_map = {}
-            cdata['bmedge_to_new_bmv'] = bmedge_to_new_vert_map  #yes, keep a map on the per segment level and on the whole network level
-        else:
-            bmedge_to_new_vert_map = cdata['bmedge_to_new_bmv']
-            
-        #create all verts on this segment
-        for i, co in enumerate(cdata['verts']):
-            bmedge = cdata['edge_crosses'][i]
-            bmv = self.input_net.bme.verts.new(co)
-            bmedge_to_new_vert_map[bmedge] = bmv
-            self.new_bmverts.add(bmv)
+        self.create_segment_verts(seg)
+        
         #now process all the faces crossed
         #for a face to be crossed 2 edges of the face must be crossed
         for f in cdata['face_crosses']:
-            ed_enter = None
-            ed_exit = None
-            bmvs = []
-            for ed in f.edges:
-                if ed in cdata['bmedge_to_new_bmv']:
-                    bmvs.append(cdata['bmedge_to_new_bmv'][ed])
-                    if ed_enter == None:
-                        ed_enter = ed
-                    else:
-                        ed_exit = ed
-                        
-                elif ed in self.reprocessed_edge_map:
-                    print('Found reprocessed edge')
-                    re_ed = self.reprocessed_edge_map[ed]
-                    if re_ed in cdata['bmedge_to_new_bmv']:
-                        bmvs.append(cdata['bmedge_to_new_bmv'][ed])
-                        if ed_enter == None:
-                            ed_enter = ed
-                        else:
-                            ed_exit = ed    
+            ed_enter, ed_exit, bmvs = self.segment_face_edges(cdata, f)
             
             if ed_enter == None:
                 print('No ed enter')
@@ -1407,13 +1865,9 @@ class NetworkCutter(object):
                 #self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
                 return
                 #continue 
-            self.new_to_old_face_map[f1] = f
-            self.new_to_old_face_map[f2] = f
-            
-            if f not in self.new_to_old_face_map:  #maybe not a good idea, if cutting twice and
+            if self.face_ancestry.is_original(f):
                 self.original_indices_map[f.index] = f
-                    
-            self.old_to_new_face_map[f] = [f1, f2]
+            self.face_ancestry.record_split(f, [f1, f2])
             
         finish = time.time()
         #print('finished adding new faces in %f seconds' % (finish - start))
@@ -1442,6 +1896,7 @@ class NetworkCutter(object):
         edge_delete_finish = time.time()
         #print('deleted old edges in %f seconds' % (edge_delete_finish - edge_delete_start))
         self.completed_segments.add(seg)
+        self.mesh_changed()
         #self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
         
         return
@@ -1692,14 +2147,10 @@ class NetworkCutter(object):
                     #self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
                     return
                     #continue 
-                self.new_to_old_face_map[f1] = f
-                self.new_to_old_face_map[f2] = f
-                
                 #if this is an original face, store it's index because bvh is going to report original mesh indices
-                if f not in self.new_to_old_face_map:
+                if self.face_ancestry.is_original(f):
                     self.original_indices_map[f.index] = f
-                    
-                self.old_to_new_face_map[f] = [f1, f2]
+                self.face_ancestry.record_split(f, [f1, f2])
                 
         
         finish = time.time()
@@ -1726,6 +2177,7 @@ class NetworkCutter(object):
         
         
         self.completed_segments.add(seg)
+        self.mesh_changed()
         #self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
             
               
@@ -1763,6 +2215,7 @@ class NetworkCutter(object):
             bmv = self.input_net.bme.verts.new(ip.local_loc)
             self.ip_bmvert_map[ip] = bmv
             self.new_bmverts.add(bmv)
+        self.mesh_changed()
         
         self.input_net.bme.verts.ensure_lookup_table()
         self.input_net.bme.edges.ensure_lookup_table()
@@ -1828,15 +2281,14 @@ class NetworkCutter(object):
         
         #clean up the old geom, and do some book_keeping/mapping
         if f1 != None and f2 != None:
-            self.new_to_old_face_map[f1] = f
-            self.new_to_old_face_map[f2] = f
-            self.old_to_new_face_map[f] = [f1, f2]
+            self.face_ancestry.record_split(f, [f1, f2])
             self.input_net.bme.faces.remove(f)
             
             del_eds = [ed for ed in [ed_enter, ed_exit] if len(ed.link_faces) == 0]
             del_eds = list(set(del_eds))
             for ed in del_eds:
                 self.input_net.bme.edges.remove(ed)
+            self.mesh_changed()
             
         else:
             #self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
@@ -1845,11 +2297,123 @@ class NetworkCutter(object):
                     
      
     
+    def knife_geometry_bulk(self):
+        '''
+        commits the whole network to the BMesh in one topology edit
+        
+        knife_geometry_step splits one face at a time, deleting the old face
+        before looking up the next.  Here every split is gathered from the
+        untouched mesh first, then all the new faces are made and the old
+        faces and edges are deleted with one bmesh.ops.delete each
+        
+        must follow knife_gometry_stepper_prepare
+        returns False, without splitting anything, if a face would be split
+        more than once or a segment is out of date.  Those need the stepper
+        '''
+        start = time.time()
+        bme = self.input_net.bme
+        
+        #the chains of InputPoints sharing a face, nothing is split so no remapping is needed
+        chains = []
+        ip_set = set(self.ip_set)
+        while len(ip_set):
+            ip = ip_set.pop()
+            if not ip.bmface.is_valid:
+                print('input point face is not valid, using the stepwise knife')
+                return False
+            if ip.is_edgepoint():
+                ip_chain, seg_enter, seg_exit = self.find_ip_chain_edgepoint(ip)
+            else:
+                ip_chain, seg_enter, seg_exit = self.find_ip_chain_facepoint(ip)
+            ip_set.difference_update(ip_chain)
+            chains.append((ip, ip_chain, seg_enter, seg_exit))
+        
+        segs = []
+        for ip, ip_chain, seg_enter, seg_exit in chains:
+            for seg in [seg_enter, seg_exit]:
+                if seg and seg not in self.completed_segments and seg not in segs:
+                    segs.append(seg)
+        
+        #every face may be split only once when nothing is deleted in between
+        if len(self.reprocessed_edge_map):
+            return False
+        split_faces = set()
+        n_splits = 0
+        for seg in segs:
+            if seg not in self.cut_data:
+                print('no cut data for a segment, using the stepwise knife')
+                return False
+            face_crosses = self.cut_data[seg]['face_crosses']
+            if not all([f.is_valid for f in face_crosses]):
+                print('segment out of date, using the stepwise knife')
+                return False
+            split_faces.update(face_crosses)
+            n_splits += len(face_crosses)
+        
+        for ip, ip_chain, seg_enter, seg_exit in chains:
+            split_faces.add(ip.bmface)
+            n_splits += 1
+            
+        if len(split_faces) != n_splits:
+            print('faces are crossed more than once, using the stepwise knife')
+            return False
+        
+        #gather the vertex lists of every split
+        for seg in segs:
+            self.create_segment_verts(seg)
+        
+        splits = []
+        for seg in segs:
+            cdata = self.cut_data[seg]
+            for f in cdata['face_crosses']:
+                ed_enter, ed_exit, bmvs = self.segment_face_edges(cdata, f)
+                if ed_enter == None or ed_exit == None or len(bmvs) != 2:
+                    print('could not find the crossed edges of a face')
+                    f.select_set(True)
+                    continue
+                splits.append((f, ed_enter, ed_exit, bmvs))
+        
+        for ip, ip_chain, seg_enter, seg_exit in chains:
+            self.active_ip, self.ip_chain, self.seg_enter, self.seg_exit = ip, ip_chain, seg_enter, seg_exit
+            ed_enter, ed_exit, bmvert_chain = self.detect_ed_enter_exit()
+            splits.append((ip.bmface, ed_enter, ed_exit, bmvert_chain))
+        
+        new_faces = []
+        del_eds = set()
+        for f, ed_enter, ed_exit, bmvert_chain in splits:
+            verts1, verts2 = split_face_vert_lists(f, ed_enter, ed_exit, bmvert_chain)
+            if verts1 == None:
+                print('could not split a face in the bulk knife')
+                continue
+            new_faces.append((f, verts1, verts2))
+            del_eds.update([ed_enter, ed_exit])
+        
+        #now the one topology edit
+        old_faces = []
+        for f, verts1, verts2 in new_faces:
+            f1 = bme.faces.new(verts1)
+            f2 = bme.faces.new(verts2)
+            if self.face_ancestry.is_original(f):
+                self.original_indices_map[f.index] = f
+            self.face_ancestry.record_split(f, [f1, f2])
+            old_faces.append(f)
+        
+        bmesh.ops.delete(bme, geom = old_faces, context = 3)
+        del_eds = [ed for ed in del_eds if ed.is_valid and len(ed.link_faces) == 0]
+        bmesh.ops.delete(bme, geom = del_eds, context = 4)
+        
+        self.completed_segments.update(segs)
+        self.ip_set.clear()
+        self.mesh_changed()
+        print('bulk knife split %i faces in %f seconds' % (len(old_faces), time.time() - start))
+        return True
+    
     def knife_geometry4(self):
         self.knife_gometry_stepper_prepare()
         
-        while len(self.ip_set):
-            self.knife_geometry_step()
+        if not self.knife_geometry_bulk():
+            while len(self.ip_set):
+                self.knife_geometry_step()
         
         self.seg_enter = None
         self.seg_exit = None
@@ -1867,6 +2431,7 @@ class NetworkCutter(object):
     def knife_geometry3(self):
         #check all deferred calculations
         knife_sart = time.time()
+        self.mesh_changed()
         for seg in self.input_net.segments:
             if (seg.needs_calculation == True) or (seg.calculation_complete == False):
                 print('segments still computing')
@@ -1882,6 +2447,7 @@ class NetworkCutter(object):
         original_face_indices = self.original_indices_map
         new_to_old_face_map = self.new_to_old_face_map
         old_to_new_face_map = self.old_to_new_face_map
+        face_ancestry = self.face_ancestry
         completed_segments = self.completed_segments
         completed_input_points = self.completed_input_points
         ip_bmvert_map = self.ip_bmvert_map
@@ -1895,74 +2461,9 @@ class NetworkCutter(object):
             if len(ip.link_segments) != 2: return None  #TODO, the the segment to right
             return [seg for seg in ip.link_segments if seg != current_seg][0]
         
-        def find_old_face(new_f, max_iters = 5):
-            '''
-            iteratively drill down to find source face of new_f
-            TODO return a list in order of inheritance?
-            '''
-            iters = 0
-            old_f = None
-            while iters < max_iters:
-                iters += 1
-                if new_f not in new_to_old_face_map: break
-                old_f = new_to_old_face_map[new_f]
-                new_f = old_f
-                
-            return old_f
-        
-        def find_new_faces(old_f, max_iters = 5):
-            '''
-            TODO, may want to only find NEWEST
-            faces
-            '''    
-            if old_f not in old_to_new_face_map: return []
-            
-            iters = 0
-            new_fs = []
-            
-            child_fs = old_to_new_face_map[old_f]
-            new_fs += child_fs
-            while iters < max_iters and len(child_fs):
-                iters += 1
-                next_gen = []
-                for f in child_fs:
-                    if f in old_to_new_face_map:
-                        next_gen += old_to_new_face_map[f] #this is always a pair
-                
-                new_fs += next_gen
-                child_fs = next_gen
-    
-            #new_fs = old_to_new_face_map[old_f]
-                
-            return new_fs
-            
-        def find_newest_faces(old_f, max_iters = 5):
-            '''
-            '''    
-            if old_f not in old_to_new_face_map: return []
-            
-            iters = 0
-            child_fs = old_to_new_face_map[old_f]
-            newest_faces = []
-            
-            if not any([f in old_to_new_face_map for f in child_fs]):
-                return child_fs
-            
-            while iters < max_iters and any([f in old_to_new_face_map for f in child_fs]):
-                iters += 1
-                next_gen = []
-                for f in child_fs:
-                    if f in old_to_new_face_map:
-                        next_gen += old_to_new_face_map[f]
-                
-                    else:
-                        newest_faces += [f]
-                        
-                    print(f)
-                print(next_gen)
-                child_fs = next_gen
-
-            return newest_faces     
+        find_old_face = self.find_old_face
+        find_new_faces = self.find_new_faces
+        find_newest_faces = self.find_newest_faces
         
         def recompute_segment(seg):
             
@@ -2210,14 +2711,10 @@ class NetworkCutter(object):
                         #self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
                         return
                         #continue 
-                    new_to_old_face_map[f1] = f
-                    new_to_old_face_map[f2] = f
-                    
                     #if this is an original face, store it's index because bvh is going to report original mesh indices
-                    if f not in new_to_old_face_map:
+                    if face_ancestry.is_original(f):
                         original_face_indices[f.index] = f
-                        
-                    old_to_new_face_map[f] = [f1, f2]
+                    face_ancestry.record_split(f, [f1, f2])
                     
             
             finish = time.time()
@@ -2338,13 +2835,9 @@ class NetworkCutter(object):
                     #self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
                     return
                     #continue 
-                new_to_old_face_map[f1] = f
-                new_to_old_face_map[f2] = f
-                
-                if f not in new_to_old_face_map:
+                if face_ancestry.is_original(f):
                     original_face_indices[f.index] = f
-                        
-                old_to_new_face_map[f] = [f1, f2]
+                face_ancestry.record_split(f, [f1, f2])
                 
             finish = time.time()
             print('finished adding new faces in %f seconds' % (finish - start))
@@ -2383,7 +2876,7 @@ class NetworkCutter(object):
         
         def remap_input_point(ip):
 
-            if ip.bmface not in old_to_new_face_map: return
+            if not face_ancestry.was_split(ip.bmface): return
             newest_faces = find_newest_faces(ip.bmface)
             found = False
             for new_f in newest_faces:
@@ -2522,12 +3015,9 @@ class NetworkCutter(object):
             f1, f2 = split_face_by_verts(self.input_net.bme, f, ed_enter, ed_exit, bmvert_chain)
             
             if f1 != None and f2 != None:
-                new_to_old_face_map[f1] = f
-                new_to_old_face_map[f2] = f
-                old_to_new_face_map[f] = [f1, f2]
-                
-                if f not in new_to_old_face_map:
+                if face_ancestry.is_original(f):
                     original_face_indices[f.index] = f
+                face_ancestry.record_split(f, [f1, f2])
                 
                 self.input_net.bme.faces.remove(f)
                 #bmesh.ops.delete(self.input_net.bme, geom = [f], context = 3)
@@ -2642,12 +3132,9 @@ class NetworkCutter(object):
                     
                     
                     if f1 != None and f2 != None:
-                        new_to_old_face_map[f1] = f
-                        new_to_old_face_map[f2] = f
-                        old_to_new_face_map[f] = [f1, f2]
-                        
-                        if f not in new_to_old_face_map:
+                        if face_ancestry.is_original(f):
                             original_face_indices[f.index] = f
+                        face_ancestry.record_split(f, [f1, f2])
                         
                         bmesh.ops.delete(self.input_net.bme, geom = [f], context = 3)
                         
@@ -2826,11 +3313,9 @@ class NetworkCutter(object):
                             #self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
                             return
                             #continue 
-                        new_to_old_face_map[f1] = f
-                        new_to_old_face_map[f2] = f
-                        old_to_new_face_map[f] = [f1, f2]
-                        if f not in new_to_old_face_map:
+                        if face_ancestry.is_original(f):
                             original_face_indices[f.index] = f
+                        face_ancestry.record_split(f, [f1, f2])
                         
                         geom_clean_start = time.time()
                         #bmesh.ops.delete(self.input_net.bme, geom = [f], context = 3)
@@ -2867,6 +3352,7 @@ class NetworkCutter(object):
                         perim_edges.remove(ed)
 
         self.boundary_edges = perim_edges             
+        self.mesh_changed()
         #self.input_net.bme.verts.ensure_lookup_table()
         #self.input_net.bme.edges.ensure_lookup_table()
         #self.input_net.bme.faces.ensure_lookup_table()    
@@ -2884,66 +3370,6 @@ class NetworkCutter(object):
         '''
         selects a FacePatch based on "hovered mesh" data
         '''
-        #dictionaries to map newly created faces to their original faces and vice versa
-        old_to_new_face_map = self.old_to_new_face_map
-             
-        def find_newest_faces(old_f, max_iters = 5):
-            '''
-            '''    
-            if old_f not in old_to_new_face_map: return []
-            
-            iters = 0
-            child_fs = old_to_new_face_map[old_f]
-            newest_faces = []
-            
-            if not any([f in old_to_new_face_map for f in child_fs]):
-                return child_fs
-            
-            while iters < max_iters and any([f in old_to_new_face_map for f in child_fs]):
-                iters += 1
-                next_gen = []
-                for f in child_fs:
-                    if f in old_to_new_face_map:
-                        next_gen += old_to_new_face_map[f]
-                
-                    else:
-                        newest_faces += [f]
-                        
-                    print(f)
-                print(next_gen)
-                child_fs = next_gen
-                
-            #new_fs = old_to_new_face_map[old_f]
-                
-            return newest_faces  
-        
-        def find_new_faces(old_f, max_iters = 5):
-            '''
-            TODO, may want to only find NEWEST
-            faces
-            '''    
-            if old_f not in old_to_new_face_map: return []
-            
-            iters = 0
-            new_fs = []
-            
-            child_fs = old_to_new_face_map[old_f]
-            new_fs += child_fs
-            while iters < max_iters and len(child_fs):
-                iters += 1
-                next_gen = []
-                for f in child_fs:
-                    if f in old_to_new_face_map:
-                        next_gen += old_to_new_face_map[f] #this is always a pair
-                
-                new_fs += next_gen
-                child_fs = next_gen
-                
-            
-            #new_fs = old_to_new_face_map[old_f]
-                
-            return new_fs    
-        
         #print(self.original_indices_map)
         
         #first, BVH gives us a face index, but we have deleted all the faces and created new ones
@@ -2952,7 +3378,7 @@ class NetworkCutter(object):
         if face_ind in self.original_indices_map:
             print('found an old face that was split')
             old_f = self.original_indices_map[face_ind]
-            fs_new = find_newest_faces(old_f, max_iters = 5)
+            fs_new = self.face_ancestry.newest_faces(old_f)
             for new_f in fs_new:
                 if bmesh.geometry.intersect_face_point(new_f, local_loc):
                     print('found the new face that corresponds')
@@ -2988,73 +3414,11 @@ class NetworkCutter(object):
             
             
     def add_seed_post_cut(self, face_ind, world_loc, local_loc):
-        #dictionaries to map newly created faces to their original faces and vice versa
-        old_to_new_face_map = self.old_to_new_face_map
-        
-    
         if "patches" not in self.input_net.bme.loops.layers.color:
             vcol_layer = self.input_net.bme.loops.layers.color.new("patches")
         else:
             vcol_layer = self.input_net.bme.loops.layers.color["patches"]
-            
-            
-        def find_newest_faces(old_f, max_iters = 5):
-            '''
-            '''    
-            if old_f not in old_to_new_face_map: return []
-            
-            iters = 0
-            child_fs = old_to_new_face_map[old_f]
-            newest_faces = []
-            
-            if not any([f in old_to_new_face_map for f in child_fs]):
-                return child_fs
-            
-            while iters < max_iters and any([f in old_to_new_face_map for f in child_fs]):
-                iters += 1
-                next_gen = []
-                for f in child_fs:
-                    if f in old_to_new_face_map:
-                        next_gen += old_to_new_face_map[f]
-                
-                    else:
-                        newest_faces += [f]
-                        
-                    print(f)
-                print(next_gen)
-                child_fs = next_gen
-                
-            #new_fs = old_to_new_face_map[old_f]
-                
-            return newest_faces  
-        
-        def find_new_faces(old_f, max_iters = 5):
-            '''
-            TODO, may want to only find NEWEST
-            faces
-            '''    
-            if old_f not in old_to_new_face_map: return []
-            
-            iters = 0
-            new_fs = []
-            
-            child_fs = old_to_new_face_map[old_f]
-            new_fs += child_fs
-            while iters < max_iters and len(child_fs):
-                iters += 1
-                next_gen = []
-                for f in child_fs:
-                    if f in old_to_new_face_map:
-                        next_gen += old_to_new_face_map[f] #this is always a pair
-                
-                new_fs += next_gen
-                child_fs = next_gen
-                
-            
-            #new_fs = old_to_new_face_map[old_f]
-                
-            return new_fs    
-        
+
         #print(self.original_indices_map)
         
         #first, BVH gives us a face index, but we have deleted all the faces and created new ones
@@ -3062,7 +3426,7 @@ class NetworkCutter(object):
         if face_ind in self.original_indices_map:
             print('found an old face that was split')
             old_f = self.original_indices_map[face_ind]
-            fs_new = find_newest_faces(old_f, max_iters = 5)
+            fs_new = self.face_ancestry.newest_faces(old_f)
             for new_f in fs_new:
                 if bmesh.geometry.intersect_face_point(new_f, local_loc):
                     print('found the new face that corresponds')
@@ -3087,17 +3451,193 @@ class NetworkCutter(object):
                 patch.color_patch()
                 return
                             
-        new_patch = BMFacePatch(f, local_loc, world_loc, vcol_layer, get_random_color())
-        new_patch.grow_seed(self.input_net.bme, self.boundary_edges)
+        new_patch = BMFacePatch(f, local_loc, world_loc, vcol_layer, get_random_color(), colors = self.patch_colors)
+        new_patch.patch_faces = self.component_faces(f)
+        new_patch.labels_dirty = True
         new_patch.color_patch()
         self.face_patches += [new_patch]
         
         #self.update_spline_edited_patches(self.spline_net)
         
         print(new_patch.spline_net_segments)
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.to_mesh()
 
 
+    def cut_face_components(self):
+        '''
+        connected components of input_net.bme with self.boundary_edges removed,
+        one pass over the whole mesh.  cached until the knife or the boundary changes
+        
+        returns indptr, indices, labels
+            CSR component -> face indices and the component of every face
+        '''
+        bme = self.input_net.bme
+        key = (self.mesh_revision, len(bme.faces), id(self.boundary_edges), len(self.boundary_edges))
+        if self.components_key == key:
+            return self.components
+        
+        start = time.time()
+        mesh = mesh_arrays_for_bmesh(bme)  #re extracts after the knife, which updates the indices
+        cut = [ed.index for ed in self.boundary_edges if ed.is_valid]
+        n, labels = mesh.face_components(cut)
+        indptr, indices = csr_from_pairs(labels, np.arange(len(labels)), n)
+        self.components = (indptr, indices, labels)
+        self.components_key = key
+        print('found %i cut components in %f seconds' % (n, time.time() - start))
+        return self.components
+    
+    def component_faces(self, f):
+        '''
+        set of BMFaces reached from f without crossing self.boundary_edges
+        the same faces grow_seed floods to
+        '''
+        indptr, indices, labels = self.cut_face_components()
+        faces = self.input_net.bme.faces
+        faces.ensure_lookup_table()
+        c = labels[f.index]
+        return set(faces[i] for i in indices[indptr[c]:indptr[c + 1]].tolist())
+        
+    def grow_patches(self):
+        '''
+        grows the seed of every patch to its region of the cut mesh
+        all patches are labelled by one cut_face_components pass instead of a
+        flood per patch
+        '''
+        for patch in self.face_patches:
+            if len(patch.patch_faces) != 0:
+                patch.un_color_patch()
+            patch.patch_faces = self.component_faces(patch.seed_face)
+            patch.labels_dirty = True
+    
+    def face_label_array(self):
+        '''
+        int32 label of every face of input_net.bme, the position of its patch in
+        self.face_patches, -1 for faces in no patch.
+        
+        kept up to date by paint_patches.  Rebuilt from the patch_faces sets when
+        the mesh changed or a patch was grown, patches appended since the last
+        call are labelled on their own
+        '''
+        bme = self.input_net.bme
+        patch_ids = tuple(id(patch) for patch in self.face_patches)
+        key = (self.mesh_revision, len(bme.faces), patch_ids)
+        if self.face_labels_key == key and not any(patch.labels_dirty for patch in self.face_patches):
+            return self.face_labels
+        
+        bme.faces.index_update()
+        n_labelled = 0
+        if self.face_labels_key != None and self.face_labels_key[:2] == key[:2]:
+            old_ids = self.face_labels_key[2]
+            if patch_ids[:len(old_ids)] == old_ids and not any(patch.labels_dirty for patch in self.face_patches[:len(old_ids)]):
+                n_labelled = len(old_ids)
+        
+        if n_labelled == 0:
+            self.face_labels = np.full(len(bme.faces), -1, dtype=np.int32)
+        
+        for i in range(n_labelled, len(self.face_patches)):
+            patch = self.face_patches[i]
+            self.face_labels[[f.index for f in patch.patch_faces if f.is_valid]] = i
+        for patch in self.face_patches:
+            patch.labels_dirty = False
+        
+        self.face_labels_key = key
+        return self.face_labels
+    
+    def paint_patches(self, geom, mode):
+        '''
+        moves painted faces between patches by rewriting the face labels
+        
+        geom - set of BMFaces, the brush stroke
+        mode - 'GREEDY' geom is taken from every other patch into self.active_patch
+               'MERGE' every patch geom touches is merged into self.active_patch
+               'SUBTRACT' geom is removed from every patch
+        
+        patches left without faces are removed from self.face_patches
+        returns the patches geom touched, other than the active patch
+        '''
+        labels = self.face_label_array()
+        inds = np.array([f.index for f in geom], dtype=np.int64)
+        
+        if mode == 'SUBTRACT':
+            active = -1
+        else:
+            active = self.face_patches.index(self.active_patch)
+        
+        touched = np.unique(labels[inds])
+        touched = touched[(touched >= 0) & (touched != active)]
+        touched_patches = [self.face_patches[i] for i in touched.tolist()]
+        
+        if mode == 'MERGE':
+            labels[np.isin(labels, touched)] = active
+        labels[inds] = active
+        
+        #bring the face sets in line with the labels
+        for patch in touched_patches:
+            if mode == 'MERGE':
+                self.active_patch.patch_faces.update(patch.patch_faces)
+                patch.patch_faces = set()
+            else:
+                patch.patch_faces.difference_update(geom)
+        if active != -1:
+            self.active_patch.patch_faces |= geom
+        
+        #drop empty patches and renumber the labels
+        counts = np.bincount(labels[labels >= 0], minlength = len(self.face_patches))
+        if np.any(counts == 0):
+            keep = counts > 0
+            renumber = np.full(len(self.face_patches) + 1, -1, dtype=np.int32)
+            renumber[1:][keep] = np.arange(np.sum(keep), dtype=np.int32)
+            self.face_labels = renumber[labels + 1]
+            self.face_patches[:] = [patch for patch, k in zip(self.face_patches, keep.tolist()) if k]
+        
+        self.face_labels_key = self.face_labels_key[:2] + (tuple(id(patch) for patch in self.face_patches),)
+        return touched_patches
+    
+    def find_patch_boundaries(self):
+        '''
+        boundary edges, perimeter and lakes of every patch in one pass over
+        face_label_array, cheap enough to redo every frame
+        '''
+        start = time.time()
+        bme = self.input_net.bme
+        labels = self.face_label_array()
+        mesh = mesh_arrays_for_bmesh(bme)
+        outline_patches(bme, mesh, labels, self.face_patches)
+        print('found boundaries of %i patches in %f seconds' % (len(self.face_patches), time.time() - start))
+        
+    def color_patches(self):
+        '''
+        colors the faces of every patch from face_label_array in one pass
+        '''
+        palette = [patch.color[:] for patch in self.face_patches]
+        self.patch_colors.set_label_colors(self.face_label_array(), palette)
+    
+    def show_patch_colors(self, force = False):
+        '''
+        writes self.patch_colors to the "patches" vertex colors of the object
+        with one foreach_set, if they changed since the last write
+        '''
+        me = self.net_ui_context.ob.data
+        if self.patch_colors.sync():
+            #topology changed and the buffer went white
+            self.color_patches()
+            force = True
+            
+        vcol = me.vertex_colors.get("patches")
+        if vcol == None:
+            vcol = me.vertex_colors.new(name = "patches")
+            force = True
+        if self.patch_colors.write(vcol.data, force = force):
+            me.update()
+    
+    def to_mesh(self):
+        '''
+        writes input_net.bme to the object, then the patch colors over the
+        loop colors the BMesh carried
+        '''
+        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.show_patch_colors(force = True)
+    
     def add_seed_pre_cut(self, face_ind, world_loc, local_loc):
         '''
         to be used when painting/corse patches before
@@ -3118,13 +3658,13 @@ class NetworkCutter(object):
                 patch.color_patch()
                 return
                             
-        new_patch = BMFacePatch(f, local_loc, world_loc, vcol_layer, get_random_color())
+        new_patch = BMFacePatch(f, local_loc, world_loc, vcol_layer, get_random_color(), colors = self.patch_colors)
         new_patch.grow_seed_faces(self.input_net.bme, self.boundary_faces)
         new_patch.color_patch()
         self.face_patches += [new_patch]
         
         
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.to_mesh()
     
     
     def add_patch_start_paint(self, face_ind, world_loc, local_loc):
@@ -3135,19 +3675,63 @@ class NetworkCutter(object):
             
             
         f= self.net_ui_context.bme.faces[face_ind]                   
-        new_patch = BMFacePatch(f, local_loc, world_loc, vcol_layer, get_random_color())
+        new_patch = BMFacePatch(f, local_loc, world_loc, vcol_layer, get_random_color(), colors = self.patch_colors)
         self.face_patches += [new_patch]
         self.active_patch = new_patch
                  
+def store_vector(name):
+    '''
+    property for a Vector kept in row self.row of the NetworkArrays self.store
+    reading gives a new Vector, None if it was never set
+    '''
+    def getter(self):
+        co = getattr(self.store, name)[self.row]
+        if co[0] != co[0]: return None  #nan
+        return Vector(co)
+    def setter(self, v):
+        getattr(self.store, name)[self.row] = np.nan if v is None else tuple(v)
+    return property(getter, setter)
+
+def store_touching(slot):
+    '''
+    property kept in slot, setting it to something else calls self.store.touch()
+    so the cached find_network_topology sees it, eg seed_geom decides is_edgepoint
+    '''
+    def getter(self):
+        return getattr(self, slot)
+    def setter(self, v):
+        if getattr(self, slot, None) is not v:
+            self.store.touch()
+        setattr(self, slot, v)
+    return property(getter, setter)
+
+def store_face_index():
+    def getter(self):
+        ind = int(self.store.face_index[self.row])
+        return None if ind == -1 else ind
+    def setter(self, ind):
+        self.store.face_index[self.row] = -1 if ind == None else ind
+    return property(getter, setter)
+
+
 class InputPoint(object):  # NetworkNode
     '''
     Representation of an input point
+    
+    world_loc, local_loc, view and face_index are kept in row self.row of
+    InputPoint.store, which is shared by every InputPoint
     '''
+    __slots__ = ('row', 'link_segments', '_seed_geom', 'bmface', 'bmedge', 'bmvert', 'spline', 'node')
+    store = NetworkArrays()
+    
+    world_loc = store_vector('world')
+    local_loc = store_vector('local')
+    view = store_vector('view')
+    face_index = store_face_index()
+    seed_geom = store_touching('_seed_geom')
+    
     def __init__(self, world, local, view, face_ind, seed_geom = None, bmface = None, bmedge = None, bmvert = None):
-        self.world_loc = world
-        self.local_loc = local
-        self.view = view
-        self.face_index = face_ind
+        self.row = self.store.add_point(world, local, view, face_ind)
         self.link_segments = []
 
         #Mapping to source BMesh Geometry
@@ -3160,6 +3744,9 @@ class InputPoint(object):  # NetworkNode
         #Mapping to Curve Network?
         self.spline = None  #Type SplineSegment, will not be none if IP was generated by Spline tessellation
         self.node = None #Type InputNode  Will exist if is equivalent to InputNode
+    
+    def __del__(self):
+        self.store.remove_point(self.row)
         
     def is_endpoint(self):
         if self.seed_geom and self.num_linked_segs > 0: return False  #TODO, better system to delinate edge of mesh
@@ -3264,10 +3851,15 @@ class InputSegment(object): #NetworkSegment
     Representation of a cut between 2 input points
     Equivalent to an "edge" in a mesh connecting to verts
     '''
+    __slots__ = ('ip0', 'ip1', 'points', 'path', 'bad_segment', 'face_chain', 'calculation_complete',
+                 'needs_calculation', 'cut_method', 'parent_spline', 'row')
+    store = InputPoint.store
+    
     def __init__(self, ip0, ip1):
         self.ip0 = ip0
         self.ip1 = ip1
         self.points = [ip0, ip1]
+        self.row = self.store.add_edge(ip0.row, ip1.row)
         self.path = []  #list of 3d points for previsualization
         self.bad_segment = False
         ip0.link_segments.append(self)
@@ -3283,6 +3875,9 @@ class InputSegment(object): #NetworkSegment
         
         #SplineNetwork References
         self.parent_spline = None #will be a SplineSegment if set
+    
+    def __del__(self):
+        self.store.remove_edge(self.row)
         
     def is_bad(self): return self.bad_segment
     is_bad = property(is_bad)
@@ -3295,6 +3890,7 @@ class InputSegment(object): #NetworkSegment
         #TODO safety?  Check if in ip0.link_sgements?
         self.ip0.link_segments.remove(self)
         self.ip1.link_segments.remove(self)
+        self.store.touch()
     
 class InputNetwork(object): #InputNetwork
     '''
@@ -3305,7 +3901,10 @@ class InputNetwork(object): #InputNetwork
     InputPoints and Input segments, analogous to Verts and Edges
 
     Collection of all InputPoints and Input Segments
+    the numbers of the points and segments are kept in store, see network_arrays
     '''
+    store = InputPoint.store
+    
     def __init__(self, net_ui_context, ui_type="DENSE_POLY"):
         self.net_ui_context = net_ui_context
         self.net_ui_context.set_network(self)
@@ -3313,6 +3912,8 @@ class InputNetwork(object): #InputNetwork
         self.bme = self.net_ui_context.bme  #the network exists on the BMesh, it is fundamental
         self.points = []
         self.segments = []  #order not important, but maintain order in this list for indexing?
+        self.topology = None  #see find_network_topology
+        self.topology_key = None
 
     def is_empty(self): return (not(self.points or self.segments))
     def num_points(self): return len(self.points)
@@ -3330,6 +3931,32 @@ class InputNetwork(object): #InputNetwork
     point_views = property(point_views)
     point_face_indices = property(point_face_indices)
 
+    def point_rows(self):
+        '''
+        store rows of self.points, in order
+        '''
+        return np.fromiter((p.row for p in self.points), dtype = np.int64, count = len(self.points))
+    
+    def world_loc_array(self): return self.store.world[self.point_rows()]
+    def local_loc_array(self): return self.store.local[self.point_rows()]
+    def view_array(self): return self.store.view[self.point_rows()]
+    def face_index_array(self): return self.store.face_index[self.point_rows()]
+    
+    def segment_array(self):
+        '''
+        (num_segs, 2) int array, positions in self.points of the ends of every segment
+        '''
+        edge_rows = np.fromiter((seg.row for seg in self.segments), dtype = np.int64, count = len(self.segments))
+        return self.store.edge_positions(self.point_rows(), edge_rows)
+    
+    def closest_point(self, world_loc):
+        '''
+        the point nearest world_loc, None if there are no points
+        '''
+        i, d = self.store.nearest_point(self.point_rows(), world_loc)
+        if i == None: return None
+        return self.points[i]
+
     def create_point(self, world_loc, local_loc, view, face_ind):
         ''' create an InputPoint '''
         self.points.append(InputPoint(world_loc, local_loc, view, face_ind, bmface = self.bme.faces[face_ind]))
@@ -3347,6 +3974,7 @@ class InputNetwork(object): #InputNetwork
             self.segments.remove(seg)
             p1.link_segments.remove(seg)
             p2.link_segments.remove(seg)
+            self.store.touch()
 
     def remove_segment(self, seg):
         if seg in self.segments:
@@ -3358,6 +3986,7 @@ class InputNetwork(object): #InputNetwork
             seg.ip0.link_segments.remove(seg)
         if seg in seg.ip1.link_segments:
             seg.ip1.link_segments.remove(seg)
+        self.store.touch()
         
         
     def are_connected(self, p1, p2): #TODO: Needs to be in InputPoint 
@@ -3408,126 +4037,49 @@ class InputNetwork(object): #InputNetwork
         
         return edge_points
      
-    def find_network_cycles(self):  #TODO
-        #this is the equivalent of "edge_loops"
-        #TODO, mirror the get_cycle method from polystrips
-        #right now ther eare no T or X junctions, only cuts across mesh or loops within mesh
-        #will need to implement "IputNode.get_segment_to_right(InputSegment) to take care this
-        
-        print('INPUT NETWORK CYCLES')
-        ip_set = set(self.points)
-        endpoints = set(self.get_endpoints())
-        
-        closed_edgepoints = set(self.get_edgepoints()) - endpoints
-        
-        
-        print('There are %i endpoints' % len(endpoints))
-        print('there are %i input points' % len(ip_set))
-        print('there are %i closed edge_points' % len(closed_edgepoints))
-        
-        unclosed_ip_cycles = []
-        unclosed_seg_cycles = []
-        
-        def next_segment(ip, current_seg): #TODO Code golf this
-            if len(ip.link_segments) != 2: return None  #TODO, the the segment to right
-            return [seg for seg in ip.link_segments if seg != current_seg][0]
-              
-        while len(endpoints):
-            current_ip = endpoints.pop()
-            ip_start = current_ip
-            ip_set.remove(current_ip)
-            
-            node_cycle = [current_ip]
-            if len(current_ip.link_segments) == 0: continue #Lonely Input Point, ingore it
-            
-            current_seg = current_ip.link_segments[0]
-            seg_cycle = [current_seg]
-            
-            while current_seg:
-                next_ip = current_seg.other_point(current_ip)  #always true
-                
-                if next_ip == ip_start: break  #we have found the end, no need to get the next segment
-                
-                #take care of sets
-                if next_ip in ip_set: ip_set.remove(next_ip)
-                if next_ip in endpoints: endpoints.remove(next_ip)
-                node_cycle += [next_ip]
-                
-                #find next segment
-                next_seg = next_segment(next_ip, current_seg)
-                if not next_seg:  break  #we have found an endpoint
-                seg_cycle += [next_seg]
-               
-                #reset variable for next iteration
-                current_ip = next_ip
-                current_seg = next_seg
-                
-            unclosed_ip_cycles += [node_cycle] 
-            unclosed_seg_cycles += [seg_cycle] 
-         
-            
-        print('there are %i unclosed cycles' % len(unclosed_ip_cycles))
-        print('there are %i ip points in ip set' % len(ip_set))
-        for i, cyc in enumerate(unclosed_ip_cycles):
-            print('There are %i nodes in %i unclosed cycle' % (len(cyc), i))
-        
-        ip_cycles = []
-        seg_cycles = []   #<<this basicaly becomes a PolyLineKine
-        while len(ip_set):
-            
-            if len(closed_edgepoints):  #this makes sure we start with a closed edge point
-                current_ip = closed_edgepoints.pop()
-                ip_set.remove(current_ip)
-            else:
-                current_ip = ip_set.pop()
-            
-            ip_start = current_ip
-                
-            node_cycle = [current_ip]
-            if len(current_ip.link_segments) == 0: continue #Lonely Input Point, ingore it
-            
-            current_seg = current_ip.link_segments[0]
-            seg_cycle = [current_seg]
-            
-            while current_seg:
-                next_ip = current_seg.other_point(current_ip)  #always true
-                
-                if next_ip == ip_start: break  #we have found the end, no need to get the next segment
-                
-                #take care of sets
-                if next_ip in ip_set: ip_set.remove(next_ip)  #<-- i what circumstance would this not be true?
-                if next_ip in closed_edgepoints: closed_edgepoints.remove(next_ip)
-                node_cycle += [next_ip]
-                
-                #find next segment
-                next_seg = next_segment(next_ip, current_seg)
-                if not next_seg:  break  #we have found an endpoint
-                seg_cycle += [next_seg]
-               
-                #reset variable for next iteration
-                current_ip = next_ip
-                current_seg = next_seg
-                
-            ip_cycles += [node_cycle] 
-            seg_cycles += [seg_cycle] 
-        
-        
-        print('there are %i closed seg cycles' % len(seg_cycles))
-        for i, cyc in enumerate(ip_cycles):
-            print('There are %i nodes in %i closed cycle' % (len(cyc), i))
+    def find_network_topology(self):
+        '''
+        the cycles, open chains and branch points of the network, see network_cycles_and_chains
+        cached until points or segments are added, removed or relinked
+        '''
+        key = (self.store.revision, len(self.points), len(self.segments))
+        if self.topology_key == key:
+            return self.topology
         
-        return ip_cycles, seg_cycles
+        start = time.time()
+        self.topology = network_cycles_and_chains(self.points)
+        self.topology_key = key
+        print('%s has %i cycles %i open chains %i branch points, found in %f seconds' % (self.__class__.__name__,
+                                                                                      len(self.topology['ip_cycles']),
+                                                                                      len(self.topology['ip_chains']),
+                                                                                      len(self.topology['branch_points']),
+                                                                                      time.time() - start))
+        return self.topology
+    
+    def find_network_cycles(self):
+        '''
+        returns ip_cycles, seg_cycles  see find_network_topology
+        '''
+        topology = self.find_network_topology()
+        return topology['ip_cycles'], topology['seg_cycles']
     
     
 class CurveNode(object):  # CurveNetworkNode, basically identical to InputPoint
     '''
     Representation of an input point
+    the locations are kept in row self.row of CurveNode.store, like InputPoint
     '''
+    __slots__ = ('row', 'link_segments', 'input_point', 'handles', '_seed_geom', 'bmface', 'bmedge', 'bmvert')
+    store = NetworkArrays()
+    
+    world_loc = store_vector('world')
+    local_loc = store_vector('local')
+    view = store_vector('view')
+    face_index = store_face_index()
+    seed_geom = store_touching('_seed_geom')
+    
     def __init__(self, world, local, view, face_ind, seed_geom = None, bmface = None, bmedge = None, bmvert = None):
-        self.world_loc = world
-        self.local_loc = local
-        self.view = view
-        self.face_index = face_ind
+        self.row = self.store.add_point(world, local, view, face_ind)
         self.link_segments = []
         self.input_point = None
     
@@ -3540,6 +4092,9 @@ class CurveNode(object):  # CurveNetworkNode, basically identical to InputPoint
         self.bmface = bmface
         self.bmedge = bmedge
         self.bmvert = bmvert
+    
+    def __del__(self):
+        self.store.remove_point(self.row)
         
     def spawn_input_point(self, input_network):
         if self.input_point and self.input_point in input_network.points: return  #don't duplicate
@@ -3736,10 +4291,15 @@ class SplineSegment(object): #NetworkSegment
     Representation of a connection between 2 curve nodes
     Interpolated by a Cubic Bezier Spline
     '''
+    __slots__ = ('n0', 'n1', 'points', 'path', 'bad_segment', 'cb', 'input_points', 'input_segments',
+                 'is_inet_dirty', 'draw_tessellation', 'ip_tesselation', 'ip_views', 'row')
+    store = CurveNode.store
+    
     def __init__(self, n0, n1):
         self.n0 = n0
         self.n1 = n1
         self.points = [n0, n1]
+        self.row = self.store.add_edge(n0.row, n1.row)
         self.path = []  #list of 3d points for previsualization
         self.bad_segment = False
         n0.link_segments.append(self)
@@ -3756,6 +4316,9 @@ class SplineSegment(object): #NetworkSegment
         self.draw_tessellation = []  #higher res tesselation for draw and for furthe use
         self.ip_tesselation = []  #error based or length based tesselation to create InputPoints
         self.ip_views = []  #interpolated view_direction from n0 to n1
+    
+    def __del__(self):
+        self.store.remove_edge(self.row)
         
     def is_bad(self): return self.bad_segment
     is_bad = property(is_bad)
@@ -3768,6 +4331,7 @@ class SplineSegment(object): #NetworkSegment
         #TODO safety?  Check if in ip0.link_sgements?
         self.ip0.link_segments.remove(self)
         self.ip1.link_segments.remove(self)
+        self.store.touch()
     
     def calc_bezier(self):
         if self not in self.n0.handles:
@@ -3893,7 +4457,10 @@ class SplineNetwork(object): #InputNetwork
     InputPoints and Input segments, analogous to Verts and Edges
 
     Collection of all InputPoints and Input Segments
+    the numbers of the points and segments are kept in store, see network_arrays
     '''
+    store = CurveNode.store
+    
     def __init__(self, net_ui_context, ui_type="DENSE_POLY"):
         self.net_ui_context = net_ui_context
         self.net_ui_context.set_network(self)
@@ -3901,6 +4468,8 @@ class SplineNetwork(object): #InputNetwork
         self.bme = self.net_ui_context.bme  #the network exists on the BMesh, it is fundamental
         self.points = []
         self.segments = []  #order not important, but maintain order in this list for indexing?
+        self.topology = None  #see find_network_topology
+        self.topology_key = None
 
     def is_empty(self): return (not(self.points or self.segments))
     def num_points(self): return len(self.points)
@@ -3918,6 +4487,32 @@ class SplineNetwork(object): #InputNetwork
     point_views = property(point_views)
     point_face_indices = property(point_face_indices)
 
+    def point_rows(self):
+        '''
+        store rows of self.points, in order
+        '''
+        return np.fromiter((p.row for p in self.points), dtype = np.int64, count = len(self.points))
+    
+    def world_loc_array(self): return self.store.world[self.point_rows()]
+    def local_loc_array(self): return self.store.local[self.point_rows()]
+    def view_array(self): return self.store.view[self.point_rows()]
+    def face_index_array(self): return self.store.face_index[self.point_rows()]
+    
+    def segment_array(self):
+        '''
+        (num_segs, 2) int array, positions in self.points of the ends of every segment
+        '''
+        edge_rows = np.fromiter((seg.row for seg in self.segments), dtype = np.int64, count = len(self.segments))
+        return self.store.edge_positions(self.point_rows(), edge_rows)
+    
+    def closest_point(self, world_loc):
+        '''
+        the point nearest world_loc, None if there are no points
+        '''
+        i, d = self.store.nearest_point(self.point_rows(), world_loc)
+        if i == None: return None
+        return self.points[i]
+
 
     def push_to_input_net(self, net_ui_context, input_net, all_segs = False):
         
@@ -3943,11 +4538,13 @@ class SplineNetwork(object): #InputNetwork
             self.segments.remove(seg)
             p1.link_segments.remove(seg)
             p2.link_segments.remove(seg)
+            self.store.touch()
 
     def remove_segment(self, seg):
         '''
         delete segment but leave nodes
         '''
+        self.store.touch()
         if seg in self.segments:
             self.segments.remove(seg)
         
@@ -4014,113 +4611,28 @@ class SplineNetwork(object): #InputNetwork
         edge_points = [ip for ip in self.points if ip.is_edgepoint()]
         return edge_points
      
-    def find_network_cycles(self):  #TODO
-        #this is the equivalent of "edge_loops"
-        #TODO, mirror the get_cycle method from polystrips
-        #right now ther eare no T or X junctions, only cuts across mesh or loops within mesh
-        #will need to implement "IputNode.get_segment_to_right(InputSegment) to take care this
-        
-        print('SPLINE NETWORK CYCLES')
-        
-        ip_set = set(self.points)
-        endpoints = set(self.get_endpoints())
-        
-        closed_edgepoints = set(self.get_edgepoints()) - endpoints
-        
-        
-        print('There are %i endpoints' % len(endpoints))
-        print('there are %i input points' % len(ip_set))
-        print('there are %i closed edge_points' % len(closed_edgepoints))
-        
-        unclosed_ip_cycles = []
-        unclosed_seg_cycles = []
-        
-        def next_segment(ip, current_seg): #TODO Code golf this
-            if len(ip.link_segments) != 2: return None  #TODO, the the segment to right
-            return [seg for seg in ip.link_segments if seg != current_seg][0]
-              
-        while len(endpoints):
-            current_ip = endpoints.pop()
-            ip_start = current_ip
-            ip_set.remove(current_ip)
-            
-            node_cycle = [current_ip]
-            if len(current_ip.link_segments) == 0: continue #Lonely Input Point, ingore it
-            
-            current_seg = current_ip.link_segments[0]
-            seg_cycle = [current_seg]
-            
-            while current_seg:
-                next_ip = current_seg.other_point(current_ip)  #always true
-                
-                if next_ip == ip_start: break  #we have found the end, no need to get the next segment
-                
-                #take care of sets
-                if next_ip in ip_set: ip_set.remove(next_ip)
-                if next_ip in endpoints: endpoints.remove(next_ip)
-                node_cycle += [next_ip]
-                
-                #find next segment
-                next_seg = next_segment(next_ip, current_seg)
-                if not next_seg:  break  #we have found an endpoint
-                seg_cycle += [next_seg]
-               
-                #reset variable for next iteration
-                current_ip = next_ip
-                current_seg = next_seg
-                
-            unclosed_ip_cycles += [node_cycle] 
-            unclosed_seg_cycles += [seg_cycle] 
-         
-            
-        print('there are %i unclosed cycles' % len(unclosed_ip_cycles))
-        print('there are %i ip points in ip set' % len(ip_set))
-        for i, cyc in enumerate(unclosed_ip_cycles):
-            print('There are %i nodes in %i unclosed cycle' % (len(cyc), i))
-        
-        ip_cycles = []
-        seg_cycles = []   #<<this basicaly becomes a PolyLineKine
-        while len(ip_set):
-            
-            if len(closed_edgepoints):  #this makes sure we start with a closed edge point
-                current_ip = closed_edgepoints.pop()
-                ip_set.remove(current_ip)
-            else:
-                current_ip = ip_set.pop()
-            
-            ip_start = current_ip
-                
-            node_cycle = [current_ip]
-            if len(current_ip.link_segments) == 0: continue #Lonely Input Point, ingore it
-            
-            current_seg = current_ip.link_segments[0]
-            seg_cycle = [current_seg]
-            
-            while current_seg:
-                next_ip = current_seg.other_point(current_ip)  #always true
-                
-                if next_ip == ip_start: break  #we have found the end, no need to get the next segment
-                
-                #take care of sets
-                if next_ip in ip_set: ip_set.remove(next_ip)  #<-- i what circumstance would this not be true?
-                if next_ip in closed_edgepoints: closed_edgepoints.remove(next_ip)
-                node_cycle += [next_ip]
-                
-                #find next segment
-                next_seg = next_segment(next_ip, current_seg)
-                if not next_seg:  break  #we have found an endpoint
-                seg_cycle += [next_seg]
-               
-                #reset variable for next iteration
-                current_ip = next_ip
-                current_seg = next_seg
-                
-            ip_cycles += [node_cycle] 
-            seg_cycles += [seg_cycle] 
-        
-        
-        print('there are %i closed seg cycles' % len(seg_cycles))
-        for i, cyc in enumerate(ip_cycles):
-            print('There are %i nodes in %i closed cycle' % (len(cyc), i))
+    def find_network_topology(self):
+        '''
+        the cycles, open chains and branch points of the network, see network_cycles_and_chains
+        cached until points or segments are added, removed or relinked
+        '''
+        key = (self.store.revision, len(self.points), len(self.segments))
+        if self.topology_key == key:
+            return self.topology
         
-        return ip_cycles, seg_cycles
\ No newline at end of file
+        start = time.time()
+        self.topology = network_cycles_and_chains(self.points)
+        self.topology_key = key
+        print('%s has %i cycles %i open chains %i branch points, found in %f seconds' % (self.__class__.__name__,
+                                                                                      len(self.topology['ip_cycles']),
+                                                                                      len(self.topology['ip_chains']),
+                                                                                      len(self.topology['branch_points']),
+                                                                                      time.time() - start))
+        return self.topology
+    
+    def find_network_cycles(self):
+        '''
+        returns ip_cycles, seg_cycles  see find_network_topology
+        '''
+        topology = self.find_network_topology()
+        return topology['ip_cycles'], topology['seg_cycles']
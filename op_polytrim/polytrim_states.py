@@ -147,10 +147,10 @@ class Polytrim_States():
     def segmentation_enter(self):
         self.network_cutter.knife_geometry4()
         self.network_cutter.find_perimeter_edges()
-        for patch in self.network_cutter.face_patches:
-            patch.grow_seed(self.input_net.bme, self.network_cutter.boundary_edges)
-            patch.color_patch()
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.grow_patches()
+        self.network_cutter.color_patches()
+        self.network_cutter.find_patch_boundaries()
+        self.network_cutter.to_mesh()
         self.segmentation_fsm.reset()
         self.ui_text_update()
 
@@ -176,11 +176,11 @@ class Polytrim_States():
         self.network_cutter.find_boundary_faces_cycles()
         for patch in self.network_cutter.face_patches:
             patch.grow_seed_faces(self.input_net.bme, self.network_cutter.boundary_faces)
-            patch.color_patch()
+        self.network_cutter.color_patches()
 
         self.network_cutter.update_spline_edited_patches(self.spline_net)
 
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.to_mesh()
         self.region_fsm.reset()
         self.ui_text_update()
 
@@ -735,7 +735,7 @@ class Polytrim_States():
 
     @region_fsm.FSM_State('main', 'enter')
     def region_main_enter(self):
-        self.brush = self.PaintBrush(self.net_ui_context, radius=self.brush_radius)
+        self.brush = self.PaintBrush(self.net_ui_context, radius=self.brush_radius, colors=self.network_cutter.patch_colors)
         self.ui_text_update()
 
     @region_fsm.FSM_State('main')
@@ -765,6 +765,7 @@ class Polytrim_States():
         #set the cursor to to something
         self.network_cutter.find_boundary_faces_cycles()
         self.click_enter_paint()
+        self.brush.start_stroke()
         self.last_loc = None
         self.last_update = 0
         self.paint_dirty = False
@@ -788,7 +789,7 @@ class Polytrim_States():
             self.paint_dirty = True
 
         if self.paint_dirty and (time.time() - self.last_update) > 0.2:
-            self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+            self.network_cutter.show_patch_colors()  #only colors change while painting
             self.paint_dirty = False
             self.last_update = time.time()
 
@@ -796,7 +797,8 @@ class Polytrim_States():
     def region_paint_exit(self):
         self.brush.absorb_geom_geodesic(self.context, self.actions.mouse)
         self.paint_confirm_mergey()
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.find_patch_boundaries()
+        self.network_cutter.to_mesh()
 
 
     @region_fsm.FSM_State('paint delete', 'enter')
@@ -804,6 +806,7 @@ class Polytrim_States():
         #set the cursor to to something
         self.network_cutter.find_boundary_faces_cycles()
         self.click_enter_paint(delete = True)
+        self.brush.start_stroke()
         self.last_loc = None
         self.last_update = 0
         self.paint_dirty = False
@@ -827,7 +830,7 @@ class Polytrim_States():
             self.paint_dirty = True
 
         if self.paint_dirty and (time.time() - self.last_update) > 0.2:
-            self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+            self.network_cutter.show_patch_colors()  #only colors change while painting
             self.paint_dirty = False
             self.last_update = time.time()
 
@@ -835,4 +838,5 @@ class Polytrim_States():
     def region_unpaint_exit(self):
         self.brush.absorb_geom_geodesic(self.context, self.actions.mouse)
         self.paint_confirm_subtract()
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.find_patch_boundaries()
+        self.network_cutter.to_mesh()
@@ -6,6 +6,7 @@ Created on Oct 8, 2015
 
 import math
 import bgl
+import numpy as np
 
 from bpy_extras import view3d_utils
 from mathutils import Vector, Matrix, Color
@@ -38,8 +39,9 @@ preview_line_clr = (0.0, 1.0, 0.0, 0.4)
 preview_line_wdth = 2
 
 
-def set_depthrange(near, far, points, view_loc, view_ortho):
-    d2 = min((view_loc-p).length_squared for p in points)
+def set_depthrange(near, far, points, view_loc, view_ortho, d2 = None):
+    if d2 == None:
+        d2 = min((view_loc-p).length_squared for p in points)
     d = math.sqrt(d2)
     d2 /= 10.0
     near = near / d2
@@ -62,6 +64,18 @@ def draw3d_points(points, color, size, view_loc, view_ortho, zfar=0.997):
     bgl.glEnd()
     bgl.glPointSize(1.0)
 
+# draws the (n, 3) rows of a NetworkArrays view, eg InputNetwork.world_loc_array()
+def draw3d_point_array(points, color, size, view_loc, view_ortho, zfar=0.997):
+    if not len(points): return
+    bgl.glColor4f(*color)
+    bgl.glPointSize(size)
+    d2 = float(np.min(np.sum((points - tuple(view_loc))**2, axis = 1)))
+    set_depthrange(0.0, zfar, None, view_loc, view_ortho, d2 = d2)
+    bgl.glBegin(bgl.GL_POINTS)
+    for x, y, z in points.tolist(): bgl.glVertex3f(x, y, z)
+    bgl.glEnd()
+    bgl.glPointSize(1.0)
+
 # draws polylines.
 def draw3d_polyline(points, color, thickness, view_loc, view_ortho, stipple=False, zfar=0.997):
     if not points: return
@@ -80,6 +94,21 @@ def draw3d_polyline(points, color, thickness, view_loc, view_ortho, stipple=Fals
         bgl.glDisable(bgl.GL_LINE_STIPPLE)
         bgl.glEnable(bgl.GL_BLEND)  # back to uninterrupted lines
 
+def draw_patch_outline(patch, mx, color, thickness, view_loc, view_ortho):
+    '''
+    draws the boundary loops of a BMFacePatch, or its input segments before
+    the boundary has been found
+    '''
+    if len(patch.boundary_loops) == 0:
+        for spline_seg in patch.spline_net_segments:
+            for iseg in spline_seg.input_segments:
+                draw3d_polyline([iseg.ip0.world_loc] + iseg.path + [iseg.ip1.world_loc], color, thickness, view_loc, view_ortho)
+        return
+    
+    for loop in patch.boundary_loops:
+        pts = [mx * Vector(co) for co in loop.tolist()]
+        draw3d_polyline(pts + pts[:1], color, thickness, view_loc, view_ortho)
+
 def draw2d_polyline(points, color, thickness, stipple=False):
     if stipple:
         bgl.glLineStipple(4, 0x5555)  #play with this later
@@ -257,7 +286,7 @@ class Polytrim_UI_Draw():
                 #    draw3d_polyline(seg.ip_tesselation,  blue, 2, view_loc, view_ortho)
                 #    draw3d_points(seg.ip_tesselation, green2, 4, view_loc, view_ortho)
     
-            draw3d_points(self.spline_net.point_world_locs, green2, 6, view_loc, view_ortho)
+            draw3d_point_array(self.spline_net.world_loc_array(), green2, 6, view_loc, view_ortho)
     
             # Polylines...InputSegments
             for seg in self.input_net.segments:
@@ -294,19 +323,15 @@ class Polytrim_UI_Draw():
             if self.net_ui_context.hovered_near[0] == 'PATCH':
                 p = self.net_ui_context.hovered_near[1]
                 if p != self.network_cutter.active_patch:
-                    for spline_seg in p.spline_net_segments:
-                        for iseg in spline_seg.input_segments:
-                            draw3d_polyline([iseg.ip0.world_loc] + iseg.path + [iseg.ip1.world_loc],  orange2, 4, view_loc, view_ortho)
+                    draw_patch_outline(p, self.net_ui_context.mx, orange2, 4, view_loc, view_ortho)
             
             if self.network_cutter.active_patch:                    
-                for spline_seg in self.network_cutter.active_patch.spline_net_segments:
-                    for iseg in spline_seg.input_segments:
-                            draw3d_polyline([iseg.ip0.world_loc] + iseg.path + [iseg.ip1.world_loc],  orange2, 4, view_loc, view_ortho)
+                draw_patch_outline(self.network_cutter.active_patch, self.net_ui_context.mx, orange2, 4, view_loc, view_ortho)
 
         if self._state == 'spline':
-            draw3d_points(self.input_net.point_world_locs, blue, 2, view_loc, view_ortho)
+            draw3d_point_array(self.input_net.world_loc_array(), blue, 2, view_loc, view_ortho)
         elif self._state != 'segmentation':
-            draw3d_points(self.input_net.point_world_locs, blue, 6, view_loc, view_ortho)
+            draw3d_point_array(self.input_net.world_loc_array(), blue, 6, view_loc, view_ortho)
 
         #draw the seed/face patch points
         draw3d_points([p.world_loc for p in self.network_cutter.face_patches], orange2, 6, view_loc, view_ortho)
@@ -8,7 +8,7 @@ import bpy
 import time
 import math
 
-from ..bmesh_fns import edge_loops_from_bmedges_old, ensure_lookup, new_bmesh_from_bmelements
+from ..bmesh_fns import edge_loops_from_bmedges_linear, ensure_lookup, new_bmesh_from_bmelements
 from ..common.utils import get_matrices
 from ..common.rays import get_view_ray_data, ray_cast, ray_cast_path, ray_cast_bvh
 
@@ -23,7 +23,8 @@ from ..bmesh_fns import edge_loops_from_bmedges_old, flood_selection_by_verts, f
 from ..common.maths import Point, Direction, XForm
 from ..common.bezier import CubicBezierSpline
 from ..common.simplify import simplify_RDP
-from ..geodesic import geodesic_walk
+from ..geodesic import GeodesicBrushWorkspace
+from ..mesh_cache import object_mesh_cache
 
 class Polytrim_UI_Tools():
     '''
@@ -174,8 +175,9 @@ class Polytrim_UI_Tools():
 
     class PaintBrush():  #TODO replace with widget, this is a coars placeholder
         #active patch?  meaning we are updating a selection
-        def __init__(self, net_ui_context, radius=1.5, color=(0.8, 0.1, 0.3)):
+        def __init__(self, net_ui_context, radius=1.5, color=(0.8, 0.1, 0.3), colors=None):
             self.net_ui_context = net_ui_context
+            self.colors = colors  #LoopColorBuffer, when None the stroke is colored loop by loop
             self.xform = XForm(self.net_ui_context.ob.matrix_world)
             self.radius = radius
             self.brush_color = Color(color)
@@ -190,6 +192,14 @@ class Polytrim_UI_Tools():
 
             self.vcol = vcol_layer
             self.points = [(math.cos(math.radians(t)), math.sin(math.radians(t))) for t in range(0,361,10)]
+            self.geo_workspace = None  #GeodesicBrushWorkspace, made at the start of each stroke
+
+        def start_stroke(self):
+            '''
+            allocates the geodesic arrays once for the whole stroke
+            '''
+            self.net_ui_context.mesh_cache.mesh_arrays(self.net_ui_context.bme)
+            self.geo_workspace = GeodesicBrushWorkspace(self.net_ui_context.bme)
 
         def ray_hit(self, pt_screen, context):
             view_vector, ray_origin, ray_target = get_view_ray_data(context, pt_screen)  #a location and direction in WORLD coordinates
@@ -209,22 +219,19 @@ class Polytrim_UI_Tools():
             if not loc: return
 
             #can do old mapping if bme has been altered
-            seed = self.net_ui_context.bme.faces[face_ind]
-            geos, fixed_vs, close, far = geodesic_walk(self.net_ui_context.bme, seed, loc, min_dist=self.radius)
-            fs_in = set()
-            fs_out = set()
-            for v in fixed_vs:
-                for f in v.link_faces:
-                    if f in fs_in or f in fs_out: continue
-                    if all([v in fixed_vs for v in f.verts]):
-                        fs_in.add(f)
-                    else:
-                        fs_out.add(f)
+            bme = self.net_ui_context.bme
+            seed = bme.faces[face_ind]
+            if self.geo_workspace == None: self.start_stroke()
+
+            fs_in = [bme.faces[i] for i in self.geo_workspace.dab(seed, loc, self.radius).tolist()]
 
             self.color_geom(fs_in)
             self.geom_accum.update(fs_in)
 
         def color_geom(self, faces):
+            if self.colors != None:
+                self.colors.set_face_colors([f.index for f in faces], self.brush_color)
+                return
             for f in faces:
                 for loop in f.loops:
                     loop[self.vcol] = self.brush_color
@@ -456,8 +463,6 @@ class Polytrim_UI_Tools():
                 self.ob.data.materials.append(mat)
                 self.ob.material_slots[0].material = mat
             
-            self.bme = bmesh.new()
-            
             #we are going to make destructive edits into a copy of the mesh
             #then at the end, if we are in destructive mode, we delete backup
             #mesh and keep edited mesh, otherwise we delete edited mesh and put
@@ -466,13 +471,9 @@ class Polytrim_UI_Tools():
             self.backup_data = self.ob.data
             self.ob.data = copy_me
             
-            self.bme.from_mesh(self.ob.data)    
-            ensure_lookup(self.bme)
-            start = time.time()
-            self.bvh = BVHTree.FromBMesh(self.bme)
-            finish = time.time()
-            
-            print('took %f seconds to build BVH' % (finish-start))
+            #BVH and non manifold data are only rebuilt when the mesh changed
+            self.bme, self.mesh_cache = object_mesh_cache(self.ob)
+            self.bvh = self.mesh_cache.bvh
             self.mx, self.imx = get_matrices(self.ob) 
             self.mx_norm = self.imx.transposed().to_3x3() #local directions to global
             self.imx_norm = self.imx.to_3x3() #global direction to local
@@ -492,11 +493,10 @@ class Polytrim_UI_Tools():
             self.closest_ep = None
             self.hovered_near = [None, -1]
 
-            self.kd = None
-            self.non_man_bmverts = []
-            self.find_non_man()
-            self.non_man_eds = [ed.index for ed in self.bme.edges if not ed.is_manifold]
-            self.non_man_ed_loops = edge_loops_from_bmedges_old(self.bme, self.non_man_eds)
+            self.kd = self.mesh_cache.kd
+            self.non_man_bmverts = list(self.mesh_cache.non_man_bmverts)
+            self.non_man_eds = list(self.mesh_cache.non_man_eds)
+            self.non_man_ed_loops = [list(loop) for loop in self.mesh_cache.non_man_ed_loops]
         
         
         def inspect_print(self):
@@ -534,7 +534,7 @@ class Polytrim_UI_Tools():
             
         def find_non_man(self):
             non_man_eds = [ed.index for ed in self.bme.edges if not ed.is_manifold]
-            non_man_ed_loops = edge_loops_from_bmedges_old(self.bme, non_man_eds)
+            non_man_ed_loops = edge_loops_from_bmedges_linear(self.bme, non_man_eds)['VERTS']
             non_man_points = []
             for loop in non_man_ed_loops:
                 non_man_points += [self.ob.matrix_world * self.bme.verts[ind].co for ind in loop]
@@ -972,20 +972,10 @@ class Polytrim_UI_Tools():
         
         self.network_cutter.validate_cdata()
         
-        #First, remove geom accum from other patches
-        remove_patches = []
-        for patch in self.network_cutter.face_patches:
-            if patch == self.network_cutter.active_patch:continue
-            
-            if not patch.patch_faces.isdisjoint(self.brush.geom_accum):
-                patch.paint_modified = True
-            patch.patch_faces.difference_update(self.brush.geom_accum)
-            if len(patch.patch_faces) == 0:
-                remove_patches += [patch]
+        #First, take geom accum from other patches, empty ones are removed
+        for patch in self.network_cutter.paint_patches(self.brush.geom_accum, 'GREEDY'):
+            patch.paint_modified = True
             patch.validate_seed()
-            
-        for patch in remove_patches:
-            self.network_cutter.face_patches.remove(patch)
 
         #Destroy all Discrete Network Elements touched by brush
         remove_points = []
@@ -1045,7 +1035,6 @@ class Polytrim_UI_Tools():
         #for node in loose_nodes:
         #    self.spline_net.remove_point(node)
 
-        self.network_cutter.active_patch.patch_faces |= self.brush.geom_accum
         self.network_cutter.active_patch.paint_modified = True
         
         
@@ -1075,22 +1064,12 @@ class Polytrim_UI_Tools():
         
         AP = self.network_cutter.active_patch
         
-        #First, identify touched patches
-        merge_patches = []
-        
-        for patch in self.network_cutter.face_patches:
-            if patch == AP: continue
-            if not patch.patch_faces.isdisjoint(self.brush.geom_accum):
-                merge_patches += [patch]
-        
-        #merge them all together    
-        for patch in merge_patches:
-            AP.patch_faces.update(patch.patch_faces)
+        #First, merge touched patches and the brush geom into the active patch
+        for patch in self.network_cutter.paint_patches(self.brush.geom_accum, 'MERGE'):
             AP.input_net_segments += patch.input_net_segments
             AP.ip_points += patch.ip_points
             AP.spline_net_segments += patch.spline_net_segments
             AP.curve_nodes += patch.curve_nodes
-            self.network_cutter.face_patches.remove(patch)
 
         #Destroy all Discrete Network Elements touched by brush
         remove_points = []
@@ -1141,18 +1120,7 @@ class Polytrim_UI_Tools():
             self.spline_net.remove_segment(spline)            
             spline.clear_input_net_references(self.input_net) #if the spline parent is gone, we take all children away from the border too....#TRUMP?        
         
-        #join the brush geom!
-        self.network_cutter.active_patch.patch_faces |= self.brush.geom_accum
         self.network_cutter.active_patch.paint_modified = True
-        
-        #ensure no 0 face paches
-        remove_patches = []
-        for patch in self.network_cutter.face_patches:
-            if len(patch.patch_faces) == 0:
-                remove_patches += [patch]
-            
-        for patch in remove_patches:
-            self.network_cutter.face_patches.remove(patch)
                 
         #TODO, remove the destroyed elements from the patch references
         self.network_cutter.active_patch.color_patch()
@@ -1173,25 +1141,14 @@ class Polytrim_UI_Tools():
         
         self.network_cutter.validate_cdata()
         
-        #First, identify touched patches 
-        for patch in self.network_cutter.face_patches:
-            if not patch.patch_faces.isdisjoint(self.brush.geom_accum):
-                print('removing brush geom from patch')
-                patch.patch_faces.difference_update(self.brush.geom_accum)
-                if patch.validate_seed():
-                    patch.world_loc = self.net_ui_context.mx * patch.local_loc
-                patch.paint_modified = True
-                patch.un_color_patch()
-                patch.color_patch()
-        
-        #ensure no 0 face paches
-        remove_patches = []
-        for patch in self.network_cutter.face_patches:
-            if len(patch.patch_faces) == 0:
-                remove_patches += [patch]
-            
-        for patch in remove_patches:
-            self.network_cutter.face_patches.remove(patch)
+        #First, remove brush geom from touched patches, empty ones are removed
+        for patch in self.network_cutter.paint_patches(self.brush.geom_accum, 'SUBTRACT'):
+            print('removing brush geom from patch')
+            if patch.validate_seed():
+                patch.world_loc = self.net_ui_context.mx * patch.local_loc
+            patch.paint_modified = True
+            patch.un_color_patch()
+            patch.color_patch()
             
         #Destroy all Discrete Network Elements touched by brush
         remove_points = []
@@ -1258,7 +1215,7 @@ class Polytrim_UI_Tools():
         self.network_cutter.update_segments_async()
         
         #Do this for now
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.to_mesh()
         
     # TODO: Make this a NetworkUIContext function
     
@@ -1301,7 +1258,7 @@ class Polytrim_UI_Tools():
         
         self.network_cutter.active_patch = None   
         self.network_cutter.face_patches.remove(patch)
-        bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.to_mesh()
         
         #update BVH?  hmmmm....
 
@@ -1334,7 +1291,7 @@ class Polytrim_UI_Tools():
         vg.add([v.index for v in group_vs], 1, type = 'REPLACE')
         self.network_cutter.active_patch = None
         self.network_cutter.face_patches.remove(patch)
-        bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.to_mesh()
           
     def split_active_patch(self):
     
@@ -1358,12 +1315,12 @@ class Polytrim_UI_Tools():
         patch.find_boundary_edges()  #this should probbaly happen at regino growing time anyway
         
         bme = self.net_ui_context.bme 
-        eds = patch.find_all_boundary_edges()
+        eds = patch.find_all_boundary_edges(bme)
         bmesh.ops.split_edges(bme, eges = list(eds))
             
         self.newtork_cutter.active_patch = None    
         self.network_cutter.face_patches.remove(patch)
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.to_mesh()
     
     
     def separate_active_patch(self):
@@ -1414,7 +1371,7 @@ class Polytrim_UI_Tools():
         
         self.network_cutter.active_patch = None
         self.network_cutter.face_patches.remove(patch)
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.to_mesh()
         
     def duplicate_active_patch(self):
 
@@ -1433,7 +1390,7 @@ class Polytrim_UI_Tools():
         
         self.network_cutter.active_patch = None
         self.network_cutter.face_patches.remove(patch)
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data) 
+        self.network_cutter.to_mesh()
         
         
                
@@ -1554,16 +1511,15 @@ class Polytrim_UI_Tools():
         
     def knife_step_button(self):
         self.network_cutter.knife_geometry_step()
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.to_mesh()
          
     def compute_cut_button(self):
         self.network_cutter.knife_geometry4()
         
         self.network_cutter.find_perimeter_edges()
-        for patch in self.network_cutter.face_patches:
-            patch.grow_seed(self.input_net.bme, self.network_cutter.boundary_edges)
-            patch.color_patch()
-        self.net_ui_context.bme.to_mesh(self.net_ui_context.ob.data)
+        self.network_cutter.grow_patches()
+        self.network_cutter.color_patches()
+        self.network_cutter.to_mesh()
         
         self._sate_next = 'segmentation'
         
@@ -1618,7 +1574,7 @@ class Polytrim_UI_Tools():
             return delt.length
 
         #closest_3d_loc = min(self.input_net.world_locs, key = dist3d)
-        closest_ip = min(self.input_net.points, key = lambda x: dist3d(x.world_loc))
+        closest_ip = self.input_net.closest_point(self.net_ui_context.ob.matrix_world * loc)
         pixel_dist = dist(loc3d_reg2D(context.region, context.space_data.region_3d, closest_ip.world_loc))
 
         if pixel_dist  < select_radius:
@@ -1729,7 +1685,7 @@ class Polytrim_UI_Tools():
         def dist3d(v3): return (v3 - loc).length if v3 else float('inf')
 
         #closest_3d_loc = min(self.spline_net.world_locs, key = dist3d)
-        closest_ip = min(self.spline_net.points, key = lambda x: dist3d(x.world_loc))
+        closest_ip = self.spline_net.closest_point(loc)
         pixel_dist = dist(loc3d_reg2D(context.region, context.space_data.region_3d, closest_ip.world_loc))
 
         if pixel_dist < select_radius:
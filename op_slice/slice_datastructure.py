@@ -16,6 +16,7 @@ from ..bmesh_fns import grow_selection_to_find_face, flood_selection_faces, edge
 from ..cut_algorithms import cross_section_2seeds_ver1, path_between_2_points
 from ..common.blender import bversion
 from ..geodesic import geodesic_walk, continue_geodesic_walk, gradient_descent
+from ..mesh_cache import object_mesh_cache
 from .. import common_drawing
 
 class Slice(object):
@@ -26,12 +27,7 @@ class Slice(object):
     def __init__(self,context, cut_object):   
         
         self.cut_ob = cut_object
-        self.bme = bmesh.new()
-        self.bme.from_mesh(cut_object.data)
-        self.bme.verts.ensure_lookup_table()
-        self.bme.edges.ensure_lookup_table()
-        self.bme.faces.ensure_lookup_table()
-        
+        self.bme, self.mesh_cache = object_mesh_cache(cut_object)
         
         #non_tris = [f for f in self.bme.faces if len(f.verts) > 3]
         #bmesh.ops.triangulate(self.bme, faces = non_tris, quad_method = 0, ngon_method = 0)
@@ -40,11 +36,7 @@ class Slice(object):
         #if len(non_tris):
             #geom = bmesh.ops.connect_verts_concave(self.bme, non_tris)
         
-        self.bme.verts.ensure_lookup_table()
-        self.bme.edges.ensure_lookup_table()
-        self.bme.faces.ensure_lookup_table()
-        
-        self.bvh = BVHTree.FromBMesh(self.bme)
+        self.bvh = self.mesh_cache.bvh
         
         
         self.seed = None
@@ -4,6 +4,7 @@ Created on Oct 8, 2015
 @author: Patrick
 '''
 from ..modaloperator import ModalOperator
+from ..mesh_arrays import clear_mesh_arrays
 from .slice_ui           import Slice_UI
 from .slice_ui_modalwait  import Slice_UI_ModalWait
 from .slice_ui_draw       import Slice_UI_Draw
@@ -48,6 +49,7 @@ class CGC_Slice(ModalOperator, Slice_UI, Slice_UI_ModalWait, Slice_UI_Draw):
     def end(self, context):
         ''' Called when tool is ending modal '''
         self.end_ui(context)
+        clear_mesh_arrays()  #the edited BMesh is freed, the object cache is kept for next time
     
     def end_commit(self, context):
         ''' Called when tool is committing '''
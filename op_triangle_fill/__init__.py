@@ -12,7 +12,7 @@ import bmesh
 from mathutils import Vector
 
 from bpy.props import FloatProperty, BoolProperty, IntProperty, EnumProperty
-from ..bmesh_fns import edge_loops_from_bmedges, join_bmesh
+from ..bmesh_fns import edge_loops_from_bmedges_linear, join_bmesh
 from ..common.maths import delta_angles
 from ..common.debug import sort_objects_by_angles
 
@@ -245,7 +245,7 @@ class TriangleFill(bpy.types.Operator):
                 
     def triangulate_fill(self,bme,edges, max_iters, res_mode, resolution, smooth_iters = 1):
         
-        ed_loops = edge_loops_from_bmedges(bme, edges, ret = {'VERTS','EDGES'})
+        ed_loops = edge_loops_from_bmedges_linear(bme, edges, ret = {'VERTS','EDGES'})
                     
             
         for vs, eds in zip(ed_loops['VERTS'], ed_loops['EDGES']):
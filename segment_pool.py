@@ -0,0 +1,212 @@
+'''
+Process pool for precomputing polytrim segment cuts
+
+The BMesh walkers are pure python and hold the GIL, and a BMesh is not safe
+to read from several threads, so a ThreadPoolExecutor gives no speedup.
+SegmentPool copies a MeshArrays snapshot into shared memory once, every
+worker process maps it without copying, and the segments are walked with the
+index space walkers in cut_arrays.  Results only hold indices and location
+tuples; NetworkCutter maps them back to BMesh elements on the main thread.
+
+Workers are forked so they do not import the addon (and bpy) again.  Forking
+a process with Cocoa and GL loaded is not safe on macOS, so available() is
+only True on Linux.  Elsewhere SegmentPool(threads = True) runs the same
+index space walkers in a thread pool on the snapshot itself.  That holds the
+GIL like the BMesh walkers did, but never touches the BMesh off the main
+thread and keeps the walks out of the modal loop.
+
+This module does not import bpy, bmesh or mathutils
+'''
+#python imports
+import os
+import sys
+import time
+import ctypes
+import functools
+import multiprocessing
+from multiprocessing import sharedctypes
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+#Cut Mesh imports
+from .mesh_arrays import MeshArrays
+from .cut_arrays import FacePlane, path_between_2_points_arrays, cross_section_2seeds_arrays
+from .cut_arrays import topology_lists, face_normals
+
+
+#the arrays a MeshArrays is rebuilt from in the workers
+_shared_fields = (('coords', ctypes.c_double, np.float64),
+                  ('face_indptr', ctypes.c_int64, np.int64),
+                  ('face_verts', ctypes.c_int32, np.int32),
+                  ('edge_verts', ctypes.c_int32, np.int32),
+                  ('face_edges', ctypes.c_int32, np.int32))
+
+def share_mesh_arrays(mesh):
+    '''
+    copies the topology of mesh into shared memory
+    returns dictionary {name: (RawArray, shape)}
+    '''
+    shared = {}
+    for name, ctype, dtype in _shared_fields:
+        arr = np.ascontiguousarray(getattr(mesh, name), dtype = dtype)
+        raw = sharedctypes.RawArray(ctype, max(arr.size, 1))
+        np.frombuffer(raw, dtype = dtype)[:arr.size] = arr.ravel()
+        shared[name] = (raw, arr.shape)
+    return shared
+
+def attach_mesh_arrays(shared):
+    '''
+    MeshArrays over the shared buffers, the topology is not copied
+    '''
+    views = {}
+    for name, ctype, dtype in _shared_fields:
+        raw, shape = shared[name]
+        size = int(np.prod(shape))
+        views[name] = np.frombuffer(raw, dtype = dtype)[:size].reshape(shape)
+    return MeshArrays(views['coords'], views['face_indptr'], views['face_verts'],
+                      edge_verts = views['edge_verts'], face_edges = views['face_edges'])
+
+
+def precompute_segment(mesh, job):
+    '''
+    the geometry part of NetworkCutter.precompute_cut, on a MeshArrays
+
+    job - tuple (key, f0, loc0, f1, loc1, cut_pt, cut_no), locations are 3 tuples in local space
+    returns dictionary
+        key - job key
+        method - 'SAME_FACE', 'ADJACENT_FACE', 'PATH_2_POINTS' or 'CROSS_SECTION_2_SEEDS'
+        verts - location tuples
+        edges - crossed edge indices
+        faces - crossed face indices
+        error - None or the walker error
+    '''
+    key, f0, loc0, f1, loc1, cut_pt, cut_no = job
+    result = {'key': key, 'verts': [], 'edges': [], 'faces': [], 'error': None}
+
+    if f0 == f1:
+        result['method'] = 'SAME_FACE'
+        return result
+
+    #shared edge, the segment crosses just one edge
+    ef_indptr, ef_indices = mesh.edge_faces()
+    for ed in mesh.face_edge_indices(f0).tolist():
+        if f1 in ef_indices[ef_indptr[ed]:ef_indptr[ed + 1]]:
+            result['method'] = 'ADJACENT_FACE'
+            result['edges'] = [ed]
+            result['verts'] = [FacePlane(mesh, cut_pt, cut_no).edge_point(ed)]
+            return result
+
+    result['method'] = 'PATH_2_POINTS'
+    vs = []
+    epp = .0000000001
+    use_limit = True
+    attempts = 0
+    while epp < .0001 and not len(vs) and attempts <= 5:
+        attempts += 1
+        vs, eds, eds_crossed, faces_crossed, error = path_between_2_points_arrays(mesh, loc0, f0, loc1, f1,
+                                                                                  use_limit = use_limit, epsilon = epp)
+        if len(vs) and error == 'LIMIT_SET':
+            vs = []
+            use_limit = False
+        elif len(vs) == 0 and error == 'EPSILON':
+            epp *= 10
+        elif len(vs) == 0 and error:
+            break
+
+    if not len(vs):
+        result['method'] = 'CROSS_SECTION_2_SEEDS'
+        epp = .00000001
+        attempts = 0
+        while epp < .0001 and not len(vs) and attempts <= 10:
+            attempts += 1
+            vs, eds, eds_crossed, faces_crossed, error = cross_section_2seeds_arrays(mesh, cut_pt, cut_no, f0, loc0, f1, loc1,
+                                                                                     epsilon = epp)
+            if len(vs) and error == 'LIMIT_SET':
+                vs = []
+            elif len(vs) == 0 and error == 'EPSILON':
+                epp *= 10
+            elif len(vs) == 0 and error:
+                break
+
+    result['verts'] = vs
+    result['edges'] = eds_crossed
+    result['faces'] = faces_crossed
+    result['error'] = error
+    return result
+
+
+#the snapshot of the pool this worker process belongs to
+_worker_mesh = None
+
+def _init_tables(mesh):
+    #build the lookup tables once per worker instead of once per segment
+    topology_lists(mesh)
+    face_normals(mesh)
+    mesh.face_neighbors()
+    mesh.edge_faces()
+    mesh.cache['face_centers_list'] = [tuple(co) for co in mesh.face_centers().tolist()]
+
+def _init_worker(shared):
+    global _worker_mesh
+    _worker_mesh = attach_mesh_arrays(shared)
+    _init_tables(_worker_mesh)
+
+def _run_job(job):
+    return precompute_segment(_worker_mesh, job)
+
+
+class SegmentPool(object):
+    '''
+    worker processes sharing one MeshArrays snapshot
+
+    mesh - MeshArrays with edges
+    processes - number of workers, defaults to default_processes()
+    threads - use a thread pool in this process instead, for platforms
+              where available() is False
+    '''
+    def __init__(self, mesh, processes = None, threads = False):
+        start = time.time()
+        self.mesh = mesh
+        if not processes:
+            processes = SegmentPool.default_processes()
+
+        self.processes = processes
+        self.threads = threads
+        if threads:
+            #the threads read mesh itself, build the tables before they start
+            _init_tables(mesh)
+            self.shared = None
+            self.run_job = functools.partial(precompute_segment, mesh)
+            self.pool = ThreadPool(processes)
+        else:
+            self.shared = share_mesh_arrays(mesh)
+            self.run_job = _run_job
+            ctx = multiprocessing.get_context('fork')
+            self.pool = ctx.Pool(processes, initializer = _init_worker, initargs = (self.shared,))
+        print('started %i segment %s in %f seconds' % (processes, 'threads' if threads else 'workers', time.time() - start))
+
+    @staticmethod
+    def default_processes():
+        return os.cpu_count() or 1
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith('linux') and 'fork' in multiprocessing.get_all_start_methods()
+
+    def submit(self, job):
+        '''
+        job - see precompute_segment
+        returns multiprocessing AsyncResult, .ready() and .get() give the result dictionary
+        '''
+        return self.pool.apply_async(self.run_job, (job,))
+
+    def map(self, jobs):
+        '''
+        computes all the jobs, blocking, results in the same order
+        '''
+        return self.pool.map(self.run_job, jobs, chunksize = max(1, len(jobs)//(4 * self.processes)))
+
+    def close(self):
+        self.pool.terminate()
+        self.pool = None